@@ -0,0 +1,18 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+/// @title ComplianceLog
+/// @notice Append-only log of compliance events. Both hashes are indexed so
+/// nodes can find records with eth_getLogs topic filters instead of
+/// scanning blocks.
+contract ComplianceLog {
+    event ComplianceRecorded(
+        bytes32 indexed eventTypeHash,
+        bytes32 indexed eventHash,
+        string eventType
+    );
+
+    function record(string calldata eventType, bytes32 eventHash) external {
+        emit ComplianceRecorded(keccak256(bytes(eventType)), eventHash, eventType);
+    }
+}
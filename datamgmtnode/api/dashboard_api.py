@@ -1,24 +1,34 @@
 """Dashboard API for serving Vue.js static files and WebSocket."""
 
+import asyncio
 import logging
-import mimetypes
+import os
+import time
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
 
 import aiohttp.web
 
-from datamgmtnode.api.validation import (
-    ValidationError,
-    validate_eth_address,
-    validate_filters,
-    validate_hash,
-    validate_share_data_request,
-    validate_transfer_request,
-)
+from datamgmtnode.api import handlers
+from datamgmtnode.api.jobs import JobRegistry
+from datamgmtnode.api.responses import compression_middleware, json_response
+from datamgmtnode.api.validation import ValidationError
 from datamgmtnode.api.websocket_handler import WebSocketManager
 from datamgmtnode.dashboard.event_bus import EventBus
+from datamgmtnode.json_codec import dumps
 
 logger = logging.getLogger(__name__)
 
+# Vite emits content-hashed filenames under assets/, so they never change
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Read size used when aiohttp has to fall back from loop.sendfile()
+STATIC_CHUNK_SIZE = 256 * 1024
+
+# Seconds a cached read-only response body is served before rebuilding
+RESPONSE_CACHE_TTL = 1.0
+
 
 class DashboardAPI:
     """Dashboard API for TUI and web interface.
@@ -41,42 +51,106 @@ class DashboardAPI:
         self.ws_manager = WebSocketManager(event_bus)
         self.runner = None
 
+        # share_data runs in the background; clients poll by job id
+        self._jobs = JobRegistry()
+
         # Path to static files (built Vue.js app)
         self.static_path = Path(__file__).parent.parent / 'dashboard' / 'static'
 
+        # Constant body served while the Vue.js dashboard is not built
+        self._no_static_body = dumps({
+            'message': 'Dashboard API is running',
+            'note': 'Vue.js dashboard not built. Run: python scripts/build_dashboard.py',
+            'websocket': f'ws://localhost:{self.port}/ws',
+            'api_prefix': '/api',
+            'endpoints': [
+                'GET /api/health',
+                'GET /api/balance/{address}',
+                'POST /api/transfer',
+                'GET /api/tokens',
+                'POST /api/tokens',
+                'POST /api/share_data',
+                'GET /api/share_data/{job_id}',
+                'GET /api/data/{data_hash}',
+                'GET /api/verify_data/{data_hash}',
+                'GET /api/compliance_history',
+                'GET /api/network/stats',
+                'GET /api/network/peers',
+                'GET /api/dashboard/info'
+            ]
+        })
+
+        # Route path -> (created at, serialized JSON body). Cached routes
+        # ignore query parameters, so the key set is bounded by the routes
+        self._resp_cache: Dict[str, Tuple[float, bytes]] = {}
+
     async def start(self):
         """Start the Dashboard API server."""
-        app = aiohttp.web.Application(middlewares=[self._error_middleware])
+        app = self._create_app()
+        loop = asyncio.get_running_loop()
+        logger.info(f"Dashboard API using event loop {type(loop).__module__}.{type(loop).__name__}")
+
+        self.runner = aiohttp.web.AppRunner(app)
+        await self.runner.setup()
+        site = aiohttp.web.TCPSite(self.runner, '0.0.0.0', self.port)
+        await site.start()
+        logger.info(f"Dashboard API started on port {self.port}")
+
+    def _create_app(self) -> aiohttp.web.Application:
+        """Build the application with all routes registered."""
+        has_static = (
+            self.static_path.exists() and (self.static_path / 'index.html').exists()
+        )
+
+        middlewares = [compression_middleware, self._error_middleware]
+        if has_static:
+            middlewares.append(self._spa_fallback_middleware)
+        app = aiohttp.web.Application(middlewares=middlewares)
 
         # WebSocket endpoint
         app.router.add_get('/ws', self.ws_manager.handle_websocket)
 
         # API endpoints (proxy to node services)
+        node = self.node
         app.router.add_get('/api/health', self._handle_health)
-        app.router.add_get('/api/balance/{address}', self._handle_balance)
-        app.router.add_post('/api/transfer', self._handle_transfer)
+        app.router.add_get('/api/balance/{address}', partial(handlers.get_balance, node))
+        app.router.add_post('/api/transfer', partial(handlers.transfer, node))
         app.router.add_get('/api/tokens', self._handle_list_tokens)
         app.router.add_post('/api/tokens', self._handle_add_token)
-        app.router.add_post('/api/share_data', self._handle_share_data)
-        app.router.add_get('/api/data/{data_hash}', self._handle_get_data)
-        app.router.add_get('/api/verify_data/{data_hash}', self._handle_verify_data)
-        app.router.add_get('/api/compliance_history', self._handle_compliance_history)
+        app.router.add_post('/api/share_data', partial(handlers.submit_share_data, node, self._jobs))
+        app.router.add_get('/api/share_data/{job_id}', partial(handlers.get_share_data_job, self._jobs))
+        app.router.add_get('/api/data/{data_hash}', partial(handlers.get_data, node))
+        app.router.add_get('/api/verify_data/{data_hash}', partial(handlers.verify_data, node))
+        app.router.add_get('/api/compliance_history', partial(handlers.get_compliance_history, node))
         app.router.add_get('/api/network/stats', self._handle_network_stats)
-        app.router.add_get('/api/network/peers', self._handle_network_peers)
+        app.router.add_get('/api/network/peers', partial(handlers.get_peers, node))
 
         # Dashboard info endpoint
         app.router.add_get('/api/dashboard/info', self._handle_dashboard_info)
 
         # Serve static files if available
-        if self.static_path.exists() and (self.static_path / 'index.html').exists():
-            # Serve assets directory
+        if has_static:
+            if os.environ.get('AIOHTTP_NOSENDFILE'):
+                logger.warning(
+                    "AIOHTTP_NOSENDFILE is set; dashboard assets will be "
+                    "copied through userspace instead of using sendfile()"
+                )
+
+            # Hashed build assets get their own app so the immutable cache
+            # header hook only runs for them, not for every API response
             assets_path = self.static_path / 'assets'
-            if assets_path.exists():
-                app.router.add_static('/assets', assets_path)
+            if assets_path.is_dir():
+                app.add_subapp('/assets/', self._create_assets_app(assets_path))
 
-            # Serve index.html for SPA routing (catch-all)
+            # Static mount goes last so /api/* and /ws match first; client
+            # routes are answered with index.html by the SPA middleware
             app.router.add_get('/', self._serve_index)
-            app.router.add_get('/{path:.*}', self._serve_static_or_index)
+            app.router.add_static(
+                '/',
+                self.static_path,
+                show_index=False,
+                chunk_size=STATIC_CHUNK_SIZE
+            )
             logger.info(f"Serving Vue.js dashboard from {self.static_path}")
         else:
             app.router.add_get('/', self._handle_no_static)
@@ -86,15 +160,12 @@ class DashboardAPI:
                 "Run 'python scripts/build_dashboard.py' to build it."
             )
 
-        self.runner = aiohttp.web.AppRunner(app)
-        await self.runner.setup()
-        site = aiohttp.web.TCPSite(self.runner, '0.0.0.0', self.port)
-        await site.start()
-        logger.info(f"Dashboard API started on port {self.port}")
+        return app
 
     async def stop(self):
         """Stop the Dashboard API server."""
         await self.ws_manager.close_all()
+        await self._jobs.shutdown()
         if self.runner:
             await self.runner.cleanup()
             logger.info("Dashboard API stopped")
@@ -105,7 +176,7 @@ class DashboardAPI:
         try:
             return await handler(request)
         except ValidationError as e:
-            return aiohttp.web.json_response(
+            return json_response(
                 {'error': e.message, 'field': e.field},
                 status=422
             )
@@ -113,68 +184,104 @@ class DashboardAPI:
             raise
         except Exception as e:
             logger.exception(f"Dashboard API error: {e}")
-            return aiohttp.web.json_response(
+            return json_response(
                 {'error': 'Internal server error'},
                 status=500
             )
 
+    @aiohttp.web.middleware
+    async def _spa_fallback_middleware(self, request, handler):
+        """Serve index.html for client-side routes (Vue history mode).
+
+        Browser navigations to extension-less paths are dashboard routes
+        rather than files, so they skip the static file lookup entirely.
+        """
+        if (
+            request.method == 'GET'
+            and not request.path.startswith(('/api/', '/ws'))
+            and '.' not in request.path.rsplit('/', 1)[-1]
+            and 'text/html' in request.headers.get('Accept', '')
+        ):
+            return await self._serve_index(request)
+        return await handler(request)
+
     # Static file handlers
 
+    def _create_assets_app(self, assets_path: Path) -> aiohttp.web.Application:
+        """Build the sub-application serving content-hashed build assets.
+
+        It has no middlewares of its own; the main app's still wrap it.
+        """
+        assets_app = aiohttp.web.Application()
+        assets_app.router.add_static(
+            '/',
+            assets_path,
+            show_index=False,
+            chunk_size=STATIC_CHUNK_SIZE
+        )
+        assets_app.on_response_prepare.append(self._set_asset_cache_headers)
+        return assets_app
+
+    async def _set_asset_cache_headers(self, request, response):
+        """Mark content-hashed build assets as immutable."""
+        if response.status == 200:
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+
     async def _serve_index(self, request):
         """Serve index.html."""
         index_path = self.static_path / 'index.html'
-        return aiohttp.web.FileResponse(index_path)
-
-    async def _serve_static_or_index(self, request):
-        """Serve static file or fall back to index.html for SPA routing."""
-        path = request.match_info['path']
-
-        # Check if it's a static file
-        file_path = self.static_path / path
-        if file_path.exists() and file_path.is_file():
-            # Determine content type
-            content_type, _ = mimetypes.guess_type(str(file_path))
-            return aiohttp.web.FileResponse(
-                file_path,
-                headers={'Content-Type': content_type or 'application/octet-stream'}
-            )
-
-        # Fall back to index.html for SPA routing
-        return await self._serve_index(request)
+        return aiohttp.web.FileResponse(index_path, chunk_size=STATIC_CHUNK_SIZE)
 
     async def _handle_no_static(self, request):
         """Handle requests when static files are not available."""
-        return aiohttp.web.json_response({
-            'message': 'Dashboard API is running',
-            'note': 'Vue.js dashboard not built. Run: python scripts/build_dashboard.py',
-            'websocket': f'ws://localhost:{self.port}/ws',
-            'api_prefix': '/api',
-            'endpoints': [
-                'GET /api/health',
-                'GET /api/balance/{address}',
-                'POST /api/transfer',
-                'GET /api/tokens',
-                'POST /api/tokens',
-                'POST /api/share_data',
-                'GET /api/data/{data_hash}',
-                'GET /api/verify_data/{data_hash}',
-                'GET /api/compliance_history',
-                'GET /api/network/stats',
-                'GET /api/network/peers',
-                'GET /api/dashboard/info'
-            ]
-        })
+        return aiohttp.web.Response(body=self._no_static_body, content_type='application/json')
+
+    # Response cache
+
+    def _cached_json(
+        self,
+        request: aiohttp.web.Request,
+        builder: Callable[[], Any],
+        ttl: float = RESPONSE_CACHE_TTL
+    ) -> aiohttp.web.Response:
+        """Serve a read-only payload from the response cache.
+
+        The payload is only rebuilt and re-serialized when the cached body
+        for this path is older than ``ttl`` seconds.
+
+        Args:
+            request: The incoming request (used as the cache key).
+            builder: Callable returning the JSON-serializable payload.
+            ttl: Maximum age of a cached body in seconds.
+
+        Returns:
+            JSON response with the cached body.
+        """
+        now = time.monotonic()
+        entry = self._resp_cache.get(request.path)
+        if entry is None or now - entry[0] > ttl:
+            entry = (now, dumps(builder()))
+            self._resp_cache[request.path] = entry
+        return aiohttp.web.Response(body=entry[1], content_type='application/json')
+
+    def _invalidate_cache(self, path: str) -> None:
+        """Drop cached responses for a path after a mutation."""
+        self._resp_cache.pop(path, None)
 
     # API handlers (proxy to node services)
 
     async def _handle_health(self, request):
         """Get health status."""
+        return self._cached_json(request, self._health_payload)
+
+    def _health_payload(self) -> dict:
+        """Build the health status payload."""
         blockchain_connected = self.node.blockchain_interface.w3 is not None
         p2p_running = self.node.p2p_network.is_running
 
         status = 'healthy' if (blockchain_connected and p2p_running) else 'degraded'
 
-        return aiohttp.web.json_response({
+        return {
             'status': status,
             'components': {
                 'blockchain': 'connected' if blockchain_connected else 'disconnected',
@@ -183,218 +290,33 @@ class DashboardAPI:
             },
             'version': '0.1.0',
             'node_id': self.node.config.node_id
-        })
-
-    async def _handle_balance(self, request):
-        """Get token balance for an address."""
-        address = request.match_info['address']
-        address = validate_eth_address(address, 'address')
-
-        try:
-            balance = self.node.token_manager.get_balance(
-                address,
-                self.node.get_native_token_address()
-            )
-            return aiohttp.web.json_response({
-                'address': address,
-                'balance': str(balance),
-                'token': self.node.get_native_token_address()
-            })
-        except ValueError as e:
-            return aiohttp.web.json_response(
-                {'error': str(e)},
-                status=400
-            )
-
-    async def _handle_transfer(self, request):
-        """Transfer tokens between addresses."""
-        try:
-            data = await request.json()
-        except Exception:
-            raise ValidationError("Invalid JSON body")
-
-        validated = validate_transfer_request(data)
-
-        try:
-            success, tx_hash = self.node.payment_processor.process_payment(
-                validated.from_address,
-                validated.to_address,
-                validated.amount,
-                validated.token
-            )
-            return aiohttp.web.json_response({
-                'success': success,
-                'tx_hash': tx_hash,
-                'from': validated.from_address,
-                'to': validated.to_address,
-                'amount': str(validated.amount)
-            }, status=200 if success else 400)
-        except ValueError as e:
-            return aiohttp.web.json_response(
-                {'error': str(e)},
-                status=400
-            )
+        }
 
     async def _handle_list_tokens(self, request):
         """List all supported tokens."""
-        tokens = []
-
-        # Add native token
-        tokens.append({
-            'address': self.node.get_native_token_address(),
-            'type': 'native',
-            'symbol': 'ETH'
-        })
-
-        # Add ERC20 tokens
-        for addr in self.node.token_manager.supported_tokens:
-            tokens.append({
-                'address': addr,
-                'type': 'erc20'
-            })
-
-        return aiohttp.web.json_response({'tokens': tokens})
+        return self._cached_json(request, partial(handlers.tokens_payload, self.node))
 
     async def _handle_add_token(self, request):
         """Add a new supported token."""
-        try:
-            data = await request.json()
-        except Exception:
-            raise ValidationError("Invalid JSON body")
-
-        address = validate_eth_address(data.get('address'), 'address')
-        abi = data.get('abi')
-
-        if not abi or not isinstance(abi, list):
-            raise ValidationError("abi is required and must be an array", 'abi')
-
-        try:
-            self.node.token_manager.add_supported_token(address, abi)
-            return aiohttp.web.json_response({
-                'success': True,
-                'address': address
-            }, status=201)
-        except Exception as e:
-            return aiohttp.web.json_response(
-                {'error': str(e)},
-                status=400
-            )
-
-    async def _handle_share_data(self, request):
-        """Share encrypted data with a recipient."""
-        try:
-            data = await request.json()
-        except Exception:
-            raise ValidationError("Invalid JSON body")
-
-        validated = validate_share_data_request(data)
-
-        try:
-            tx_hash = await self.node.share_data(
-                validated.data,
-                validated.recipient,
-                validated.payment_token,
-                validated.payment_amount
-            )
-            return aiohttp.web.json_response({
-                'success': True,
-                'tx_hash': tx_hash,
-                'recipient': validated.recipient
-            }, status=201)
-        except ValueError as e:
-            return aiohttp.web.json_response(
-                {'error': str(e)},
-                status=400
-            )
-
-    async def _handle_get_data(self, request):
-        """Retrieve shared data by hash."""
-        data_hash = request.match_info['data_hash']
-        data_hash = validate_hash(data_hash, 'data_hash')
-
-        try:
-            data = await self.node.get_shared_data(data_hash)
-            if data is None:
-                return aiohttp.web.json_response(
-                    {'error': 'Data not found'},
-                    status=404
-                )
-            return aiohttp.web.json_response({
-                'hash': data_hash,
-                'data': data
-            })
-        except Exception as e:
-            logger.error(f"Error retrieving data {data_hash}: {e}")
-            return aiohttp.web.json_response(
-                {'error': 'Failed to retrieve data'},
-                status=500
-            )
-
-    async def _handle_verify_data(self, request):
-        """Verify data compliance on blockchain."""
-        data_hash = request.match_info['data_hash']
-        data_hash = validate_hash(data_hash, 'data_hash')
-
-        try:
-            is_verified = self.node.compliance_manager.verify_compliance(
-                'data_share',
-                data_hash
-            )
-            return aiohttp.web.json_response({
-                'hash': data_hash,
-                'verified': is_verified,
-                'event_type': 'data_share'
-            })
-        except Exception as e:
-            logger.error(f"Compliance verification failed: {e}")
-            return aiohttp.web.json_response(
-                {'error': 'Verification failed'},
-                status=500
-            )
-
-    async def _handle_compliance_history(self, request):
-        """Get compliance event history."""
-        filters_str = request.query.get('filters')
-        filters = validate_filters(filters_str)
-
-        try:
-            history = self.node.compliance_manager.get_compliance_history(filters)
-            return aiohttp.web.json_response({
-                'history': history,
-                'count': len(history),
-                'filters': filters
-            })
-        except Exception as e:
-            logger.error(f"Failed to get compliance history: {e}")
-            return aiohttp.web.json_response(
-                {'error': 'Failed to retrieve history'},
-                status=500
-            )
+        response = await handlers.add_token(self.node, request)
+        if response.status == 201:
+            self._invalidate_cache('/api/tokens')
+        return response
 
     async def _handle_network_stats(self, request):
         """Get P2P network statistics."""
-        stats = self.node.p2p_network.get_network_stats()
-        return aiohttp.web.json_response(stats)
-
-    async def _handle_network_peers(self, request):
-        """Get list of connected peers."""
-        healthy_only = request.query.get('healthy', 'false').lower() == 'true'
-
-        if healthy_only:
-            peers = self.node.p2p_network.get_healthy_peers()
-        else:
-            peers = self.node.p2p_network.get_connected_peers()
-
-        return aiohttp.web.json_response({
-            'peers': peers,
-            'count': len(peers)
-        })
+        return self._cached_json(request, self.node.p2p_network.get_network_stats)
 
     async def _handle_dashboard_info(self, request):
         """Get dashboard-specific information."""
-        return aiohttp.web.json_response({
+        return self._cached_json(request, self._dashboard_info_payload)
+
+    def _dashboard_info_payload(self) -> dict:
+        """Build the dashboard info payload."""
+        return {
             'node_id': self.node.config.node_id,
             'websocket_clients': self.ws_manager.connection_count,
+            'websocket_slow_disconnects': self.ws_manager.slow_client_disconnects,
             'event_history_size': self.event_bus.history_size,
             'api_version': '1.0.0',
             'ports': {
@@ -402,4 +324,4 @@ class DashboardAPI:
                 'external_api': 8081,
                 'dashboard': self.port
             }
-        })
+        }
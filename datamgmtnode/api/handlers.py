@@ -0,0 +1,328 @@
+"""Request handlers shared by the internal, external and dashboard APIs.
+
+Each handler takes the node as its first argument; the API classes bind
+it with ``functools.partial`` when registering routes. Imports are
+relative so that ``ValidationError`` is the same class the importing
+API's error middleware catches, whichever package root it was loaded from.
+
+Node services make blocking web3 RPC calls, so handlers run them with
+``asyncio.to_thread`` to keep the event loop serving other requests.
+"""
+
+import asyncio
+import logging
+from functools import partial
+
+import aiohttp.web
+
+from .jobs import JobLimitError, JobRegistry
+from .responses import json_response, stream_json_list
+from .validation import (
+    ValidationError,
+    ValidatedShareDataRequest,
+    validate_eth_address,
+    validate_filters,
+    validate_hash,
+    validate_idempotency_key,
+    validate_share_data_request,
+    validate_transfer_request,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _read_json(request: aiohttp.web.Request):
+    """Parse the request body as JSON."""
+    try:
+        return await request.json()
+    except Exception:
+        raise ValidationError("Invalid JSON body")
+
+
+# Token operations
+
+async def get_balance(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Get token balance for an address."""
+    address = request.match_info['address']
+    address = validate_eth_address(address, 'address')
+
+    token = node.get_native_token_address()
+
+    try:
+        balance = await asyncio.to_thread(node.token_manager.get_balance, address, token)
+        return json_response({
+            'address': address,
+            'balance': str(balance),
+            'token': token
+        })
+    except ValueError as e:
+        return json_response(
+            {'error': str(e)},
+            status=400
+        )
+
+
+async def transfer(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Transfer tokens between addresses."""
+    data = await _read_json(request)
+    validated = validate_transfer_request(data)
+
+    try:
+        success, tx_hash = await asyncio.to_thread(
+            node.payment_processor.process_payment,
+            validated.from_address,
+            validated.to_address,
+            validated.amount,
+            validated.token
+        )
+        return json_response({
+            'success': success,
+            'tx_hash': tx_hash,
+            'from': validated.from_address,
+            'to': validated.to_address,
+            'amount': str(validated.amount)
+        }, status=200 if success else 400)
+    except ValueError as e:
+        return json_response(
+            {'error': str(e)},
+            status=400
+        )
+
+
+def tokens_payload(node) -> dict:
+    """Build the supported tokens payload."""
+    tokens = []
+
+    # Add native token
+    tokens.append({
+        'address': node.get_native_token_address(),
+        'type': 'native',
+        'symbol': 'ETH'
+    })
+
+    # Add ERC20 tokens
+    for addr in node.token_manager.supported_tokens:
+        tokens.append({
+            'address': addr,
+            'type': 'erc20'
+        })
+
+    return {'tokens': tokens}
+
+
+async def list_tokens(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """List all supported tokens."""
+    return json_response(tokens_payload(node))
+
+
+async def add_token(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Add a new supported token."""
+    data = await _read_json(request)
+
+    address = validate_eth_address(data.get('address'), 'address')
+    abi = data.get('abi')
+
+    if not abi or not isinstance(abi, list):
+        raise ValidationError("abi is required and must be an array", 'abi')
+
+    try:
+        await asyncio.to_thread(node.token_manager.add_supported_token, address, abi)
+        return json_response({
+            'success': True,
+            'address': address
+        }, status=201)
+    except Exception as e:
+        return json_response(
+            {'error': str(e)},
+            status=400
+        )
+
+
+# Data operations
+
+async def _share(node, validated: ValidatedShareDataRequest) -> dict:
+    """Share validated data and build the success payload."""
+    tx_hash = await node.share_data(
+        validated.data,
+        validated.recipient,
+        validated.payment_token,
+        validated.payment_amount
+    )
+    return {
+        'success': True,
+        'tx_hash': tx_hash,
+        'recipient': validated.recipient
+    }
+
+
+async def share_data(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Share encrypted data with a recipient."""
+    data = await _read_json(request)
+    validated = validate_share_data_request(data)
+
+    try:
+        return json_response(await _share(node, validated), status=201)
+    except ValueError as e:
+        return json_response(
+            {'error': str(e)},
+            status=400
+        )
+
+
+def _job_payload(job_id: str, task: asyncio.Task) -> dict:
+    """Describe a share job's state and, once finished, its outcome."""
+    if not task.done():
+        return {'job_id': job_id, 'status': 'pending'}
+    if task.cancelled():
+        return {'job_id': job_id, 'status': 'failed', 'error': 'Job cancelled'}
+
+    error = task.exception()
+    if isinstance(error, ValueError):
+        return {'job_id': job_id, 'status': 'failed', 'error': str(error)}
+    if error is not None:
+        return {'job_id': job_id, 'status': 'failed', 'error': 'Failed to share data'}
+    return {'job_id': job_id, 'status': 'completed', **task.result()}
+
+
+async def submit_share_data(
+    node,
+    jobs: JobRegistry,
+    request: aiohttp.web.Request
+) -> aiohttp.web.Response:
+    """Start sharing data in the background and return a job to poll.
+
+    The job id is generated by the server. An ``Idempotency-Key`` header
+    makes the request safe to retry: resubmitting the same key from the
+    same client returns the existing job rather than sharing the data twice.
+    """
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key is not None:
+        # Scoped to the client so keys chosen by others never match
+        idempotency_key = (
+            request.remote,
+            validate_idempotency_key(idempotency_key, 'Idempotency-Key')
+        )
+
+    data = await _read_json(request)
+    validated = validate_share_data_request(data)
+
+    try:
+        job_id, _ = jobs.submit(partial(_share, node, validated), idempotency_key)
+    except JobLimitError as e:
+        return json_response(
+            {'error': str(e)},
+            status=503,
+            headers={'Retry-After': '1'}
+        )
+    return json_response(
+        _job_payload(job_id, jobs.get(job_id)),
+        status=202,
+        headers={'Location': f'/api/share_data/{job_id}'}
+    )
+
+
+async def get_share_data_job(
+    jobs: JobRegistry,
+    request: aiohttp.web.Request
+) -> aiohttp.web.Response:
+    """Get the status of a background share job."""
+    job_id = request.match_info['job_id']
+    task = jobs.get(job_id)
+    if task is None:
+        return json_response(
+            {'error': 'Job not found'},
+            status=404
+        )
+    return json_response(_job_payload(job_id, task))
+
+
+async def get_data(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Retrieve shared data by hash."""
+    data_hash = request.match_info['data_hash']
+    data_hash = validate_hash(data_hash, 'data_hash')
+
+    try:
+        data = await node.get_shared_data(data_hash)
+        if data is None:
+            return json_response(
+                {'error': 'Data not found'},
+                status=404
+            )
+        return json_response({
+            'hash': data_hash,
+            'data': data
+        })
+    except Exception as e:
+        logger.error(f"Error retrieving data {data_hash}: {e}")
+        return json_response(
+            {'error': 'Failed to retrieve data'},
+            status=500
+        )
+
+
+async def verify_data(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Verify data compliance on blockchain."""
+    data_hash = request.match_info['data_hash']
+    data_hash = validate_hash(data_hash, 'data_hash')
+
+    try:
+        is_verified = await asyncio.to_thread(
+            node.compliance_manager.verify_compliance,
+            'data_share',
+            data_hash
+        )
+        return json_response({
+            'hash': data_hash,
+            'verified': is_verified,
+            'event_type': 'data_share'
+        })
+    except Exception as e:
+        logger.error(f"Compliance verification failed: {e}")
+        return json_response(
+            {'error': 'Verification failed'},
+            status=500
+        )
+
+
+async def get_compliance_history(node, request: aiohttp.web.Request) -> aiohttp.web.StreamResponse:
+    """Get compliance event history."""
+    # Repeated ?filter= parameters; ?filters=a,b is still accepted
+    filters = validate_filters(
+        request.query.getall('filter', None) or request.query.get('filters')
+    )
+
+    try:
+        history = await asyncio.to_thread(node.compliance_manager.get_compliance_history, filters)
+    except Exception as e:
+        logger.error(f"Failed to get compliance history: {e}")
+        return json_response(
+            {'error': 'Failed to retrieve history'},
+            status=500
+        )
+
+    return await stream_json_list(
+        request, 'history', history, extra={'filters': filters}
+    )
+
+
+# Network operations
+
+async def get_network_stats(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Get P2P network statistics."""
+    stats = node.p2p_network.get_network_stats()
+    return json_response(stats)
+
+
+async def get_peers(node, request: aiohttp.web.Request) -> aiohttp.web.Response:
+    """Get list of connected peers."""
+    healthy_only = request.query.get('healthy', 'false').lower() == 'true'
+
+    if healthy_only:
+        peers = node.p2p_network.get_healthy_peers()
+    else:
+        peers = node.p2p_network.get_connected_peers()
+
+    return json_response({
+        'peers': peers,
+        'count': len(peers)
+    })
@@ -0,0 +1,130 @@
+"""Background jobs started by API requests and polled for their result."""
+
+import asyncio
+import logging
+import secrets
+from collections import OrderedDict
+from typing import Any, Callable, Coroutine, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for polling before the oldest are forgotten
+MAX_TRACKED_JOBS = 1000
+
+# Jobs allowed to run at once; further submissions are refused
+MAX_PENDING_JOBS = 100
+
+# Seconds shutdown waits for running jobs before cancelling them
+SHUTDOWN_TIMEOUT = 10.0
+
+
+class JobLimitError(Exception):
+    """Raised when too many jobs are already running."""
+
+
+class JobRegistry:
+    """Runs request work as tasks and keeps their outcome for polling.
+
+    Job ids are always random, so a job's result is only visible to whoever
+    was given its id. An optional idempotency key maps privately to the job
+    it started: submitting a key that is already tracked returns the
+    existing job instead of starting the work again, so clients can safely
+    retry a request whose response they lost.
+    """
+
+    def __init__(self, max_jobs: int = MAX_TRACKED_JOBS, max_pending: int = MAX_PENDING_JOBS):
+        """Initialize the registry.
+
+        Args:
+            max_jobs: Number of jobs to keep before pruning finished ones.
+            max_pending: Number of jobs that may run at once.
+        """
+        self.max_jobs = max_jobs
+        self.max_pending = max_pending
+        self._jobs: 'OrderedDict[str, asyncio.Task]' = OrderedDict()
+        self._job_ids: Dict[Hashable, str] = {}
+        self._job_keys: Dict[str, Hashable] = {}
+        self._pending = 0
+
+    def submit(
+        self,
+        work: Callable[[], Coroutine[Any, Any, Any]],
+        idempotency_key: Optional[Hashable] = None
+    ) -> Tuple[str, bool]:
+        """Start a job unless one with the same idempotency key exists.
+
+        Args:
+            work: Factory returning the coroutine to run. It is only
+                called when a new job is started.
+            idempotency_key: Key identifying a retried request. Callers
+                should scope it to the client (e.g. with its address) so
+                clients cannot collide.
+
+        Returns:
+            Tuple of (job_id, created).
+
+        Raises:
+            JobLimitError: If ``max_pending`` jobs are already running.
+        """
+        if idempotency_key is not None:
+            job_id = self._job_ids.get(idempotency_key)
+            if job_id is not None:
+                return job_id, False
+
+        if self._pending >= self.max_pending:
+            raise JobLimitError(f"Too many pending jobs (limit {self.max_pending})")
+
+        job_id = secrets.token_hex(16)
+        task = asyncio.create_task(work())
+        task.add_done_callback(self._on_done)
+        self._pending += 1
+        self._jobs[job_id] = task
+        if idempotency_key is not None:
+            self._job_ids[idempotency_key] = job_id
+            self._job_keys[job_id] = idempotency_key
+        self._prune()
+        return job_id, True
+
+    def get(self, job_id: str) -> Optional[asyncio.Task]:
+        """Get the task for a job, or None if it is unknown."""
+        return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs once over the limit."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [k for k, t in self._jobs.items() if t.done()][:excess]:
+            del self._jobs[job_id]
+            key = self._job_keys.pop(job_id, None)
+            if key is not None:
+                del self._job_ids[key]
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        """Count the job as finished and log unexpected errors.
+
+        Retrieving the exception also stops asyncio warning that it was
+        never retrieved.
+        """
+        self._pending -= 1
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and not isinstance(error, ValueError):
+            logger.error(f"Background job failed: {error}")
+
+    async def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Wait for running jobs, cancelling any still running after timeout."""
+        running = [t for t in self._jobs.values() if not t.done()]
+        if running:
+            _, pending = await asyncio.wait(running, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"Cancelled {len(pending)} unfinished jobs")
+        self._jobs.clear()
+        self._job_ids.clear()
+        self._job_keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
@@ -1,11 +1,37 @@
 import time
 import logging
-from collections import defaultdict
-from typing import Dict, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import aiohttp.web
 
 logger = logging.getLogger(__name__)
 
+# Health check paths that are never rate limited
+RATE_LIMIT_EXEMPT_PATHS = frozenset({'/health', '/healthz', '/ready'})
+
+# 429 body with a placeholder for retry_after, so denials skip JSON encoding
+RATE_LIMITED_BODY = b'{"error":"Rate limit exceeded","retry_after":%s}'
+
+# Buckets are split across this many dicts (a power of two) so stale
+# entries can be swept one shard at a time
+BUCKET_SHARDS = 32
+
+# Seconds for the incremental sweep to visit every shard once
+SWEEP_INTERVAL = 60.0
+
+# Buckets idle this long are removed by the sweep; any bucket idle for
+# burst_size / requests_per_second seconds is full, so nothing is lost
+BUCKET_MAX_AGE = 3600.0
+
+
+class _TokenBucket:
+    """Mutable per-client bucket state, updated in place on each request."""
+
+    __slots__ = ('tokens', 'last_update')
+
+    def __init__(self, tokens: float, last_update: float):
+        self.tokens = tokens
+        self.last_update = last_update
+
 
 class RateLimiter:
     """
@@ -25,10 +51,13 @@ class RateLimiter:
         """
         self.requests_per_second = requests_per_second
         self.burst_size = burst_size
-        # Dict mapping IP -> (tokens, last_update_time)
-        self._buckets: Dict[str, Tuple[float, float]] = defaultdict(
-            lambda: (float(burst_size), time.monotonic())
-        )
+        # Shards of IP -> bucket state, selected by hash(ip)
+        self._shards: List[Dict[str, _TokenBucket]] = [{} for _ in range(BUCKET_SHARDS)]
+        self._next_shard = 0
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL / BUCKET_SHARDS
+
+    def __contains__(self, client_ip: str) -> bool:
+        return client_ip in self._shards[hash(client_ip) & (BUCKET_SHARDS - 1)]
 
     def _get_client_ip(self, request: aiohttp.web.Request) -> str:
         """Extract client IP from request, considering proxies."""
@@ -36,7 +65,7 @@ class RateLimiter:
         forwarded = request.headers.get('X-Forwarded-For')
         if forwarded:
             # Take the first IP in the chain (original client)
-            return forwarded.split(',')[0].strip()
+            return forwarded.partition(',')[0].strip()
 
         real_ip = request.headers.get('X-Real-IP')
         if real_ip:
@@ -56,72 +85,129 @@ class RateLimiter:
         Returns:
             Tuple of (allowed: bool, retry_after: float seconds)
         """
-        client_ip = self._get_client_ip(request)
+        return self.consume(self._get_client_ip(request))
+
+    def consume(self, client_ip: str) -> Tuple[bool, float]:
+        """
+        Take a token from a client's bucket if one is available.
+
+        Args:
+            client_ip: Client identifier from ``_get_client_ip``
+
+        Returns:
+            Tuple of (allowed: bool, retry_after: float seconds)
+        """
         now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep_next_shard(now)
 
-        tokens, last_update = self._buckets[client_ip]
+        shard = self._shards[hash(client_ip) & (BUCKET_SHARDS - 1)]
+        bucket = shard.get(client_ip)
+        if bucket is None:
+            bucket = shard[client_ip] = _TokenBucket(float(self.burst_size), now)
 
         # Replenish tokens based on time elapsed
-        time_passed = now - last_update
-        tokens = min(self.burst_size, tokens + time_passed * self.requests_per_second)
+        tokens = bucket.tokens + (now - bucket.last_update) * self.requests_per_second
+        if tokens > self.burst_size:
+            tokens = self.burst_size
+        bucket.last_update = now
 
         if tokens >= 1.0:
             # Allow request, consume one token
-            self._buckets[client_ip] = (tokens - 1.0, now)
+            bucket.tokens = tokens - 1.0
             return True, 0.0
         else:
             # Deny request, calculate retry time
-            self._buckets[client_ip] = (tokens, now)
+            bucket.tokens = tokens
             retry_after = (1.0 - tokens) / self.requests_per_second
             return False, retry_after
 
-    def cleanup_old_entries(self, max_age_seconds: float = 3600.0):
-        """Remove entries that haven't been accessed recently."""
-        now = time.monotonic()
+    def _sweep_next_shard(self, now: float) -> None:
+        """Remove stale entries from one shard, round-robin.
+
+        Called from the request path, so each pause covers only
+        1/BUCKET_SHARDS of the tracked clients.
+        """
+        shard = self._shards[self._next_shard]
+        self._next_shard = (self._next_shard + 1) % BUCKET_SHARDS
+        self._next_sweep = now + SWEEP_INTERVAL / BUCKET_SHARDS
+
+        removed = self._remove_stale(shard, now, BUCKET_MAX_AGE)
+        if removed:
+            logger.debug(f"Swept {removed} stale rate limit entries")
+
+    @staticmethod
+    def _remove_stale(shard: Dict[str, _TokenBucket], now: float, max_age_seconds: float) -> int:
+        """Remove entries from a shard not accessed within max_age_seconds."""
         old_ips = [
-            ip for ip, (_, last_update) in self._buckets.items()
-            if now - last_update > max_age_seconds
+            ip for ip, bucket in shard.items()
+            if now - bucket.last_update > max_age_seconds
         ]
         for ip in old_ips:
-            del self._buckets[ip]
+            del shard[ip]
+        return len(old_ips)
+
+    def cleanup_old_entries(self, max_age_seconds: float = BUCKET_MAX_AGE):
+        """Remove entries that haven't been accessed recently."""
+        now = time.monotonic()
+        removed = sum(
+            self._remove_stale(shard, now, max_age_seconds) for shard in self._shards
+        )
 
-        if old_ips:
-            logger.debug(f"Cleaned up {len(old_ips)} stale rate limit entries")
+        if removed:
+            logger.debug(f"Cleaned up {removed} stale rate limit entries")
 
 
-def create_rate_limit_middleware(rate_limiter: RateLimiter):
+def create_rate_limit_middleware(
+    rate_limiter: RateLimiter,
+    error_handler: Optional[Callable[[aiohttp.web.Request, Exception], aiohttp.web.StreamResponse]] = None
+):
     """
     Create an aiohttp middleware that enforces rate limiting.
 
+    When ``error_handler`` is given the middleware also turns exceptions
+    raised by the handler (other than ``HTTPException``) into responses,
+    so an API needs one middleware frame per request instead of two.
+
     Args:
         rate_limiter: RateLimiter instance to use
+        error_handler: Optional callable building a response for an
+            exception raised by the handler
 
     Returns:
         aiohttp middleware function
     """
+    get_client_ip = rate_limiter._get_client_ip
+    consume = rate_limiter.consume
+
     @aiohttp.web.middleware
     async def rate_limit_middleware(request: aiohttp.web.Request, handler):
         # Skip rate limiting for health check endpoints
-        if request.path in ('/health', '/healthz', '/ready'):
+        if request.path not in RATE_LIMIT_EXEMPT_PATHS:
+            # Resolved once and reused for the log line on denial
+            client_ip = get_client_ip(request)
+            allowed, retry_after = consume(client_ip)
+
+            if not allowed:
+                # Lazy formatting: denials can be attacker-driven, and the
+                # message is only built if WARNING is enabled
+                logger.warning("Rate limit exceeded for %s on %s", client_ip, request.path)
+                return aiohttp.web.Response(
+                    body=RATE_LIMITED_BODY % str(round(retry_after, 2)).encode(),
+                    status=429,
+                    content_type='application/json',
+                    headers={'Retry-After': str(int(retry_after) + 1)}
+                )
+
+        if error_handler is None:
             return await handler(request)
 
-        allowed, retry_after = rate_limiter.is_allowed(request)
-
-        if not allowed:
-            logger.warning(
-                f"Rate limit exceeded for {rate_limiter._get_client_ip(request)} "
-                f"on {request.path}"
-            )
-            return aiohttp.web.json_response(
-                {
-                    'error': 'Rate limit exceeded',
-                    'retry_after': round(retry_after, 2)
-                },
-                status=429,
-                headers={'Retry-After': str(int(retry_after) + 1)}
-            )
-
-        return await handler(request)
+        try:
+            return await handler(request)
+        except aiohttp.web.HTTPException:
+            raise
+        except Exception as e:
+            return error_handler(request, e)
 
     return rate_limit_middleware
 
@@ -0,0 +1,110 @@
+"""Response helpers shared by the HTTP APIs."""
+
+from typing import Any, Iterable, Mapping, Optional
+
+import aiohttp.web
+
+from datamgmtnode.json_codec import dumps
+
+# Bytes buffered before each write when streaming JSON lists
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# JSON bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = 1024
+
+
+def json_response(
+    data: Any,
+    status: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> aiohttp.web.Response:
+    """Build a JSON response, encoding the body with the fast JSON codec.
+
+    Drop-in replacement for ``aiohttp.web.json_response``.
+
+    Args:
+        data: JSON-serializable payload.
+        status: HTTP status code.
+        headers: Extra response headers.
+
+    Returns:
+        Response with an ``application/json`` body.
+    """
+    return aiohttp.web.Response(
+        body=dumps(data),
+        status=status,
+        headers=headers,
+        content_type='application/json'
+    )
+
+
+@aiohttp.web.middleware
+async def compression_middleware(request, handler):
+    """Compress JSON responses larger than ``COMPRESSION_MIN_SIZE``.
+
+    aiohttp picks gzip or deflate from the request's ``Accept-Encoding``
+    and sends the body as-is when the client accepts neither. Small
+    bodies, files and WebSocket responses are left alone.
+    """
+    response = await handler(request)
+    if (
+        isinstance(response, aiohttp.web.Response)
+        and not response.prepared
+        and response.content_type == 'application/json'
+        and response.body is not None
+        and len(response.body) >= COMPRESSION_MIN_SIZE
+    ):
+        response.enable_compression()
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+async def stream_json_list(
+    request: aiohttp.web.Request,
+    key: str,
+    items: Iterable[Any],
+    extra: Optional[Mapping[str, Any]] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> aiohttp.web.StreamResponse:
+    """Stream ``{key: [...], "count": N, **extra}`` without building it whole.
+
+    Items are encoded one at a time and flushed in ``chunk_size`` batches,
+    so memory stays bounded by the chunk size rather than the list length.
+    ``items`` may be a generator; the count is taken while streaming.
+
+    Args:
+        request: The request being answered.
+        key: Name of the list field.
+        items: JSON-serializable items to emit.
+        extra: Additional top-level fields written after the count.
+        chunk_size: Buffered bytes per write.
+
+    Returns:
+        The prepared and completed stream response.
+    """
+    response = aiohttp.web.StreamResponse(
+        headers={'Content-Type': 'application/json', 'Vary': 'Accept-Encoding'}
+    )
+    # Lists are streamed because they can be large, so always offer to
+    # compress; aiohttp only does so if the client accepts it
+    response.enable_compression()
+    await response.prepare(request)
+
+    buffer = bytearray(b'{' + dumps(key) + b':[')
+    count = 0
+    for item in items:
+        if count:
+            buffer += b','
+        buffer += dumps(item)
+        count += 1
+        if len(buffer) >= chunk_size:
+            await response.write(bytes(buffer))
+            buffer.clear()
+
+    buffer += b'],"count":' + str(count).encode()
+    if extra:
+        buffer += b',' + dumps(dict(extra))[1:-1]
+    buffer += b'}'
+    await response.write(bytes(buffer))
+    await response.write_eof()
+    return response
@@ -1,12 +1,21 @@
 import re
 import logging
-from typing import Any, Optional
+from typing import Any, List, Optional, Union
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
-# Ethereum address pattern
-ETH_ADDRESS_PATTERN = re.compile(r'^0x[a-fA-F0-9]{40}$')
+# Ethereum address pattern (used with fullmatch)
+ETH_ADDRESS_PATTERN = re.compile(r'0x[a-fA-F0-9]{40}')
+
+# Lowercase SHA256 hex digest (checked after normalisation)
+HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+# Compliance history filter names
+FILTER_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+# Client-chosen idempotency keys for background jobs
+IDEMPOTENCY_KEY_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
 
 # Maximum sizes
 MAX_DATA_SIZE = 1024 * 1024  # 1MB
@@ -22,7 +31,7 @@ class ValidationError(Exception):
         super().__init__(message)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidatedTransferRequest:
     """Validated transfer request data."""
     from_address: str
@@ -31,7 +40,7 @@ class ValidatedTransferRequest:
     token: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidatedShareDataRequest:
     """Validated share data request."""
     data: str
@@ -50,7 +59,7 @@ def validate_eth_address(address: Any, field_name: str = "address") -> str:
 
     address = address.strip()
 
-    if not ETH_ADDRESS_PATTERN.match(address):
+    if not ETH_ADDRESS_PATTERN.fullmatch(address):
         raise ValidationError(f"{field_name} must be a valid Ethereum address (0x + 40 hex chars)", field_name)
 
     return address
@@ -126,12 +135,21 @@ def validate_hash(hash_value: Any, field_name: str = "hash") -> str:
     if len(hash_value) != 64:
         raise ValidationError(f"{field_name} must be a 64-character hex string", field_name)
 
-    if not all(c in '0123456789abcdef' for c in hash_value):
+    if not HASH_PATTERN.fullmatch(hash_value):
         raise ValidationError(f"{field_name} must contain only hexadecimal characters", field_name)
 
     return hash_value
 
 
+def validate_idempotency_key(key: Any, field_name: str = "idempotency_key") -> str:
+    """Validate a client-supplied idempotency key."""
+    if not isinstance(key, str) or not IDEMPOTENCY_KEY_PATTERN.fullmatch(key):
+        raise ValidationError(
+            f"{field_name} must be 1-64 letters, digits, '-' or '_'", field_name
+        )
+    return key
+
+
 def validate_transfer_request(data: dict) -> ValidatedTransferRequest:
     """Validate a token transfer request."""
     if not isinstance(data, dict):
@@ -172,18 +190,25 @@ def validate_share_data_request(data: dict) -> ValidatedShareDataRequest:
     )
 
 
-def validate_filters(filters_str: Optional[str]) -> Optional[list]:
-    """Validate and parse filter string."""
-    if not filters_str:
+def validate_filters(filters: Union[str, List[str], None]) -> Optional[list]:
+    """Validate filters given as a list or a comma-separated string.
+
+    A list (from repeated ``filter`` query parameters) is used as-is; the
+    string form is the legacy ``filters=a,b`` parameter and is split here.
+    """
+    if not filters:
         return None
 
-    filters = [f.strip() for f in filters_str.split(',') if f.strip()]
+    if isinstance(filters, str):
+        filters = [f.strip() for f in filters.split(',') if f.strip()]
+    else:
+        filters = [f for f in filters if f]
 
     # Validate each filter
     for f in filters:
         if len(f) > 100:
             raise ValidationError(f"Filter '{f[:20]}...' exceeds maximum length", 'filters')
-        if not re.match(r'^[a-zA-Z0-9_-]+$', f):
+        if not FILTER_PATTERN.match(f):
             raise ValidationError(f"Filter '{f}' contains invalid characters", 'filters')
 
     return filters if filters else None
@@ -3,14 +3,45 @@
 import asyncio
 import json
 import logging
-from typing import Optional, Set
+import weakref
+from typing import Any, Dict, List, Optional, Set, Union
 
-from aiohttp import WSMsgType, web
+from aiohttp import WSCloseCode, WSMsgType, web
 
 from datamgmtnode.dashboard.event_bus import Event, EventBus
+from datamgmtnode.json_codec import dumps, loads
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
+# aiohttp 3.11+ can send pre-encoded text frames
+_HAS_SEND_FRAME = hasattr(web.WebSocketResponse, 'send_frame')
+
+# Subprotocol clients offer to receive binary MessagePack frames
+MSGPACK_PROTOCOL = 'msgpack'
+
+# Seconds to collect events before broadcasting them together
+DEFAULT_BATCH_WINDOW = 0.02
+
+# Unsent bytes a client may have buffered before it is disconnected
+DEFAULT_MAX_BUFFERED_BYTES = 1024 * 1024
+
+
+def _event_to_dict(obj: Any) -> Dict[str, Any]:
+    """Encoder fallback for ``Event`` objects inside outgoing messages.
+
+    Checks for ``to_dict`` rather than the class: the node imports the event
+    bus as ``dashboard.event_bus``, so its events are not instances of the
+    ``Event`` imported here.
+    """
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
 
 class WebSocketManager:
     """Manages WebSocket connections for real-time updates.
@@ -19,16 +50,37 @@ class WebSocketManager:
     to all connected TUI and web dashboard clients.
     """
 
-    def __init__(self, event_bus: EventBus):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES
+    ):
         """Initialize WebSocket manager.
 
         Args:
             event_bus: Event bus instance for subscribing to events.
+            batch_window: Seconds to coalesce events before broadcasting.
+            max_buffered_bytes: Per-client limit on unsent bytes before the
+                client is disconnected as too slow.
         """
         self.event_bus = event_bus
-        self.connections: Set[web.WebSocketResponse] = set()
+        # Weak so a connection whose handler never reached its cleanup
+        # is dropped once nothing else references it
+        self.connections: 'weakref.WeakSet[web.WebSocketResponse]' = weakref.WeakSet()
         self._lock = asyncio.Lock()
 
+        # Events waiting for the next coalesced broadcast
+        self.batch_window = batch_window
+        self._pending_events: List[Event] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Backpressure: clients that stop draining are dropped
+        self.max_buffered_bytes = max_buffered_bytes
+        self.slow_client_disconnects = 0
+        # Background closes of slow clients; the loop only holds tasks weakly
+        self._close_tasks: Set[asyncio.Task] = set()
+
         # Subscribe to all events for broadcast
         event_bus.subscribe_all(self._broadcast_event)
 
@@ -41,7 +93,8 @@ class WebSocketManager:
         Returns:
             WebSocket response object.
         """
-        ws = web.WebSocketResponse(heartbeat=30)
+        protocols = (MSGPACK_PROTOCOL,) if msgpack is not None else ()
+        ws = web.WebSocketResponse(heartbeat=30, protocols=protocols)
         await ws.prepare(request)
 
         client_ip = request.remote or 'unknown'
@@ -59,7 +112,7 @@ class WebSocketManager:
 
         try:
             async for msg in ws:
-                if msg.type == WSMsgType.TEXT:
+                if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
                     await self._handle_message(ws, msg.data)
                 elif msg.type == WSMsgType.ERROR:
                     logger.error(f"WebSocket error: {ws.exception()}")
@@ -86,7 +139,7 @@ class WebSocketManager:
         """
         try:
             # Send connection acknowledgment
-            await ws.send_json({
+            await self._send(ws, {
                 'type': 'connected',
                 'data': {
                     'message': 'WebSocket connection established',
@@ -97,37 +150,88 @@ class WebSocketManager:
             # Send recent events for context
             recent = self.event_bus.get_recent_events(20)
             for event in recent:
-                await ws.send_str(event.to_json())
+                await self._send(ws, event)
 
         except Exception as e:
             logger.error(f"Error sending initial state: {e}")
 
+    @staticmethod
+    def _is_binary(ws: web.WebSocketResponse) -> bool:
+        """Check whether a connection negotiated MessagePack frames."""
+        return ws.ws_protocol == MSGPACK_PROTOCOL
+
+    @staticmethod
+    def _encode(message: Any, binary: bool) -> bytes:
+        """Encode a message as a MessagePack or UTF-8 JSON frame payload.
+
+        Messages may contain ``Event`` objects; they are encoded in their
+        ``to_dict`` form without building the dict first where possible.
+        """
+        if binary:
+            return msgpack.packb(message, use_bin_type=True, default=_event_to_dict)
+        return dumps(message, default=_event_to_dict)
+
+    async def _send_frame(
+        self,
+        ws: web.WebSocketResponse,
+        frame: bytes,
+        binary: bool
+    ) -> None:
+        """Send an already-encoded frame as a binary or text frame."""
+        if binary:
+            await ws.send_bytes(frame)
+        elif _HAS_SEND_FRAME:
+            # Sends the UTF-8 payload as-is instead of re-encoding a str
+            await ws.send_frame(frame, WSMsgType.TEXT)
+        else:
+            await ws.send_str(frame.decode())
+
+    @staticmethod
+    def _buffered_bytes(ws: web.WebSocketResponse) -> int:
+        """Get the bytes written to a connection but not yet sent."""
+        # aiohttp exposes no public accessor for the writer's transport
+        writer = getattr(ws, '_writer', None)
+        transport = getattr(writer, 'transport', None)
+        if transport is None:
+            return 0
+        return transport.get_write_buffer_size()
+
+    async def _send(self, ws: web.WebSocketResponse, message: Any) -> None:
+        """Encode and send a message in the connection's negotiated format."""
+        binary = self._is_binary(ws)
+        await self._send_frame(ws, self._encode(message, binary), binary)
+
     async def _handle_message(
         self,
         ws: web.WebSocketResponse,
-        data: str
+        data: Union[bytes, str]
     ) -> None:
         """Handle incoming WebSocket message.
 
         Args:
             ws: The WebSocket connection.
-            data: The message data as string.
+            data: The message data (JSON text or MessagePack bytes).
         """
         try:
-            message = json.loads(data)
+            if isinstance(data, bytes):
+                if msgpack is None:
+                    raise ValueError("binary frames require msgpack")
+                message = msgpack.unpackb(data, raw=False)
+            else:
+                message = loads(data)
             msg_type = message.get('type')
 
             if msg_type == 'ping':
-                await ws.send_json({'type': 'pong'})
+                await self._send(ws, {'type': 'pong'})
 
             elif msg_type == 'get_history':
                 # Client requesting event history
                 count = message.get('count', 50)
                 events = self.event_bus.get_recent_events(count)
-                await ws.send_json({
+                await self._send(ws, {
                     'type': 'history',
                     'data': {
-                        'events': [e.to_dict() for e in events],
+                        'events': events,
                         'count': len(events)
                     }
                 })
@@ -140,13 +244,17 @@ class WebSocketManager:
             else:
                 logger.warning(f"Unknown WebSocket message type: {msg_type}")
 
-        except json.JSONDecodeError:
-            logger.warning(f"Invalid WebSocket message: {data[:100]}")
+        except (json.JSONDecodeError, ValueError):
+            logger.warning(f"Invalid WebSocket message: {data[:100]!r}")
         except Exception as e:
             logger.error(f"Error handling WebSocket message: {e}")
 
     async def _broadcast_event(self, event: Event) -> None:
-        """Broadcast event to all connected clients.
+        """Queue an event for the next coalesced broadcast.
+
+        Events published within ``batch_window`` of each other are sent
+        to each client as one frame, so the fan-out cost is paid once
+        per window instead of once per event.
 
         Args:
             event: The event to broadcast.
@@ -154,37 +262,131 @@ class WebSocketManager:
         if not self.connections:
             return
 
-        message = event.to_json()
+        self._pending_events.append(event)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_pending_events())
+
+    async def _flush_pending_events(self) -> None:
+        """Broadcast the events collected during one batch window.
+
+        A single event is sent unchanged; several events are wrapped in a
+        ``batch`` message whose ``data.events`` holds them in order.
+        """
+        await asyncio.sleep(self.batch_window)
+
+        events, self._pending_events = self._pending_events, []
+        if not events:
+            return
+
+        if len(events) == 1:
+            message = events[0]
+        else:
+            message = {
+                'type': 'batch',
+                'data': {'events': events, 'count': len(events)}
+            }
+        await self._deliver(message)
+
+    async def _deliver(self, message: Any) -> int:
+        """Send a message to every open connection.
+
+        Args:
+            message: The message to send.
+
+        Returns:
+            Number of clients the message was sent to.
+        """
+        # Encode at most once per format: {binary: frame}
+        frames: Dict[bool, bytes] = {}
+        targets: List[web.WebSocketResponse] = []
+        sends = []
         dead_connections: Set[web.WebSocketResponse] = set()
+        slow_connections: Set[web.WebSocketResponse] = set()
 
+        # Snapshot under the lock and send outside it, so a slow client
+        # never holds up connects, disconnects or other broadcasts
         async with self._lock:
-            for ws in self.connections:
-                try:
-                    if not ws.closed:
-                        await ws.send_str(message)
-                except Exception as e:
-                    logger.warning(f"Failed to send to WebSocket: {e}")
-                    dead_connections.add(ws)
-
-            # Remove dead connections
-            self.connections -= dead_connections
+            connections = list(self.connections)
+
+        for ws in connections:
+            try:
+                if ws.closed:
+                    continue
+                # A client that is not draining would otherwise hold up
+                # the broadcast and grow server memory without bound
+                if self._buffered_bytes(ws) > self.max_buffered_bytes:
+                    slow_connections.add(ws)
+                    continue
+                binary = self._is_binary(ws)
+                frame = frames.get(binary)
+                if frame is None:
+                    frame = frames[binary] = self._encode(message, binary)
+                targets.append(ws)
+                sends.append(self._send_frame(ws, frame, binary))
+            except Exception as e:
+                logger.warning(f"Failed to send to WebSocket: {e}")
+                dead_connections.add(ws)
+
+        # Send to every client concurrently rather than one after another
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for ws, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to send to WebSocket: {result}")
+                dead_connections.add(ws)
+        sent_count = len(targets) - len(dead_connections.intersection(targets))
+
+        # Remove dead and slow connections
+        if dead_connections or slow_connections:
+            async with self._lock:
+                self.connections -= dead_connections | slow_connections
 
         if dead_connections:
             logger.debug(f"Removed {len(dead_connections)} dead connections")
 
+        if slow_connections:
+            self.slow_client_disconnects += len(slow_connections)
+            logger.warning(
+                f"Disconnecting {len(slow_connections)} slow WebSocket "
+                f"clients over {self.max_buffered_bytes} buffered bytes"
+            )
+            for ws in slow_connections:
+                # Closing waits on the client, so don't hold up the broadcast
+                task = asyncio.create_task(ws.close(
+                    code=WSCloseCode.TRY_AGAIN_LATER,
+                    message=b'Client too slow'
+                ))
+                self._close_tasks.add(task)
+                task.add_done_callback(self._on_close_done)
+
+        return sent_count
+
+    def _on_close_done(self, task: asyncio.Task) -> None:
+        """Forget a finished slow-client close and log its error, if any."""
+        self._close_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Error closing slow WebSocket: {task.exception()}")
+
     async def close_all(self) -> None:
         """Close all WebSocket connections gracefully."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._pending_events.clear()
+
         async with self._lock:
-            for ws in list(self.connections):
-                try:
-                    await ws.close(
-                        code=1001,
-                        message=b'Server shutting down'
-                    )
-                except Exception as e:
-                    logger.warning(f"Error closing WebSocket: {e}")
+            connections = list(self.connections)
             self.connections.clear()
 
+        # Each close waits for the client's reply, so close them together,
+        # along with any slow-client closes still in flight
+        results = await asyncio.gather(
+            *(ws.close(code=1001, message=b'Server shutting down') for ws in connections),
+            *self._close_tasks,
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Error closing WebSocket: {result}")
+
         logger.info("All WebSocket connections closed")
 
     @property
@@ -204,16 +406,4 @@ class WebSocketManager:
         if not self.connections:
             return 0
 
-        sent_count = 0
-        message_str = json.dumps(message)
-
-        async with self._lock:
-            for ws in list(self.connections):
-                try:
-                    if not ws.closed:
-                        await ws.send_str(message_str)
-                        sent_count += 1
-                except Exception:
-                    pass
-
-        return sent_count
+        return await self._deliver(message)
@@ -1,9 +1,17 @@
 import json
 import os
+import threading
+import time
 from blockchain.blockchain_interface import BlockchainInterface
 from web3 import Web3
 from eth_account import Account
 
+# Seconds a fetched gas price is reused for new transactions
+GAS_PRICE_TTL = 5.0
+
+# Node error messages meaning the local nonce is out of step with the chain
+NONCE_ERRORS = ('nonce too low', 'nonce too high')
+
 
 class EVMBlockchainInterface(BlockchainInterface):
     def __init__(self, network_url, private_key, contracts_dir=None):
@@ -13,6 +21,12 @@ class EVMBlockchainInterface(BlockchainInterface):
         self.w3 = None
         self.account = None
         self._contract_abis = {}  # Cache for contract ABIs
+        self._contracts = {}  # Cache for contract objects, bound to self.w3
+        self._artifacts = {}  # Cache for (abi, bytecode) by contract name
+        self._deployed_contracts = (None, {})  # (mtime, address -> contract name)
+        self._gas_price = None  # (gas price, monotonic time fetched)
+        self._nonce = None  # Next nonce for self.account, tracked after the first lookup
+        self._send_lock = threading.Lock()
 
     def connect(self):
         self.w3 = Web3(Web3.HTTPProvider(self.network_url))
@@ -22,23 +36,70 @@ class EVMBlockchainInterface(BlockchainInterface):
     def disconnect(self):
         self.w3 = None
         self.account = None
+        self._contracts.clear()
+        self._gas_price = None
+        self._nonce = None
 
     def get_balance(self, address):
         return self.w3.eth.get_balance(address)
 
     def send_transaction(self, transaction):
-        """Send a transaction and return the transaction hash."""
+        """Send a transaction and return the transaction hash.
+
+        The account nonce is read from the node once and then counted
+        locally, and the gas price is reused for GAS_PRICE_TTL seconds, so
+        most sends only need the gas estimate before broadcasting. A failed
+        broadcast drops the local nonce so the next send re-reads it; if the
+        node rejected the nonce itself, the transaction is re-signed with
+        the fresh nonce and sent once more.
+        """
         # Ensure transaction has required fields
-        if 'nonce' not in transaction:
-            transaction['nonce'] = self.w3.eth.get_transaction_count(self.account.address)
         if 'gas' not in transaction:
             transaction['gas'] = self.w3.eth.estimate_gas(transaction)
         if 'gasPrice' not in transaction and 'maxFeePerGas' not in transaction:
-            transaction['gasPrice'] = self.w3.eth.gas_price
+            transaction['gasPrice'] = self._get_gas_price()
+
+        # Nonces must be handed out and broadcast in order
+        with self._send_lock:
+            use_local_nonce = 'nonce' not in transaction
+            if use_local_nonce:
+                if self._nonce is None:
+                    self._nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+                transaction['nonce'] = self._nonce
+
+            try:
+                tx_hash = self._sign_and_send(transaction)
+            except Exception as e:
+                self._nonce = None
+                if not use_local_nonce or not self._is_nonce_error(e):
+                    raise
+                # Another sender used the account; resync and retry once
+                self._nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+                transaction['nonce'] = self._nonce
+                try:
+                    tx_hash = self._sign_and_send(transaction)
+                except Exception:
+                    self._nonce = None
+                    raise
+            if use_local_nonce:
+                self._nonce += 1
+        return tx_hash.hex()
 
+    def _sign_and_send(self, transaction):
         signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-        return tx_hash.hex()
+        return self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+
+    @staticmethod
+    def _is_nonce_error(error):
+        message = str(error).lower()
+        return any(text in message for text in NONCE_ERRORS)
+
+    def _get_gas_price(self):
+        """Get the gas price, fetching it again once GAS_PRICE_TTL has passed."""
+        now = time.monotonic()
+        if self._gas_price is None or now - self._gas_price[1] > GAS_PRICE_TTL:
+            self._gas_price = (self.w3.eth.gas_price, now)
+        return self._gas_price[0]
 
     def wait_for_receipt(self, tx_hash):
         """Wait for a transaction receipt."""
@@ -52,26 +113,47 @@ class EVMBlockchainInterface(BlockchainInterface):
         contract = self.w3.eth.contract(abi=abi, bytecode=bytecode)
         transaction = contract.constructor(*args).build_transaction({
             'from': self.account.address,
-            'nonce': self.w3.eth.get_transaction_count(self.account.address),
         })
         tx_hash = self.send_transaction(transaction)
         tx_receipt = self.wait_for_receipt(tx_hash)
 
-        # Cache the ABI for the deployed contract
+        # Cache the ABI and contract object for the deployed contract
         self._contract_abis[tx_receipt.contractAddress] = abi
-
-        return self.w3.eth.contract(address=tx_receipt.contractAddress, abi=abi)
+        contract = self.w3.eth.contract(address=tx_receipt.contractAddress, abi=abi)
+        self._contracts[tx_receipt.contractAddress] = contract
+
+        return contract
+
+    def get_contract(self, contract_address, contract_name=None):
+        """Get a contract object for an address, building it only once.
+
+        web3 parses the ABI and indexes function selectors when a contract
+        object is created, so reusing it keeps that off every call.
+        ``contract_name`` names the artifact to take the ABI from when the
+        address is not in deployed_contracts.json.
+        """
+        contract = self._contracts.get(contract_address)
+        if contract is None:
+            abi = self.get_contract_abi(contract_address)
+            if abi is None and contract_name is not None:
+                abi, _ = self.get_contract_artifacts(contract_name)
+                if abi is not None:
+                    self._contract_abis[contract_address] = abi
+            if abi is None:
+                raise ValueError(f"ABI not found for contract: {contract_address}")
+            contract = self.w3.eth.contract(address=contract_address, abi=abi)
+            self._contracts[contract_address] = contract
+        return contract
 
     def call_contract_function(self, contract_address, function_name, args):
-        abi = self.get_contract_abi(contract_address)
-        if abi is None:
-            raise ValueError(f"ABI not found for contract: {contract_address}")
-
-        contract = self.w3.eth.contract(address=contract_address, abi=abi)
+        contract = self.get_contract(contract_address)
         return getattr(contract.functions, function_name)(*args).call()
 
     def get_contract_artifacts(self, contract_name):
         """Load contract ABI and bytecode from JSON file."""
+        if contract_name in self._artifacts:
+            return self._artifacts[contract_name]
+
         artifact_path = os.path.join(self.contracts_dir, f'{contract_name}.json')
 
         if not os.path.exists(artifact_path):
@@ -83,6 +165,7 @@ class EVMBlockchainInterface(BlockchainInterface):
         abi = artifact.get('abi')
         bytecode = artifact.get('bytecode') or artifact.get('bin')
 
+        self._artifacts[contract_name] = (abi, bytecode)
         return abi, bytecode
 
     def get_contract_abi(self, contract_address):
@@ -92,15 +175,24 @@ class EVMBlockchainInterface(BlockchainInterface):
             return self._contract_abis[contract_address]
 
         # Try to load from a stored mapping file
+        contract_name = self._get_deployed_contracts().get(contract_address)
+        if contract_name is not None:
+            abi, _ = self.get_contract_artifacts(contract_name)
+            if abi:
+                self._contract_abis[contract_address] = abi
+                return abi
+
+        return None
+
+    def _get_deployed_contracts(self):
+        """Load deployed_contracts.json, re-parsing it only after it changes."""
         mapping_path = os.path.join(self.contracts_dir, 'deployed_contracts.json')
-        if os.path.exists(mapping_path):
+        try:
+            mtime = os.stat(mapping_path).st_mtime_ns
+        except OSError:
+            return {}
+
+        if mtime != self._deployed_contracts[0]:
             with open(mapping_path, 'r') as f:
-                mappings = json.load(f)
-                if contract_address in mappings:
-                    contract_name = mappings[contract_address]
-                    abi, _ = self.get_contract_artifacts(contract_name)
-                    if abi:
-                        self._contract_abis[contract_address] = abi
-                        return abi
-
-        return None
\ No newline at end of file
+                self._deployed_contracts = (mtime, json.load(f))
+        return self._deployed_contracts[1]
\ No newline at end of file
@@ -1,12 +1,15 @@
 """Event bus for dashboard real-time updates."""
 
 import asyncio
-import json
+import itertools
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from datamgmtnode.json_codec import dumps
 
 logger = logging.getLogger(__name__)
 
@@ -60,9 +63,9 @@ class Event:
             'timestamp': self.timestamp
         }
 
-    def to_json(self) -> str:
-        """Convert event to JSON string."""
-        return json.dumps(self.to_dict())
+    def to_json(self) -> bytes:
+        """Convert event to UTF-8 encoded JSON, ready to send as-is."""
+        return dumps(self.to_dict())
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Event':
@@ -74,10 +77,27 @@ class Event:
         )
 
 
+class _Subscription(NamedTuple):
+    """A subscriber callback with its optional event pre-filter."""
+
+    callback: Callable
+    filter_fn: Optional[Callable[[Event], bool]]
+
+
+# (sync subscriptions, async subscriptions)
+_Subscriptions = Tuple[Tuple[_Subscription, ...], Tuple[_Subscription, ...]]
+
+_NO_SUBSCRIPTIONS: _Subscriptions = ((), ())
+
+
 class EventBus:
     """Central event bus for dashboard updates.
 
     Provides pub/sub functionality for real-time updates to TUI and web dashboard.
+
+    The bus is meant to be used from a single event loop. History and
+    subscriber updates never await, so they need no lock; publishing from
+    other threads would need one around those mutations.
     """
 
     def __init__(self, max_history: int = 100):
@@ -86,34 +106,47 @@ class EventBus:
         Args:
             max_history: Maximum number of events to keep in history.
         """
-        self._subscribers: Dict[EventType, Set[Callable]] = {}
-        self._global_subscribers: Set[Callable] = set()
-        self._event_history: List[Event] = []
+        # Keyed by event type, None holding the global subscribers. Tuples
+        # are replaced on (un)subscribe so publish iterates them without copying.
+        self._subscribers: Dict[Optional[EventType], _Subscriptions] = {}
+        # Bounded: appending past max_history drops the oldest event
+        self._event_history: deque[Event] = deque(maxlen=max_history)
+        # Same history indexed by type, each bounded to max_history
+        self._history_by_type: Dict[EventType, deque[Event]] = {}
         self._max_history = max_history
-        self._lock = asyncio.Lock()
 
-    def subscribe(self, event_type: EventType, callback: Callable) -> None:
+    def subscribe(
+        self,
+        event_type: EventType,
+        callback: Callable,
+        filter_fn: Optional[Callable[[Event], bool]] = None
+    ) -> None:
         """Subscribe to a specific event type.
 
         Args:
             event_type: The event type to subscribe to.
             callback: Callback function to call when event occurs.
                      Can be sync or async.
+            filter_fn: Optional predicate run before dispatch; the callback
+                     is skipped for events it rejects.
         """
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = set()
-        self._subscribers[event_type].add(callback)
+        self._add_subscription(event_type, callback, filter_fn)
         logger.debug(f"Subscribed to {event_type.value}")
 
-    def subscribe_all(self, callback: Callable) -> None:
+    def subscribe_all(
+        self,
+        callback: Callable,
+        filter_fn: Optional[Callable[[Event], bool]] = None
+    ) -> None:
         """Subscribe to all events.
 
         Useful for WebSocket broadcast.
 
         Args:
             callback: Callback function to call for all events.
+            filter_fn: Optional predicate run before dispatch.
         """
-        self._global_subscribers.add(callback)
+        self._add_subscription(None, callback, filter_fn)
         logger.debug("Subscribed to all events")
 
     def unsubscribe(self, event_type: EventType, callback: Callable) -> None:
@@ -124,7 +157,7 @@ class EventBus:
             callback: The callback to remove.
         """
         if event_type in self._subscribers:
-            self._subscribers[event_type].discard(callback)
+            self._remove_subscription(event_type, callback)
             logger.debug(f"Unsubscribed from {event_type.value}")
 
     def unsubscribe_all(self, callback: Callable) -> None:
@@ -133,44 +166,98 @@ class EventBus:
         Args:
             callback: The callback to remove from global subscribers.
         """
-        self._global_subscribers.discard(callback)
+        self._remove_subscription(None, callback)
         logger.debug("Unsubscribed from all events")
 
+    def _add_subscription(
+        self,
+        key: Optional[EventType],
+        callback: Callable,
+        filter_fn: Optional[Callable[[Event], bool]]
+    ) -> None:
+        """Add or replace a callback's subscription under ``key``."""
+        self._remove_subscription(key, callback)
+        sync_subs, async_subs = self._subscribers.get(key, _NO_SUBSCRIPTIONS)
+        subscription = _Subscription(callback, filter_fn)
+        if asyncio.iscoroutinefunction(callback):
+            async_subs += (subscription,)
+        else:
+            sync_subs += (subscription,)
+        self._subscribers[key] = (sync_subs, async_subs)
+
+    def _remove_subscription(self, key: Optional[EventType], callback: Callable) -> None:
+        """Remove a callback's subscription under ``key`` if present."""
+        if key not in self._subscribers:
+            return
+        sync_subs, async_subs = (
+            tuple(sub for sub in subs if sub.callback != callback)
+            for subs in self._subscribers[key]
+        )
+        if sync_subs or async_subs:
+            self._subscribers[key] = (sync_subs, async_subs)
+        else:
+            del self._subscribers[key]
+
     async def publish(self, event: Event) -> None:
         """Publish an event to all subscribers.
 
+        Sync callbacks are scheduled with ``loop.call_soon`` so a slow one
+        does not hold up the publisher; async callbacks are awaited together.
+
         Args:
             event: The event to publish.
         """
-        async with self._lock:
-            # Store in history
-            self._event_history.append(event)
-            if len(self._event_history) > self._max_history:
-                self._event_history.pop(0)
+        # Store in history
+        self._event_history.append(event)
+        typed_history = self._history_by_type.get(event.type)
+        if typed_history is None:
+            typed_history = self._history_by_type[event.type] = deque(maxlen=self._max_history)
+        typed_history.append(event)
+
+        loop = asyncio.get_running_loop()
+        pending = []
+        for key in (event.type, None):
+            sync_subs, async_subs = self._subscribers.get(key, _NO_SUBSCRIPTIONS)
+            for sub in sync_subs:
+                if self._accepts(sub, event):
+                    loop.call_soon(self._invoke_sync, sub.callback, event)
+            for sub in async_subs:
+                if self._accepts(sub, event):
+                    pending.append(self._invoke_async(sub.callback, event))
+
+        if pending:
+            await asyncio.gather(*pending)
 
-        # Notify type-specific subscribers
-        if event.type in self._subscribers:
-            for callback in list(self._subscribers[event.type]):
-                await self._invoke_callback(callback, event)
+        logger.debug(f"Published event: {event.type.value}")
 
-        # Notify global subscribers
-        for callback in list(self._global_subscribers):
-            await self._invoke_callback(callback, event)
+    @staticmethod
+    def _accepts(subscription: _Subscription, event: Event) -> bool:
+        """Run a subscription's pre-filter, treating errors as a rejection."""
+        if subscription.filter_fn is None:
+            return True
+        try:
+            return subscription.filter_fn(event)
+        except Exception as e:
+            logger.error(f"Event filter error: {e}")
+            return False
 
-        logger.debug(f"Published event: {event.type.value}")
+    @staticmethod
+    def _invoke_sync(callback: Callable, event: Event) -> None:
+        """Call a sync callback, logging any error it raises."""
+        try:
+            callback(event)
+        except Exception as e:
+            logger.error(f"Event callback error: {e}")
 
-    async def _invoke_callback(self, callback: Callable, event: Event) -> None:
-        """Invoke a callback, handling both sync and async callbacks.
+    async def _invoke_async(self, callback: Callable, event: Event) -> None:
+        """Await an async callback, logging any error it raises.
 
         Args:
-            callback: The callback to invoke.
+            callback: The coroutine function to invoke.
             event: The event to pass to the callback.
         """
         try:
-            if asyncio.iscoroutinefunction(callback):
-                await callback(event)
-            else:
-                callback(event)
+            await callback(event)
         except Exception as e:
             logger.error(f"Event callback error: {e}")
 
@@ -185,7 +272,7 @@ class EventBus:
         Returns:
             List of recent events.
         """
-        return self._event_history[-count:]
+        return self._tail(self._event_history, count)
 
     def get_events_by_type(
         self,
@@ -201,19 +288,26 @@ class EventBus:
         Returns:
             List of matching events.
         """
-        matching = [e for e in self._event_history if e.type == event_type]
-        return matching[-count:]
+        return self._tail(self._history_by_type.get(event_type, ()), count)
+
+    @staticmethod
+    def _tail(history, count: int) -> List[Event]:
+        """Return the last ``count`` events of a history buffer."""
+        return list(itertools.islice(history, max(0, len(history) - count), None))
 
     def clear_history(self) -> None:
         """Clear event history."""
         self._event_history.clear()
+        self._history_by_type.clear()
         logger.debug("Event history cleared")
 
     @property
     def subscriber_count(self) -> int:
         """Get total number of subscribers."""
-        type_subs = sum(len(subs) for subs in self._subscribers.values())
-        return type_subs + len(self._global_subscribers)
+        return sum(
+            len(sync_subs) + len(async_subs)
+            for sync_subs, async_subs in self._subscribers.values()
+        )
 
     @property
     def history_size(self) -> int:
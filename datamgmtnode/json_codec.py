@@ -0,0 +1,56 @@
+"""JSON encoding helpers with an optional orjson fast path."""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Separators without whitespace, matching orjson's compact output
+_COMPACT_SEPARATORS = (',', ':')
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON.
+
+    Uses orjson when installed. Payloads orjson rejects (e.g. integers
+    wider than 64 bits) fall back to the standard library encoder.
+
+    Args:
+        obj: JSON-serializable object.
+        default: Called with objects neither encoder handles natively and
+            should return a serializable replacement. orjson encodes
+            dataclasses and enums itself, so it is not called for those.
+
+    Returns:
+        Encoded JSON document.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, default=default, separators=_COMPACT_SEPARATORS).encode()
+
+
+def loads(data: Union[bytes, str], exact_ints: bool = False) -> Any:
+    """Deserialize a JSON document.
+
+    orjson only decodes integers within the 64-bit range exactly; wider
+    ones (e.g. token amounts in wei) come back as lossy floats.
+
+    Args:
+        data: JSON document.
+        exact_ints: Parse with the standard library so integers of any
+            width are decoded exactly. Use for payloads that may carry
+            large token amounts as JSON numbers.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+            (orjson's decode error subclasses it).
+    """
+    if orjson is not None and not exact_ints:
+        return orjson.loads(data)
+    return json.loads(data)
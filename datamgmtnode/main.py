@@ -6,6 +6,12 @@ import logging
 from dotenv import load_dotenv
 from services.node import Node, NodeConfig, ConfigurationError
 
+try:
+    import uvloop
+except ImportError:
+    # Not available on Windows; the default asyncio loop is used instead
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,7 +42,8 @@ def load_config():
         node_id=os.getenv('NODE_ID', 'node1'),
         node_signature=os.getenv('NODE_SIGNATURE', ''),
         initial_peers=initial_peers,
-        data_dir=os.getenv('DATA_DIR', './data')
+        data_dir=os.getenv('DATA_DIR', './data'),
+        compliance_contract_address=os.getenv('COMPLIANCE_CONTRACT_ADDRESS') or None
     )
 
 
@@ -165,7 +172,15 @@ async def main():
         await run_server(config, enable_dashboard=enable_dashboard)
 
 
+def install_event_loop_policy():
+    """Use uvloop for the event loop when it is installed."""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+
+
 if __name__ == "__main__":
+    install_event_loop_policy()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -1,17 +1,39 @@
 import asyncio
+import heapq
 import json
 import logging
 import os
+import random
 import time
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
 from typing import Optional
+from kademlia.crawling import NodeSpiderCrawl
 from kademlia.network import Server
+from kademlia.node import Node
+from datamgmtnode.json_codec import dumps, loads
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rewrite the peer snapshot once the delta log outgrows it by this factor
+PEER_LOG_COMPACT_RATIO = 10
 
-@dataclass
+# Byte budget for verified DHT values kept in memory, and the largest value
+# cached; keys are content hashes, so entries never go stale
+GET_CACHE_BYTES = 32 * 1024 * 1024
+GET_CACHE_MAX_ITEM_BYTES = 256 * 1024
+
+# Peers shared on exchange, and the weight of one XOR-distance bucket in
+# milliseconds of latency when ranking them
+SHAREABLE_PEERS = 20
+DISTANCE_BUCKET_WEIGHT_MS = 10
+
+# Largest 160-bit DHT ID; kademlia's top bucket range ends at 2**160 inclusive
+MAX_NODE_ID = 2 ** 160 - 1
+
+
+@dataclass(slots=True)
 class PeerInfo:
     """Information about a peer node."""
     host: str
@@ -21,6 +43,14 @@ class PeerInfo:
     latency_ms: float = 0
     failures: int = 0
     successes: int = 0
+    # Raw DHT ID that node_id was rendered from; not persisted
+    node_id_bytes: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self) -> dict:
+        """Persistable fields, as loaded back by ``PeerInfo(**data)``."""
+        data = asdict(self)
+        del data['node_id_bytes']
+        return data
 
     @property
     def success_rate(self) -> float:
@@ -30,7 +60,11 @@ class PeerInfo:
     @property
     def is_healthy(self) -> bool:
         """Peer is healthy if seen recently and has good success rate."""
-        age = time.time() - self.last_seen
+        return self.healthy_at(time.time())
+
+    def healthy_at(self, now: float) -> bool:
+        """Health as of ``now``, for callers checking many peers at once."""
+        age = now - self.last_seen
         return age < 300 and (self.success_rate > 0.5 or self.successes < 3)
 
 
@@ -57,6 +91,8 @@ class P2PNetwork:
         # Peer management
         self._known_peers: dict[tuple, PeerInfo] = {}
         self._peers_file = os.path.join(self.data_dir, 'known_peers.json')
+        # Newly discovered peers, one JSON object per line, replayed on load
+        self._peers_log = os.path.join(self.data_dir, 'known_peers.log')
 
         # Background tasks
         self._background_tasks = []
@@ -64,6 +100,22 @@ class P2PNetwork:
         self._peer_exchange_interval = 120  # seconds
         self._rebootstrap_interval = 300  # seconds
         self._min_peers = 3  # minimum peers before re-bootstrap
+        self._probe_sem = asyncio.Semaphore(64)  # concurrent health check pings
+
+        # Encoded peer list published on exchange; rebuilt when peers are
+        # added or removed or change health
+        self._shareable_cache: Optional[bytes] = None
+        self._shareable_dirty = True
+        # Peers that were healthy as of the last rebuild or probe
+        self._healthy_peers: set[tuple] = set()
+        # XOR distance bucket per peer DHT ID, relative to our current ID
+        self._distance_buckets: dict[str, int] = {}
+        # Routing table contents as of the last health sweep's sync
+        self._routing_fingerprint: Optional[tuple] = None
+
+        # LRU of verified get_data results with their payload sizes
+        self._get_cache: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._get_cache_bytes = 0
 
     async def start(self):
         """Start the P2P network server."""
@@ -73,8 +125,10 @@ class P2PNetwork:
         # Load previously known peers
         self._load_peers()
 
-        # Start Kademlia server
+        # Start Kademlia server (with a fresh DHT ID, so distances change)
         self.server = Server()
+        self._distance_buckets.clear()
+        self._shareable_dirty = True
         await self.server.listen(self.port)
         self._running = True
         logger.info(f"P2P network started on port {self.port}")
@@ -118,37 +172,82 @@ class P2PNetwork:
     # =========================================================================
 
     def _load_peers(self):
-        """Load known peers from disk."""
-        if not os.path.exists(self._peers_file):
+        """Load known peers from the snapshot, then replay the delta log."""
+        snapshot_size = 0
+        if os.path.exists(self._peers_file):
+            try:
+                with open(self._peers_file, 'rb') as f:
+                    data = f.read()
+                snapshot_size = len(data)
+
+                for peer_data in loads(data):
+                    self._add_loaded_peer(peer_data)
+
+            except (ValueError, IOError) as e:
+                logger.warning(f"Failed to load peers: {e}")
+
+        log_size = self._replay_peer_log()
+
+        if not self._known_peers:
             logger.info("No saved peers found, starting fresh")
             return
 
+        logger.info(f"Loaded {len(self._known_peers)} peers from disk")
+
+        if log_size > PEER_LOG_COMPACT_RATIO * max(snapshot_size, 1):
+            self._save_peers()
+
+    def _add_loaded_peer(self, peer_data: dict):
+        peer = PeerInfo(**peer_data)
+        self._known_peers[(peer.host, peer.port)] = peer
+
+    def _replay_peer_log(self) -> int:
+        """Apply logged peer updates in order, returning the log size."""
         try:
-            with open(self._peers_file, 'r') as f:
-                data = json.load(f)
+            with open(self._peers_log, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        except IOError as e:
+            logger.warning(f"Failed to read peer log: {e}")
+            return 0
 
-            for peer_data in data:
-                peer = PeerInfo(**peer_data)
-                key = (peer.host, peer.port)
-                self._known_peers[key] = peer
+        for line in data.splitlines():
+            try:
+                self._add_loaded_peer(loads(line))
+            except (ValueError, TypeError):
+                # A crash mid-append leaves a partial final line
+                continue
+        return len(data)
 
-            logger.info(f"Loaded {len(self._known_peers)} peers from disk")
+    def _append_peer_updates(self, peers: list):
+        """Append peer records to the delta log."""
+        if not peers:
+            return
 
-        except (json.JSONDecodeError, IOError) as e:
-            logger.warning(f"Failed to load peers: {e}")
+        try:
+            with open(self._peers_log, 'ab') as f:
+                f.write(b''.join(dumps(peer.to_dict()) + b'\n' for peer in peers))
+        except IOError as e:
+            logger.error(f"Failed to append peer updates: {e}")
 
     def _save_peers(self):
-        """Save known peers to disk."""
+        """Write a snapshot of known peers and truncate the delta log."""
         try:
             # Only save healthy peers seen in last 24 hours
             cutoff = time.time() - 86400
             peers_to_save = [
-                asdict(peer) for peer in self._known_peers.values()
+                peer.to_dict() for peer in self._known_peers.values()
                 if peer.last_seen > cutoff
             ]
 
-            with open(self._peers_file, 'w') as f:
-                json.dump(peers_to_save, f, indent=2)
+            tmp_file = self._peers_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(dumps(peers_to_save))
+            os.replace(tmp_file, self._peers_file)
+
+            if os.path.exists(self._peers_log):
+                os.remove(self._peers_log)
 
             logger.info(f"Saved {len(peers_to_save)} peers to disk")
 
@@ -170,8 +269,9 @@ class P2PNetwork:
                 bootstrap_nodes.append(parsed)
 
         # Add previously known healthy peers
+        now = time.time()
         for (host, port), peer_info in self._known_peers.items():
-            if peer_info.is_healthy:
+            if peer_info.healthy_at(now):
                 bootstrap_nodes.append((host, port))
 
         if not bootstrap_nodes:
@@ -194,7 +294,12 @@ class P2PNetwork:
             logger.error(f"Bootstrap failed: {e}")
 
     async def _rebootstrap_loop(self):
-        """Periodically re-bootstrap if peer count is low."""
+        """Periodically refresh the routing table if peer count is low.
+
+        With some peers still routable, a lookup per bucket finds new nodes
+        across the ID space; a full re-bootstrap is kept for when the
+        routing table is empty.
+        """
         while self._running:
             await asyncio.sleep(self._rebootstrap_interval)
 
@@ -203,9 +308,36 @@ class P2PNetwork:
 
             active_peers = self._count_active_peers()
 
-            if active_peers < self._min_peers:
-                logger.info(f"Only {active_peers} active peers, re-bootstrapping...")
+            if active_peers == 0:
+                logger.info("No active peers, re-bootstrapping...")
                 await self._bootstrap()
+            elif active_peers < self._min_peers:
+                logger.info(f"Only {active_peers} active peers, refreshing buckets...")
+                await self._refresh_buckets()
+
+    async def _refresh_buckets(self):
+        """Look up a random ID in each non-empty bucket's range."""
+        protocol = self.server.protocol
+        crawls = []
+        for bucket in protocol.router.buckets:
+            if not bucket.get_nodes():
+                continue
+
+            low, high = bucket.range
+            target_id = random.randint(low, min(high, MAX_NODE_ID))
+            target = Node(target_id.to_bytes(20, byteorder='big'))
+            nearest = protocol.router.find_neighbors(target, self.server.alpha)
+            spider = NodeSpiderCrawl(
+                protocol, target, nearest, self.server.ksize, self.server.alpha
+            )
+            crawls.append(spider.find())
+
+        results = await asyncio.gather(*crawls, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug("Bucket refresh lookup failed: %s", result)
+
+        self._update_known_peers_from_routing_table()
 
     def _count_active_peers(self) -> int:
         """Count peers in the routing table."""
@@ -220,9 +352,8 @@ class P2PNetwork:
     def _parse_peer_address(self, peer: str) -> Optional[tuple]:
         """Parse peer address string to (host, port) tuple."""
         try:
-            peer_clean = peer.replace("http://", "").replace("https://", "")
-            if ":" in peer_clean:
-                host, port_str = peer_clean.rsplit(":", 1)
+            host, sep, port_str = peer.removeprefix("https://").removeprefix("http://").rpartition(":")
+            if sep:
                 return (host, int(port_str))
         except (ValueError, AttributeError) as e:
             logger.warning(f"Invalid peer address '{peer}': {e}")
@@ -244,11 +375,15 @@ class P2PNetwork:
 
     async def _check_all_peers_health(self):
         """Check health of all known peers."""
-        self._update_known_peers_from_routing_table()
+        fingerprint = self._routing_table_fingerprint()
+        if fingerprint != self._routing_fingerprint:
+            self._routing_fingerprint = fingerprint
+            self._update_known_peers_from_routing_table()
 
-        tasks = []
-        for (host, port), peer_info in list(self._known_peers.items()):
-            tasks.append(self._check_peer_health(host, port, peer_info))
+        tasks = [
+            self._check_peer_health(host, port, peer_info)
+            for (host, port), peer_info in list(self._known_peers.items())
+        ]
 
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
@@ -257,33 +392,51 @@ class P2PNetwork:
         self._prune_dead_peers()
 
     async def _check_peer_health(self, host: str, port: int, peer_info: PeerInfo):
-        """Check health of a single peer by pinging it."""
-        start_time = time.time()
+        """Check health of a single peer by pinging it.
+
+        Sends a single Kademlia PING over the running server's UDP socket;
+        the protocol resolves it as unanswered after its 5s wait timeout.
+        """
+        if not self.server or not self.server.protocol:
+            return
 
         try:
-            # Try to connect and query the peer
-            test_server = Server()
-            await asyncio.wait_for(
-                test_server.bootstrap([(host, port)]),
-                timeout=5.0
-            )
-            test_server.stop()
+            async with self._probe_sem:
+                start_time = time.perf_counter()
+                responded, _ = await self.server.protocol.ping((host, port), self.server.node.id)
+        except Exception as e:
+            peer_info.failures += 1
+            self._note_peer_health((host, port), peer_info, time.time())
+            logger.debug("Peer %s:%s failed: %s", host, port, e)
+            return
+
+        if not responded:
+            peer_info.failures += 1
+            self._note_peer_health((host, port), peer_info, time.time())
+            logger.debug("Peer %s:%s timeout", host, port)
+            return
 
-            # Success
-            latency = (time.time() - start_time) * 1000
-            peer_info.last_seen = time.time()
-            peer_info.latency_ms = latency
-            peer_info.successes += 1
+        latency = (time.perf_counter() - start_time) * 1000
+        peer_info.last_seen = time.time()
+        peer_info.latency_ms = latency
+        peer_info.successes += 1
+        self._note_peer_health((host, port), peer_info, peer_info.last_seen)
 
-            logger.debug(f"Peer {host}:{port} healthy (latency: {latency:.0f}ms)")
+        logger.debug("Peer %s:%s healthy (latency: %.0fms)", host, port, latency)
 
-        except asyncio.TimeoutError:
-            peer_info.failures += 1
-            logger.debug(f"Peer {host}:{port} timeout")
+    def _note_peer_health(self, key: tuple, peer_info: PeerInfo, now: float):
+        """Mark the shareable list stale if a peer's health changed.
 
-        except Exception as e:
-            peer_info.failures += 1
-            logger.debug(f"Peer {host}:{port} failed: {e}")
+        Latency shifts alone do not trigger a rebuild; the ranking is
+        refreshed whenever the set of shareable peers changes.
+        """
+        if peer_info.healthy_at(now):
+            if key not in self._healthy_peers:
+                self._healthy_peers.add(key)
+                self._shareable_dirty = True
+        elif key in self._healthy_peers:
+            self._healthy_peers.discard(key)
+            self._shareable_dirty = True
 
     def _prune_dead_peers(self):
         """Remove peers that have been unresponsive."""
@@ -296,27 +449,54 @@ class P2PNetwork:
 
         for key in dead_peers:
             del self._known_peers[key]
+            self._healthy_peers.discard(key)
             logger.info(f"Pruned dead peer {key[0]}:{key[1]}")
 
+        if dead_peers:
+            self._shareable_dirty = True
+
+    def _routing_table_fingerprint(self) -> Optional[tuple]:
+        """Node IDs in bucket order; changes when contacts are added,
+        removed or re-seen (kademlia moves a re-seen contact to the end)."""
+        if not self.server or not self.server.protocol:
+            return None
+        return tuple(
+            node_id
+            for bucket in self.server.protocol.router.buckets
+            for node_id in bucket.nodes
+        )
+
     def _update_known_peers_from_routing_table(self):
         """Update known peers from Kademlia routing table."""
         if not self.server or not self.server.protocol:
             return
 
+        discovered = {}
+        now = time.time()
         for bucket in self.server.protocol.router.buckets:
             for node in bucket.get_nodes():
                 key = (node.ip, node.port)
-                if key not in self._known_peers:
-                    self._known_peers[key] = PeerInfo(
+                peer_info = self._known_peers.get(key)
+                if peer_info is None:
+                    discovered[key] = PeerInfo(
                         host=node.ip,
                         port=node.port,
                         node_id=node.id.hex() if node.id else None,
-                        last_seen=time.time()
+                        last_seen=now,
+                        node_id_bytes=node.id
                     )
                 else:
-                    self._known_peers[key].last_seen = time.time()
-                    if node.id:
-                        self._known_peers[key].node_id = node.id.hex()
+                    peer_info.last_seen = now
+                    if node.id and node.id != peer_info.node_id_bytes:
+                        peer_info.node_id_bytes = node.id
+                        peer_info.node_id = node.id.hex()
+                        self._shareable_dirty = True
+                    self._note_peer_health(key, peer_info, now)
+
+        if discovered:
+            self._shareable_dirty = True
+        self._known_peers.update(discovered)
+        self._append_peer_updates(list(discovered.values()))
 
     # =========================================================================
     # PEER EXCHANGE
@@ -335,7 +515,7 @@ class P2PNetwork:
     async def _exchange_peers(self):
         """Share our peer list and receive peers from others."""
         # Store our peer list in DHT for others to discover
-        peer_list = self._get_shareable_peer_list()
+        peer_list = self._get_shareable_peer_bytes()
 
         if not peer_list:
             return
@@ -343,50 +523,88 @@ class P2PNetwork:
         try:
             # Store under a well-known key derived from our node ID
             exchange_key = f"peers:{self.node.config.node_id}"
-            await self.server.set(exchange_key, json.dumps(peer_list))
+            await self.server.set(exchange_key, peer_list)
 
             # Try to fetch peer lists from known nodes
             await self._fetch_peer_lists()
 
         except Exception as e:
-            logger.debug(f"Peer exchange failed: {e}")
+            logger.debug("Peer exchange failed: %s", e)
 
     def _get_shareable_peer_list(self) -> list:
-        """Get list of healthy peers to share."""
-        peers = []
-        for (host, port), peer_info in self._known_peers.items():
-            if peer_info.is_healthy:
-                peers.append({
-                    'host': host,
-                    'port': port,
-                    'node_id': peer_info.node_id
-                })
-        return peers[:20]  # Limit to 20 peers
+        """Get the best-scoring healthy peers to share.
+
+        Peers are ranked by latency plus a penalty per XOR-distance bucket
+        from our DHT ID, so close, responsive peers are gossiped first.
+        """
+        now = time.time()
+        healthy = [p for p in self._known_peers.values() if p.healthy_at(now)]
+        best = heapq.nsmallest(SHAREABLE_PEERS, healthy, key=self._peer_score)
+        return [
+            {'host': p.host, 'port': p.port, 'node_id': p.node_id}
+            for p in best
+        ]
+
+    def _peer_score(self, peer_info: PeerInfo) -> float:
+        bucket = self._distance_bucket(peer_info.node_id)
+        return peer_info.latency_ms + DISTANCE_BUCKET_WEIGHT_MS * bucket
+
+    def _distance_bucket(self, node_id: Optional[str]) -> int:
+        """Bit length of the XOR distance to a peer; 160 if unknown."""
+        bucket = self._distance_buckets.get(node_id)
+        if bucket is None:
+            bucket = 160
+            own_id = self.server.node.id if self.server else None
+            if own_id and node_id:
+                try:
+                    bucket = (int.from_bytes(own_id, 'big') ^ int(node_id, 16)).bit_length()
+                except ValueError:
+                    pass
+            self._distance_buckets[node_id] = bucket
+        return bucket
+
+    def _get_shareable_peer_bytes(self) -> Optional[bytes]:
+        """Encoded shareable peer list, or None if there is nothing to share."""
+        if self._shareable_dirty:
+            now = time.time()
+            self._healthy_peers = {
+                key for key, p in self._known_peers.items() if p.healthy_at(now)
+            }
+            peers = self._get_shareable_peer_list()
+            self._shareable_cache = dumps(peers) if peers else None
+            self._shareable_dirty = False
+        return self._shareable_cache
 
     async def _fetch_peer_lists(self):
-        """Fetch peer lists from known nodes."""
-        for (host, port), peer_info in list(self._known_peers.items())[:10]:
-            if not peer_info.node_id:
-                continue
+        """Fetch peer lists from known nodes concurrently."""
+        sources = [
+            (host, port, peer_info.node_id)
+            for (host, port), peer_info in list(self._known_peers.items())[:10]
+            if peer_info.node_id
+        ]
 
-            try:
-                exchange_key = f"peers:{peer_info.node_id}"
-                data = await asyncio.wait_for(
-                    self.server.get(exchange_key),
-                    timeout=5.0
-                )
+        results = await asyncio.gather(*(
+            asyncio.wait_for(self.server.get(f"peers:{node_id}"), timeout=5.0)
+            for _, _, node_id in sources
+        ), return_exceptions=True)
 
-                if data:
-                    peer_list = json.loads(data)
-                    self._merge_peer_list(peer_list)
+        for (host, port, _), data in zip(sources, results):
+            if isinstance(data, asyncio.TimeoutError) or not data:
+                continue
+            if isinstance(data, Exception):
+                logger.debug("Failed to fetch peers from %s:%s: %s", host, port, data)
+                continue
 
-            except (asyncio.TimeoutError, json.JSONDecodeError):
+            try:
+                self._merge_peer_list(loads(data))
+            except ValueError:
                 pass
             except Exception as e:
-                logger.debug(f"Failed to fetch peers from {host}:{port}: {e}")
+                logger.debug("Bad peer list from %s:%s: %s", host, port, e)
 
     def _merge_peer_list(self, peer_list: list):
         """Merge received peer list into known peers."""
+        discovered = []
         for peer_data in peer_list:
             host = peer_data.get('host')
             port = peer_data.get('port')
@@ -396,13 +614,18 @@ class P2PNetwork:
 
             key = (host, port)
             if key not in self._known_peers:
-                self._known_peers[key] = PeerInfo(
+                self._known_peers[key] = peer = PeerInfo(
                     host=host,
                     port=port,
                     node_id=peer_data.get('node_id'),
                     last_seen=0  # Not verified yet
                 )
-                logger.debug(f"Discovered new peer via exchange: {host}:{port}")
+                discovered.append(peer)
+                logger.debug("Discovered new peer via exchange: %s:%s", host, port)
+
+        if discovered:
+            self._shareable_dirty = True
+        self._append_peer_updates(discovered)
 
     # =========================================================================
     # DATA OPERATIONS
@@ -415,7 +638,7 @@ class P2PNetwork:
 
         encrypted_data = self.node.encrypt_data(data)
 
-        payload = json.dumps({
+        payload = dumps({
             'hash': data_hash,
             'data': encrypted_data,
             'node_id': self.node.config.node_id,
@@ -423,28 +646,36 @@ class P2PNetwork:
         })
 
         await self.server.set(data_hash, payload)
-        logger.info(f"Data stored in DHT: {data_hash[:16]}...")
+        logger.info("Data stored in DHT: %.16s...", data_hash)
 
     async def get_data(self, data_hash: str) -> Optional[str]:
         """Retrieve data from the DHT network."""
         if not self.server:
             raise RuntimeError("P2P network not started")
 
+        cached = self._get_cache.get(data_hash)
+        if cached is not None:
+            self._get_cache.move_to_end(data_hash)
+            return cached[0]
+
         try:
             payload = await self.server.get(data_hash)
             if payload is None:
                 return None
 
-            data_obj = json.loads(payload)
+            data_obj = loads(payload)
             encrypted_data = data_obj.get('data')
 
             if encrypted_data:
-                decrypted = self.node.decrypt_data(encrypted_data)
+                # Hash the plaintext bytes; decode only once they verify
+                decrypted = self.node.decrypt_bytes(encrypted_data)
 
                 if self.node._hash_data(decrypted) == data_hash:
-                    return decrypted
+                    data = decrypted.decode()
+                    self._cache_data(data_hash, data, len(decrypted))
+                    return data
                 else:
-                    logger.warning(f"Hash mismatch: {data_hash[:16]}...")
+                    logger.warning("Hash mismatch: %.16s...", data_hash)
                     return None
 
             return None
@@ -453,9 +684,22 @@ class P2PNetwork:
             logger.error(f"Failed to parse DHT data: {e}")
             return None
         except Exception as e:
-            logger.error(f"Failed to retrieve data: {e}")
+            logger.error("Failed to retrieve data: %s", e)
             return None
 
+    def _cache_data(self, data_hash: str, data: str, size: int):
+        """Cache a verified value, evicting the oldest past the byte budget."""
+        if size > GET_CACHE_MAX_ITEM_BYTES:
+            return
+        previous = self._get_cache.pop(data_hash, None)
+        if previous is not None:
+            self._get_cache_bytes -= previous[1]
+        self._get_cache[data_hash] = (data, size)
+        self._get_cache_bytes += size
+        while self._get_cache_bytes > GET_CACHE_BYTES:
+            _, (_, evicted) = self._get_cache.popitem(last=False)
+            self._get_cache_bytes -= evicted
+
     async def broadcast_data(self, data_hash: str, data: str):
         """Broadcast data to the network (alias for send_data)."""
         await self.send_data(data_hash, data)
@@ -481,14 +725,18 @@ class P2PNetwork:
             # Add to known peers
             key = (host, port)
             if key not in self._known_peers:
-                self._known_peers[key] = PeerInfo(
+                self._known_peers[key] = peer = PeerInfo(
                     host=host,
                     port=port,
                     last_seen=time.time()
                 )
+                self._append_peer_updates([peer])
+                self._shareable_dirty = True
             else:
-                self._known_peers[key].last_seen = time.time()
-                self._known_peers[key].successes += 1
+                peer = self._known_peers[key]
+                peer.last_seen = time.time()
+                peer.successes += 1
+                self._note_peer_health(key, peer, peer.last_seen)
 
             logger.info(f"Connected to peer: {peer_url}")
 
@@ -499,6 +747,7 @@ class P2PNetwork:
     def get_connected_peers(self) -> list:
         """Get list of all known peers with health info."""
         peers = []
+        now = time.time()
         for (host, port), peer_info in self._known_peers.items():
             peers.append({
                 'host': host,
@@ -507,7 +756,7 @@ class P2PNetwork:
                 'last_seen': peer_info.last_seen,
                 'latency_ms': peer_info.latency_ms,
                 'success_rate': peer_info.success_rate,
-                'healthy': peer_info.is_healthy
+                'healthy': peer_info.healthy_at(now)
             })
         return sorted(peers, key=lambda p: -p['last_seen'])
 
@@ -517,15 +766,20 @@ class P2PNetwork:
 
     def get_network_stats(self) -> dict:
         """Get network statistics."""
-        peers = self.get_connected_peers()
-        healthy = [p for p in peers if p['healthy']]
+        now = time.time()
+        healthy = 0
+        total_latency = 0
+        for peer_info in self._known_peers.values():
+            if peer_info.healthy_at(now):
+                healthy += 1
+                total_latency += peer_info.latency_ms
 
         return {
-            'total_peers': len(peers),
-            'healthy_peers': len(healthy),
+            'total_peers': len(self._known_peers),
+            'healthy_peers': healthy,
             'active_peers': self._count_active_peers(),
             'bootstrap_nodes': len(self.bootstrap_peers),
-            'avg_latency_ms': sum(p['latency_ms'] for p in healthy) / len(healthy) if healthy else 0
+            'avg_latency_ms': total_latency / healthy if healthy else 0
         }
 
     @property
@@ -537,13 +791,14 @@ class P2PNetwork:
         """Handle incoming data from the network."""
         if data and 'hash' in data and 'data' in data:
             try:
-                decrypted_data = self.node.decrypt_data(data['data'])
+                decrypted = self.node.decrypt_bytes(data['data'])
 
-                if self.node._hash_data(decrypted_data) == data['hash']:
+                if self.node._hash_data(decrypted) == data['hash']:
+                    decrypted_data = decrypted.decode()
                     self.node.data_manager.store_data(data['hash'], decrypted_data)
                     await self.node.on_data_received(data['hash'], decrypted_data)
                 else:
-                    logger.warning(f"Hash mismatch: {data['hash'][:16]}...")
+                    logger.warning("Hash mismatch: %.16s...", data['hash'])
 
             except Exception as e:
-                logger.error(f"Error handling incoming data: {e}")
+                logger.error("Error handling incoming data: %s", e)
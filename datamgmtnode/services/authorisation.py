@@ -1,36 +1,69 @@
+import asyncio
 import logging
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 from cryptography.exceptions import InvalidSignature
 
 logger = logging.getLogger(__name__)
 
+# Legacy signature scheme for RSA transfer authorizations; Ed25519 keys
+# sign the data directly
+PSS_PADDING = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH
+)
+
 
 class AuthorizationModule:
     def __init__(self, db_connection):
         self.db = db_connection
         self.authorized_keys = self._load_authorized_keys()
+        # Parsed public keys, so verification skips key decoding
+        self._public_keys = {
+            user_id: self._parse_public_key(user_id, public_key)
+            for user_id, public_key in self.authorized_keys.items()
+        }
 
     def _load_authorized_keys(self):
         return {row[0]: row[1] for row in self.db.execute("SELECT user_id, public_key FROM authorized_users")}
 
+    @staticmethod
+    def _parse_public_key(user_id, public_key):
+        """Parse a DER or PEM public key, returning None if it is invalid.
+
+        New rows hold DER SubjectPublicKeyInfo bytes; rows written before
+        that hold PEM text.
+        """
+        try:
+            if isinstance(public_key, str):
+                public_key = public_key.encode()
+            if public_key.lstrip().startswith(b'-----BEGIN'):
+                return serialization.load_pem_public_key(public_key)
+            return serialization.load_der_public_key(public_key)
+        except Exception as e:
+            logger.error(f"Invalid public key for {user_id}: {e}")
+            return None
+
     def authorize_transfer(self, data_hash, signature, user_id):
-        if user_id not in self.authorized_keys:
+        """Verify ``signature`` over ``data_hash`` (str or already-encoded bytes)."""
+        public_key = self._public_keys.get(user_id)
+        if public_key is None:
             return False
 
+        if isinstance(data_hash, str):
+            data_hash = data_hash.encode()
+
         try:
-            public_key = serialization.load_pem_public_key(
-                self.authorized_keys[user_id].encode()
-            )
-            public_key.verify(
-                signature,
-                data_hash.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            if isinstance(public_key, Ed25519PublicKey):
+                public_key.verify(signature, data_hash)
+            else:
+                public_key.verify(
+                    signature,
+                    data_hash,
+                    PSS_PADDING,
+                    hashes.SHA256()
+                )
             return True
         except InvalidSignature:
             return False
@@ -38,8 +71,40 @@ class AuthorizationModule:
             logger.error(f"Authorization verification failed: {e}")
             return False
 
+    async def authorize_transfer_async(self, data_hash, signature, user_id):
+        """Verify an authorization in a worker thread.
+
+        Signature verification is CPU-bound; running it off the event loop keeps
+        the node serving other requests while OpenSSL works.
+        """
+        return await asyncio.to_thread(self.authorize_transfer, data_hash, signature, user_id)
+
+    async def authorize_transfers(self, requests):
+        """Verify several (data_hash, signature, user_id) authorizations concurrently.
+
+        Returns:
+            List of results in the same order as ``requests``.
+        """
+        return list(await asyncio.gather(
+            *(self.authorize_transfer_async(*request) for request in requests)
+        ))
+
     def add_authorized_user(self, user_id, public_key_pem):
+        """Register a PEM or DER public key, stored as DER.
+
+        The parameter keeps its original name for keyword callers; DER bytes
+        are accepted as well as PEM.
+        """
+        public_key = public_key_pem
+        parsed = self._parse_public_key(user_id, public_key)
+        if parsed is not None:
+            public_key = parsed.public_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+
         self.db.execute("INSERT INTO authorized_users (user_id, public_key) VALUES (?, ?)",
-                        (user_id, public_key_pem))
+                        (user_id, public_key))
         self.db.commit()
-        self.authorized_keys[user_id] = public_key_pem
+        self.authorized_keys[user_id] = public_key
+        self._public_keys[user_id] = parsed
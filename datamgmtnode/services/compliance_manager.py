@@ -1,52 +1,187 @@
 import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+# Legacy compliance events are sent as data to the zero address
+ZERO_ADDRESS = '0x' + '0' * 40
+ZERO_ADDRESS_CHECKSUM = Web3.to_checksum_address(ZERO_ADDRESS)
+
+# Blocks searched back from the chain head for compliance events
+SCAN_DEPTH = 1000
+
+# Blocks fetched per JSON-RPC batch request while scanning
+RPC_BATCH_SIZE = 50
+
+# Concurrent get_block requests when the provider cannot batch
+RPC_CONCURRENCY = 16
+
+# Largest block range per eth_getLogs call; many providers reject wider ones
+LOG_WINDOW = 2000
+
+# Artifact name of the compliance log contract in the contracts directory
+COMPLIANCE_LOG_CONTRACT = 'ComplianceLog'
+
+# topic0 of ComplianceLog's ComplianceRecorded event
+COMPLIANCE_RECORDED_TOPIC = Web3.to_hex(
+    Web3.keccak(text='ComplianceRecorded(bytes32,bytes32,string)')
+)
+
+
+def compliance_digest(event_data):
+    """Hash event data as canonical JSON (sorted keys, no whitespace).
+
+    The digest is what gets recorded on-chain, so the same event must hash
+    the same way on every node regardless of dict insertion order.
+    """
+    canonical = json.dumps(event_data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
 
 
 class ComplianceManager:
-    def __init__(self, blockchain_interface):
+    def __init__(self, blockchain_interface, contract_address=None):
         self.blockchain = blockchain_interface
+        # With a ComplianceLog contract, events are emitted as indexed logs;
+        # without one they are recorded as zero-address transactions
+        self.contract_address = contract_address
 
     def update_blockchain_interface(self, new_blockchain_interface):
         self.blockchain = new_blockchain_interface
 
     def record_compliance_event(self, event_type, event_data):
-        event_hash = hashlib.sha256(str(event_data).encode()).hexdigest()
-        tx_data = {
-            'from': self.blockchain.account.address,
-            'to': self.blockchain.w3.to_checksum_address('0x' + '0' * 40),  # Zero address
-            'data': self.blockchain.w3.to_hex(text=f"{event_type}:{event_hash}")
-        }
+        event_hash = compliance_digest(event_data)
+        if self.contract_address:
+            tx_data = self._log_contract().functions.record(
+                event_type, bytes.fromhex(event_hash)
+            ).build_transaction({'from': self.blockchain.account.address})
+        else:
+            tx_data = {
+                'from': self.blockchain.account.address,
+                'to': ZERO_ADDRESS_CHECKSUM,
+                'data': self.blockchain.w3.to_hex(text=f"{event_type}:{event_hash}")
+            }
         tx_hash = self.blockchain.send_transaction(tx_data)
         return tx_hash
 
+    def _log_contract(self):
+        """Get the ComplianceLog contract object."""
+        address = self.blockchain.w3.to_checksum_address(self.contract_address)
+        return self.blockchain.get_contract(address, COMPLIANCE_LOG_CONTRACT)
+
+    def _get_logs(self, *topics):
+        """Fetch ComplianceRecorded logs from the last SCAN_DEPTH blocks.
+
+        Matching on the indexed topics is done by the RPC node, so each
+        call covers up to LOG_WINDOW blocks however many transactions they
+        hold. Logs are returned oldest first.
+        """
+        w3 = self.blockchain.w3
+        latest = w3.eth.block_number
+        address = w3.to_checksum_address(self.contract_address)
+        topic_filter = [COMPLIANCE_RECORDED_TOPIC, *topics]
+
+        logs = []
+        for from_block in range(max(0, latest - SCAN_DEPTH + 1), latest + 1, LOG_WINDOW):
+            logs.extend(w3.eth.get_logs({
+                'fromBlock': from_block,
+                'toBlock': min(from_block + LOG_WINDOW - 1, latest),
+                'address': address,
+                'topics': topic_filter,
+            }))
+        return logs
+
+    def _scan_blocks(self):
+        """Yield (number, block) pairs for recent blocks, newest first.
+
+        Blocks are fetched RPC_BATCH_SIZE at a time: in one JSON-RPC batch
+        when web3 supports it (7+), otherwise as up to RPC_CONCURRENCY
+        parallel requests. Fetching a chunk at a time lets callers stop
+        early without pulling the whole range.
+        """
+        w3 = self.blockchain.w3
+        latest = w3.eth.block_number
+        numbers = range(latest, max(0, latest - SCAN_DEPTH), -1)
+        chunks = (
+            numbers[start:start + RPC_BATCH_SIZE]
+            for start in range(0, len(numbers), RPC_BATCH_SIZE)
+        )
+
+        batch_requests = getattr(w3, 'batch_requests', None)
+        if batch_requests is None:
+            def get_block(i):
+                return w3.eth.get_block(i, full_transactions=True)
+
+            with ThreadPoolExecutor(max_workers=RPC_CONCURRENCY) as pool:
+                for chunk in chunks:
+                    yield from zip(chunk, pool.map(get_block, chunk))
+            return
+
+        for chunk in chunks:
+            with batch_requests() as batch:
+                for i in chunk:
+                    batch.add(w3.eth.get_block(i, full_transactions=True))
+                blocks = batch.execute()
+            yield from zip(chunk, blocks)
+
     def verify_compliance(self, event_type, event_data):
-        event_hash = hashlib.sha256(str(event_data).encode()).hexdigest()
+        event_hash = compliance_digest(event_data)
+        if self.contract_address:
+            type_topic = Web3.to_hex(Web3.keccak(text=event_type))
+            return bool(self._get_logs(type_topic, '0x' + event_hash))
+
         # Search the blockchain for the event hash
         # This is a simplified version and might need to be adjusted based on your specific blockchain setup
-        latest_block = self.blockchain.w3.eth.get_block('latest')
-        for i in range(latest_block['number'], max(0, latest_block['number'] - 1000), -1):
-            block = self.blockchain.w3.eth.get_block(i, full_transactions=True)
+        needle = f"{event_type}:{event_hash}".encode()
+        for _, block in self._scan_blocks():
             for tx in block['transactions']:
-                if tx['to'] == '0x' + '0' * 40 and f"{event_type}:{event_hash}" in self.blockchain.w3.to_text(tx['input']):
+                if tx['to'] == ZERO_ADDRESS and needle in HexBytes(tx['input']):
                     return True
         return False
 
     def get_compliance_history(self, filters=None):
         # Retrieve compliance events from the blockchain based on optional filters
+        if self.contract_address:
+            return self._get_history_from_logs(filters)
+
         # This is a simplified version and might need to be adjusted based on your specific blockchain setup
+        # Only inputs starting with a wanted "type:" prefix get decoded
+        prefixes = None if filters is None else tuple(f"{f}:".encode() for f in filters)
         events = []
-        latest_block = self.blockchain.w3.eth.get_block('latest')
-        for i in range(latest_block['number'], max(0, latest_block['number'] - 1000), -1):
-            block = self.blockchain.w3.eth.get_block(i, full_transactions=True)
+        for i, block in self._scan_blocks():
             for tx in block['transactions']:
-                if tx['to'] == '0x' + '0' * 40 and tx['input'].startswith('0x'):
-                    event_data = self.blockchain.w3.to_text(tx['input'])
-                    if ':' in event_data:
-                        event_type, event_hash = event_data.split(':', 1)
-                        if filters is None or event_type in filters:
-                            events.append({
-                                'type': event_type,
-                                'hash': event_hash,
-                                'block': i,
-                                'tx_hash': tx['hash'].hex()
-                            })
+                if tx['to'] != ZERO_ADDRESS:
+                    continue
+                data = HexBytes(tx['input'])
+                if b':' not in data or (prefixes is not None and not data.startswith(prefixes)):
+                    continue
+                try:
+                    event_type, event_hash = data.decode().split(':', 1)
+                except UnicodeDecodeError:
+                    continue
+                events.append({
+                    'type': event_type,
+                    'hash': event_hash,
+                    'block': i,
+                    'tx_hash': tx['hash'].hex()
+                })
+        return events
+
+    def _get_history_from_logs(self, filters=None):
+        """Build compliance history from ComplianceRecorded logs, newest first."""
+        type_topics = None
+        if filters is not None:
+            type_topics = [Web3.to_hex(Web3.keccak(text=f)) for f in filters]
+
+        recorded = self._log_contract().events.ComplianceRecorded()
+        events = []
+        for log in reversed(self._get_logs(type_topics)):
+            args = recorded.process_log(log)['args']
+            events.append({
+                'type': args['eventType'],
+                'hash': args['eventHash'].hex(),
+                'block': log['blockNumber'],
+                'tx_hash': log['transactionHash'].hex()
+            })
         return events
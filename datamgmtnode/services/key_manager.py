@@ -4,10 +4,17 @@ import base64
 import logging
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 logger = logging.getLogger(__name__)
 
+# HKDF context for the AEAD key derived from each stored Fernet key, so the
+# same key material is never used directly by two ciphers
+AEAD_KEY_INFO = b'datamgmtnode/keymanager/chacha20poly1305'
+AEAD_NONCE_SIZE = 12
+
 
 class KeyManager:
     """
@@ -15,6 +22,10 @@ class KeyManager:
 
     Keys are encrypted at rest using a master password and PBKDF2 key derivation.
     Supports key versioning for rotation.
+
+    ``get_current_cipher`` returns the Fernet suite used for data exchanged
+    with other nodes. ``encrypt``/``decrypt`` use ChaCha20-Poly1305 keyed
+    from the same versioned key; their envelopes are JSON-serializable.
     """
 
     def __init__(self, keys_dir: str, master_password: str = None):
@@ -24,6 +35,12 @@ class KeyManager:
         self._keys: dict[int, bytes] = {}
         self._current_version: int = 0
         self._cipher_suites: dict[int, Fernet] = {}
+        self._aead_ciphers: dict[int, ChaCha20Poly1305] = {}
+        # The salt is kept for the process lifetime so saves after a
+        # rotation can reuse the derived master key instead of re-running
+        # the deliberately slow KDF
+        self._salt: bytes | None = None
+        self._master_keys: dict[bytes, bytes] = {}
 
         if not self._master_password:
             logger.warning("No master password set - keys will be stored with default protection")
@@ -42,30 +59,50 @@ class KeyManager:
         return self.get_current_cipher()
 
     def _derive_master_key(self, salt: bytes) -> bytes:
-        """Derive encryption key from master password using PBKDF2."""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=480000,
-        )
-        return base64.urlsafe_b64encode(kdf.derive(self._master_password.encode()))
+        """Derive encryption key from master password using PBKDF2.
+
+        The result is cached per salt for the lifetime of the manager.
+        """
+        master_key = self._master_keys.get(salt)
+        if master_key is None:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=480000,
+            )
+            master_key = base64.urlsafe_b64encode(kdf.derive(self._master_password.encode()))
+            self._master_keys[salt] = master_key
+        return master_key
 
     def _generate_new_key(self) -> int:
         """Generate a new encryption key and return its version."""
         new_version = self._current_version + 1
         new_key = Fernet.generate_key()
 
-        self._keys[new_version] = new_key
-        self._cipher_suites[new_version] = Fernet(new_key)
+        self._add_key(new_version, new_key)
         self._current_version = new_version
 
         logger.info(f"Generated new encryption key version {new_version}")
         return new_version
 
+    def _add_key(self, version: int, key: bytes):
+        """Register a key version and build its ciphers once."""
+        self._keys[version] = key
+        self._cipher_suites[version] = Fernet(key)
+        aead_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=AEAD_KEY_INFO,
+        ).derive(key)
+        self._aead_ciphers[version] = ChaCha20Poly1305(aead_key)
+
     def _save_keys(self):
         """Save all keys encrypted to disk."""
-        salt = os.urandom(16)
+        if self._salt is None:
+            self._salt = os.urandom(16)
+        salt = self._salt
         master_key = self._derive_master_key(salt)
         master_cipher = Fernet(master_key)
 
@@ -96,16 +133,14 @@ class KeyManager:
             salt = base64.b64decode(data['salt'])
             master_key = self._derive_master_key(salt)
             master_cipher = Fernet(master_key)
+            self._salt = salt
 
             self._current_version = data['current_version']
 
             for version_str, encrypted_key_b64 in data['keys'].items():
                 version = int(version_str)
                 encrypted_key = base64.b64decode(encrypted_key_b64)
-                key = master_cipher.decrypt(encrypted_key)
-
-                self._keys[version] = key
-                self._cipher_suites[version] = Fernet(key)
+                self._add_key(version, master_cipher.decrypt(encrypted_key))
 
             logger.info(f"Loaded {len(self._keys)} encryption key(s), current version: {self._current_version}")
 
@@ -136,24 +171,51 @@ class KeyManager:
         """Get the current key version."""
         return self._current_version
 
-    def encrypt(self, data: str) -> dict:
-        """Encrypt data and return with version metadata."""
-        cipher = self.get_current_cipher()
-        encrypted = cipher.encrypt(data.encode())
+    def encrypt(self, data: bytes | str) -> dict:
+        """Encrypt data with the current key and return it with version metadata."""
+        if isinstance(data, str):
+            data = data.encode()
+
+        if self._current_version not in self._aead_ciphers:
+            raise RuntimeError("No encryption key available")
+
+        nonce = os.urandom(AEAD_NONCE_SIZE)
+        ct = self._aead_ciphers[self._current_version].encrypt(nonce, data, None)
         return {
             'version': self._current_version,
-            'data': encrypted.decode()
+            'nonce': base64.b64encode(nonce).decode(),
+            'ct': base64.b64encode(ct).decode()
         }
 
     def decrypt(self, encrypted_data: dict) -> str:
         """Decrypt data using the appropriate key version."""
+        return self.decrypt_bytes(encrypted_data).decode()
+
+    def decrypt_bytes(self, encrypted_data: dict) -> bytes:
+        """Decrypt data to raw bytes, leaving decoding to the caller.
+
+        Accepts the ``nonce``/``ct`` envelope from :meth:`encrypt` and the
+        earlier Fernet ``data`` envelope.
+
+        Raises:
+            cryptography.exceptions.InvalidTag: If the ciphertext was tampered
+                with or encrypted under a different key.
+        """
         version = encrypted_data.get('version', 1)
-        data = encrypted_data.get('data', encrypted_data)
 
-        # Handle legacy format (just encrypted string)
+        if 'ct' in encrypted_data:
+            if version not in self._aead_ciphers:
+                raise ValueError(f"Unknown key version: {version}")
+            return self._aead_ciphers[version].decrypt(
+                base64.b64decode(encrypted_data['nonce']),
+                base64.b64decode(encrypted_data['ct']),
+                None
+            )
+
+        # Handle legacy format (Fernet token string)
+        data = encrypted_data.get('data', encrypted_data)
         if isinstance(data, str):
-            cipher = self.get_cipher(version)
-            return cipher.decrypt(data.encode()).decode()
+            return self.get_cipher(version).decrypt(data.encode())
 
         raise ValueError("Invalid encrypted data format")
 
@@ -21,6 +21,20 @@ from dashboard.event_bus import EventBus, Event, EventType
 
 logger = logging.getLogger(__name__)
 
+# Accepted URL schemes for the blockchain RPC endpoint and for peers
+BLOCKCHAIN_URL_SCHEMES = ('http://', 'https://', 'ws://', 'wss://')
+PEER_URL_SCHEMES = ('http://', 'https://')
+
+
+def _as_bytes(data):
+    """Return ``data`` as bytes, encoding non-buffers via their str form."""
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, (bytearray, memoryview)):
+        return bytes(data)
+    return str(data).encode()
+
+
 class ConfigurationError(Exception):
     """Raised when configuration validation fails."""
     pass
@@ -33,7 +47,7 @@ class NodeConfig:
 
     def __init__(self, blockchain_type, blockchain_url, private_key, native_token_address,
                  db_path, sqlite_db_path, p2p_port, plugin_dir, node_id, node_signature,
-                 initial_peers, data_dir=None):
+                 initial_peers, data_dir=None, compliance_contract_address=None):
         self.blockchain_type = blockchain_type
         self.blockchain_url = blockchain_url
         self.private_key = private_key
@@ -46,6 +60,7 @@ class NodeConfig:
         self.node_signature = node_signature
         self.initial_peers = initial_peers
         self.data_dir = data_dir or './data'
+        self.compliance_contract_address = compliance_contract_address
 
     def validate(self):
         """Validate configuration and raise ConfigurationError if invalid."""
@@ -59,13 +74,17 @@ class NodeConfig:
         # Validate blockchain URL
         if not self.blockchain_url:
             errors.append("blockchain_url is required")
-        elif not self.blockchain_url.startswith(('http://', 'https://', 'ws://', 'wss://')):
+        elif not self.blockchain_url.startswith(BLOCKCHAIN_URL_SCHEMES):
             errors.append("blockchain_url must start with http://, https://, ws://, or wss://")
 
         # Validate native token address
         if self.native_token_address and not self.ETH_ADDRESS_PATTERN.match(self.native_token_address):
             errors.append(f"Invalid native_token_address format: {self.native_token_address}")
 
+        # Validate compliance log contract address
+        if self.compliance_contract_address and not self.ETH_ADDRESS_PATTERN.match(self.compliance_contract_address):
+            errors.append(f"Invalid compliance_contract_address format: {self.compliance_contract_address}")
+
         # Validate port
         if not isinstance(self.p2p_port, int) or not (1 <= self.p2p_port <= 65535):
             errors.append(f"p2p_port must be an integer between 1 and 65535, got: {self.p2p_port}")
@@ -96,7 +115,7 @@ class NodeConfig:
         # Validate initial_peers format
         if self.initial_peers:
             for peer in self.initial_peers:
-                if not peer.startswith(('http://', 'https://')):
+                if not peer.startswith(PEER_URL_SCHEMES):
                     errors.append(f"Invalid peer URL: {peer}. Must start with http:// or https://")
 
         if errors:
@@ -112,7 +131,7 @@ class Node:
         self.data_manager = DataManager(config.db_path)
         self.token_manager = TokenManager(self.blockchain_interface, config.native_token_address)
         self.payment_processor = PaymentProcessor(self.blockchain_interface, self.token_manager)
-        self.compliance_manager = ComplianceManager(self.blockchain_interface)
+        self.compliance_manager = ComplianceManager(self.blockchain_interface, config.compliance_contract_address)
         self.authorization_module = AuthorizationModule(self.db_connection)
         self.p2p_network = P2PNetwork(self, config.p2p_port, config.initial_peers, config.data_dir)
         self.plugin_manager = PluginManager(self, config.plugin_dir)
@@ -145,19 +164,22 @@ class Node:
 
     def _init_database(self):
         conn = sqlite3.connect(self.config.sqlite_db_path)
+        # WAL keeps readers (e.g. an operator's sqlite3 shell) unblocked while
+        # the node writes; NORMAL sync is still crash-safe under WAL
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
         conn.execute('''CREATE TABLE IF NOT EXISTS authorized_users
-                        (user_id TEXT PRIMARY KEY, public_key TEXT)''')
+                        (user_id TEXT PRIMARY KEY, public_key BLOB)''')
         conn.commit()
         return conn
 
     async def start(self):
-        if not self.blockchain_interface.connect():
-            raise ConnectionError("Failed to connect to the blockchain")
-
-        self.plugin_manager.load_plugins()
-
-        # Start core services
+        # The blockchain handshake is a blocking RPC; run it in a worker
+        # thread while the P2P network and APIs bind, so startup takes as
+        # long as the slowest step rather than their sum
         services = [
+            asyncio.to_thread(self.blockchain_interface.connect),
             self.p2p_network.start(),
             self.internal_api.start(),
             self.external_api.start()
@@ -167,7 +189,18 @@ class Node:
         if self.enable_dashboard and self.dashboard_api:
             services.append(self.dashboard_api.start())
 
-        await asyncio.gather(*services)
+        # Let every step finish before judging the result, so anything that
+        # did bind is released if another step failed
+        connected, *results = await asyncio.gather(*services, return_exceptions=True)
+        failure = next((r for r in (connected, *results) if isinstance(r, BaseException)), None)
+        if failure is not None or not connected:
+            await self._stop_services()
+            if failure is not None:
+                raise failure
+            raise ConnectionError("Failed to connect to the blockchain")
+
+        # Plugins get the node as-is, so load them once the chain is up
+        self.plugin_manager.load_plugins()
 
         # Publish node started event
         await self.event_bus.publish(Event(
@@ -199,33 +232,7 @@ class Node:
             except asyncio.CancelledError:
                 pass
 
-        # Stop APIs first (they depend on other services)
-        try:
-            await self.internal_api.stop()
-        except Exception as e:
-            logger.error(f"Error stopping internal API: {e}")
-            errors.append(e)
-
-        try:
-            await self.external_api.stop()
-        except Exception as e:
-            logger.error(f"Error stopping external API: {e}")
-            errors.append(e)
-
-        # Stop dashboard API
-        if self.dashboard_api:
-            try:
-                await self.dashboard_api.stop()
-            except Exception as e:
-                logger.error(f"Error stopping dashboard API: {e}")
-                errors.append(e)
-
-        # Stop P2P network
-        try:
-            await self.p2p_network.stop()
-        except Exception as e:
-            logger.error(f"Error stopping P2P network: {e}")
-            errors.append(e)
+        errors.extend(await self._stop_services())
 
         # Shutdown plugins
         try:
@@ -257,6 +264,39 @@ class Node:
         if errors:
             logger.warning(f"Node stopped with {len(errors)} error(s)")
 
+    async def _stop_services(self):
+        """Stop the APIs and the P2P network, returning any errors raised."""
+        errors = []
+
+        # Stop APIs first (they depend on other services); they are
+        # independent of each other, so they drain concurrently
+        api_stops = [('internal API', self.internal_api.stop()),
+                     ('external API', self.external_api.stop())]
+        if self.dashboard_api:
+            api_stops.append(('dashboard API', self.dashboard_api.stop()))
+
+        results = await asyncio.gather(*(stop for _, stop in api_stops), return_exceptions=True)
+        for (name, _), result in zip(api_stops, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error stopping {name}: {result}")
+                errors.append(result)
+
+        # Stop P2P network
+        try:
+            await self.p2p_network.stop()
+        except Exception as e:
+            logger.error(f"Error stopping P2P network: {e}")
+            errors.append(e)
+
+        return errors
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
     def change_blockchain(self, new_blockchain_type, new_blockchain_url, new_private_key):
         self.blockchain_interface.disconnect()
         self.config.blockchain_type = new_blockchain_type
@@ -275,12 +315,13 @@ class Node:
     async def share_data(self, data, recipient, payment_token=None, payment_amount=None):
         data_hash = self._hash_data(data)
 
-        if not self.authorization_module.authorize_transfer(data_hash, self.config.node_signature, self.config.node_id):
+        if not await self.authorization_module.authorize_transfer_async(data_hash, self.config.node_signature, self.config.node_id):
             raise ValueError("Unauthorized data transfer")
 
         tx_hash = None
         if payment_token and payment_amount:
-            success, tx_hash = self.payment_processor.process_payment(
+            success, tx_hash = await asyncio.to_thread(
+                self.payment_processor.process_payment,
                 recipient, self.blockchain_interface.account.address,
                 payment_amount, payment_token
             )
@@ -318,7 +359,9 @@ class Node:
             'payment_tx_hash': tx_hash if payment_token else None,
             'timestamp': int(time.time())
         }
-        compliance_tx_hash = self.compliance_manager.record_compliance_event('data_share', event_data)
+        compliance_tx_hash = await asyncio.to_thread(
+            self.compliance_manager.record_compliance_event, 'data_share', event_data
+        )
 
         # Publish data shared event
         await self.event_bus.publish(Event(
@@ -367,13 +410,24 @@ class Node:
                 logger.error(f"Status update error: {e}")
 
     def _hash_data(self, data):
-        return hashlib.sha256(str(data).encode()).hexdigest()
+        """SHA-256 hex digest used as the content address of shared data.
+
+        Buffers are hashed in place; anything else is hashed as its UTF-8
+        string form.
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = str(data).encode()
+        return hashlib.sha256(data).hexdigest()
 
     def encrypt_data(self, data):
-        return self.cipher_suite.encrypt(str(data).encode()).decode()
+        return self.cipher_suite.encrypt(_as_bytes(data)).decode()
+
+    def decrypt_bytes(self, encrypted_data):
+        """Decrypt to raw bytes, leaving decoding to the caller."""
+        return self.cipher_suite.decrypt(encrypted_data.encode())
 
     def decrypt_data(self, encrypted_data):
-        return self.cipher_suite.decrypt(encrypted_data.encode()).decode()
+        return self.decrypt_bytes(encrypted_data).decode()
 
     async def on_data_received(self, data_hash, data):
         """Handle incoming data from the P2P network."""
@@ -1,3 +1,4 @@
+import importlib
 import os
 import logging
 
@@ -11,17 +12,23 @@ class PluginManager:
         self.plugins = {}
 
     def load_plugins(self):
-        for filename in os.listdir(self.plugin_dir):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                module_name = filename[:-3]
-                try:
-                    module = __import__(f'plugins.{module_name}', fromlist=[''])
-                    plugin_class = getattr(module, f'{module_name.capitalize()}Plugin')
-                    plugin = plugin_class(self.node)
-                    self.plugins[module_name] = plugin
-                    plugin.initialize()
-                except Exception as e:
-                    logger.error(f"Failed to load plugin {module_name}: {e}")
+        """Import, construct and initialize each plugin, in filename order."""
+        with os.scandir(self.plugin_dir) as entries:
+            module_names = sorted(
+                entry.name[:-3] for entry in entries
+                if entry.name.endswith('.py') and not entry.name.startswith('__')
+                and entry.is_file()
+            )
+
+        for module_name in module_names:
+            try:
+                module = importlib.import_module(f'plugins.{module_name}')
+                plugin_class = getattr(module, f'{module_name.capitalize()}Plugin')
+                plugin = plugin_class(self.node)
+                self.plugins[module_name] = plugin
+                plugin.initialize()
+            except Exception as e:
+                logger.error(f"Failed to load plugin {module_name}: {e}")
 
     def shutdown_plugins(self):
         for plugin in self.plugins.values():
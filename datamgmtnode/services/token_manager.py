@@ -1,18 +1,41 @@
+import hashlib
+import json
+
+
 class TokenManager:
     def __init__(self, blockchain_interface, native_token_address):
         self.blockchain = blockchain_interface
         self.supported_tokens = {}
         self.node_tokens = {}
+        # Addresses in node_tokens, kept as a set for O(1) mint checks
+        self._issued_addresses = set()
         self.native_token_address = native_token_address
+        # Contract factories per ABI digest for the current connection; most
+        # tokens share the ERC20 ABI, so it is parsed once
+        self._contract_factories = {}
 
     def update_blockchain_interface(self, new_blockchain_interface):
         self.blockchain = new_blockchain_interface
+        self._contract_factories.clear()
+        # Rebind token contracts to the new connection
+        for token in self.supported_tokens.values():
+            token['contract'] = self._make_contract(token['address'], token['abi'])
+
+    def _make_contract(self, token_address, token_abi):
+        abi_key = hashlib.blake2b(
+            json.dumps(token_abi, sort_keys=True).encode(), digest_size=16
+        ).digest()
+        factory = self._contract_factories.get(abi_key)
+        if factory is None:
+            factory = self.blockchain.w3.eth.contract(abi=token_abi)
+            self._contract_factories[abi_key] = factory
+        return factory(address=token_address)
 
     def add_supported_token(self, token_address, token_abi):
         self.supported_tokens[token_address] = {
             'address': token_address,
             'abi': token_abi,
-            'contract': self.blockchain.w3.eth.contract(address=token_address, abi=token_abi)
+            'contract': self._make_contract(token_address, token_abi)
         }
 
     def is_supported_token(self, token_address):
@@ -30,12 +53,15 @@ class TokenManager:
     def issue_new_token(self, name, symbol, initial_supply):
         token_contract = self.blockchain.deploy_contract('ERC20Token', [name, symbol, initial_supply])
         token_address = token_contract.address
+        # Re-issuing a symbol replaces its token; the old one is no longer mintable
+        self._issued_addresses.discard(self.node_tokens.get(symbol))
         self.node_tokens[symbol] = token_address
+        self._issued_addresses.add(token_address)
         self.add_supported_token(token_address, token_contract.abi)
         return token_address
 
     def mint_tokens(self, token_address, recipient, amount):
-        if token_address not in self.node_tokens.values():
+        if token_address not in self._issued_addresses:
             raise ValueError("Can only mint tokens issued by this node")
         return self._send_token_transaction(token_address, 'mint', [recipient, amount])
 
@@ -60,9 +86,9 @@ class TokenManager:
         token_contract = self.supported_tokens[token_address]['contract']
         func = getattr(token_contract.functions, function_name)(*args)
 
+        # send_transaction assigns the nonce
         transaction = func.build_transaction({
             'from': self.blockchain.account.address,
-            'nonce': self.blockchain.w3.eth.get_transaction_count(self.blockchain.account.address),
         })
 
         return self.blockchain.send_transaction(transaction)
@@ -4,11 +4,31 @@ import asyncio
 import json
 import logging
 from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode
 
 import aiohttp
 
+from datamgmtnode.json_codec import dumps, loads
+
 logger = logging.getLogger(__name__)
 
+# Seconds between status checks while a share job runs
+JOB_POLL_INTERVAL = 0.5
+
+# Seconds to wait for a share job before giving up
+JOB_TIMEOUT = 120
+
+# Pings go out as text frames; the server reads binary frames as msgpack
+PING_FRAME = dumps({'type': 'ping'}).decode()
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Seconds an API request may take; the WebSocket stream is not bound by it
+REQUEST_TIMEOUT = 10
+
+# Keep idle connections to the dashboard open across refreshes and polls
+KEEPALIVE_TIMEOUT = 75
+
 
 class DashboardClient:
     """HTTP and WebSocket client for TUI communication with Dashboard API.
@@ -32,10 +52,22 @@ class DashboardClient:
         self._reconnect_delay = 3
         self._should_reconnect = True
 
+    async def __aenter__(self) -> 'DashboardClient':
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.disconnect()
+
     async def _ensure_session(self) -> None:
         """Ensure HTTP session is available."""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ttl_dns_cache=300, keepalive_timeout=KEEPALIVE_TIMEOUT
+                ),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
 
     async def get(self, path: str) -> Optional[Dict[str, Any]]:
         """Make a GET request to the API.
@@ -50,7 +82,7 @@ class DashboardClient:
         try:
             async with self.session.get(f"{self.base_url}{path}") as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return await resp.json(loads=loads)
                 logger.warning(f"GET {path} returned {resp.status}")
         except aiohttp.ClientError as e:
             logger.error(f"GET {path} failed: {e}")
@@ -76,9 +108,10 @@ class DashboardClient:
         try:
             async with self.session.post(
                 f"{self.base_url}{path}",
-                json=data
+                data=dumps(data),
+                headers=JSON_HEADERS
             ) as resp:
-                return await resp.json()
+                return await resp.json(loads=loads)
         except aiohttp.ClientError as e:
             logger.error(f"POST {path} failed: {e}")
         except Exception as e:
@@ -112,12 +145,13 @@ class DashboardClient:
             async for msg in self.ws:
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     try:
-                        event = json.loads(msg.data)
-                        if self.on_event:
-                            if asyncio.iscoroutinefunction(self.on_event):
-                                await self.on_event(event)
-                            else:
-                                self.on_event(event)
+                        message = loads(msg.data)
+                        # Events published close together arrive as one batch
+                        if message.get('type') == 'batch':
+                            events = message['data']['events']
+                        else:
+                            events = [message]
+                        await self._dispatch_events(events)
                     except json.JSONDecodeError:
                         logger.warning(f"Invalid WebSocket message: {msg.data[:100]}")
                 elif msg.type == aiohttp.WSMsgType.ERROR:
@@ -136,6 +170,22 @@ class DashboardClient:
             await asyncio.sleep(self._reconnect_delay)
             await self.connect_websocket()
 
+    async def _dispatch_events(self, events: List[Dict[str, Any]]) -> None:
+        """Pass the events from one frame to the registered handler.
+
+        The handler is resolved once per frame rather than per event, so a
+        batch costs one coroutine-function check.
+        """
+        handler = self.on_event
+        if not handler:
+            return
+        if asyncio.iscoroutinefunction(handler):
+            for event in events:
+                await handler(event)
+        else:
+            for event in events:
+                handler(event)
+
     async def disconnect(self) -> None:
         """Disconnect from WebSocket and close session."""
         self._should_reconnect = False
@@ -166,7 +216,7 @@ class DashboardClient:
         """
         if self.ws and not self.ws.closed:
             try:
-                await self.ws.send_json({'type': 'ping'})
+                await self.ws.send_str(PING_FRAME)
                 return True
             except Exception as e:
                 logger.error(f"Failed to send ping: {e}")
@@ -217,7 +267,29 @@ class DashboardClient:
         if payment_token:
             payload['payment_token'] = payment_token
             payload['payment_amount'] = payment_amount
-        return await self.post('/api/share_data', payload)
+        result = await self.post('/api/share_data', payload)
+        if not result or result.get('status') != 'pending':
+            return result
+        return await self._wait_for_job(f"/api/share_data/{result['job_id']}")
+
+    async def _wait_for_job(self, path: str) -> Optional[Dict[str, Any]]:
+        """Poll a background job until it finishes.
+
+        Args:
+            path: Job status path.
+
+        Returns:
+            Final job status, or None on error or timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + JOB_TIMEOUT
+        while loop.time() < deadline:
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            status = await self.get(path)
+            if status is None or status.get('status') != 'pending':
+                return status
+        logger.warning(f"Timed out waiting for job {path}")
+        return None
 
     async def get_data(self, data_hash: str) -> Optional[Dict[str, Any]]:
         """Get shared data by hash."""
@@ -234,7 +306,7 @@ class DashboardClient:
         """Get compliance event history."""
         path = '/api/compliance_history'
         if filters:
-            path += f'?filters={",".join(filters)}'
+            path += '?' + urlencode([('filter', f) for f in filters])
         return await self.get(path)
 
     async def get_network_stats(self) -> Optional[Dict[str, Any]]:
@@ -20,7 +20,7 @@ def temp_sqlite_db():
 
     conn = sqlite3.connect(db_path)
     conn.execute('''CREATE TABLE IF NOT EXISTS authorized_users
-                    (user_id TEXT PRIMARY KEY, public_key TEXT)''')
+                    (user_id TEXT PRIMARY KEY, public_key BLOB)''')
     conn.commit()
 
     yield conn
@@ -52,6 +52,8 @@ def mock_blockchain():
     mock.w3.eth.contract.return_value = Mock()
     mock.w3.to_checksum_address.side_effect = lambda x: x
     mock.w3.to_hex.side_effect = lambda text='': f'0x{text.encode().hex()}' if text else '0x'
+    # web3 6 has no JSON-RPC batching
+    del mock.w3.batch_requests
 
     return mock
 
@@ -171,6 +171,11 @@ class TestValidateHash:
             validate_hash("g" * 64)
         assert "hexadecimal" in exc.value.message
 
+    def test_invalid_hash_embedded_whitespace(self):
+        with pytest.raises(ValidationError) as exc:
+            validate_hash("a" * 31 + " " + "a" * 32)
+        assert "hexadecimal" in exc.value.message
+
     def test_missing_hash(self):
         with pytest.raises(ValidationError):
             validate_hash(None)
@@ -189,6 +194,7 @@ class TestValidateTransferRequest:
         result = validate_transfer_request(data)
         assert isinstance(result, ValidatedTransferRequest)
         assert result.amount == 1000
+        assert not hasattr(result, '__dict__')
 
     def test_missing_from(self):
         data = {
@@ -292,3 +298,11 @@ class TestValidateFilters:
     def test_filter_valid_characters(self):
         result = validate_filters("data_share-v2")
         assert result == ["data_share-v2"]
+
+    def test_filter_list(self):
+        assert validate_filters(["data_share", "", "transfer"]) == ["data_share", "transfer"]
+        assert validate_filters([""]) is None
+
+    def test_filter_list_invalid_characters(self):
+        with pytest.raises(ValidationError):
+            validate_filters(["data_share", "a,b"])
@@ -6,7 +6,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'datamgmtnode')
 
 from services.authorisation import AuthorizationModule
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa, padding
 
 
 def generate_key_pair():
@@ -25,6 +25,25 @@ def generate_key_pair():
     return private_key, public_pem
 
 
+def generate_ed25519_key_pair():
+    """Generate an Ed25519 key pair for testing."""
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+    return private_key, public_pem
+
+
+def to_der(public_pem):
+    """Convert a PEM public key to DER SubjectPublicKeyInfo bytes."""
+    return serialization.load_pem_public_key(public_pem.encode()).public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+
 def sign_data(private_key, data):
     """Sign data with private key."""
     signature = private_key.sign(
@@ -57,7 +76,7 @@ class TestAuthorizationModule:
         auth_module.add_authorized_user(user_id, public_pem)
 
         assert user_id in auth_module.authorized_keys
-        assert auth_module.authorized_keys[user_id] == public_pem
+        assert auth_module.authorized_keys[user_id] == to_der(public_pem)
 
     def test_authorize_transfer_valid(self, auth_module):
         """Test authorization with valid signature."""
@@ -130,3 +149,82 @@ class TestAuthorizationModule:
         assert 'user_0' in auth_module.authorized_keys
         assert 'user_1' in auth_module.authorized_keys
         assert 'user_2' in auth_module.authorized_keys
+
+    def test_authorize_with_preloaded_key(self, temp_sqlite_db):
+        """Test keys loaded from the database verify signatures."""
+        private_key, public_pem = generate_key_pair()
+        temp_sqlite_db.execute(
+            "INSERT INTO authorized_users (user_id, public_key) VALUES (?, ?)",
+            ('preloaded_user', public_pem)
+        )
+        temp_sqlite_db.commit()
+
+        auth_module = AuthorizationModule(temp_sqlite_db)
+        signature = sign_data(private_key, 'abc123hash')
+
+        assert auth_module.authorize_transfer('abc123hash', signature, 'preloaded_user') is True
+
+    def test_keys_stored_as_der(self, auth_module, temp_sqlite_db):
+        """Test PEM and DER registrations are both stored and reloaded as DER."""
+        pem_key, pem = generate_key_pair()
+        der_key, der_pem = generate_ed25519_key_pair()
+        auth_module.add_authorized_user('pem_user', public_key_pem=pem)
+        auth_module.add_authorized_user('der_user', to_der(der_pem))
+
+        rows = dict(temp_sqlite_db.execute("SELECT user_id, public_key FROM authorized_users"))
+        assert rows == {'pem_user': to_der(pem), 'der_user': to_der(der_pem)}
+
+        reloaded = AuthorizationModule(temp_sqlite_db)
+        assert reloaded.authorize_transfer('h', sign_data(pem_key, 'h'), 'pem_user') is True
+        assert reloaded.authorize_transfer('h', der_key.sign(b'h'), 'der_user') is True
+
+    def test_authorize_transfer_bytes_hash(self, auth_module):
+        """Test that an already-encoded hash verifies like its str form."""
+        private_key, public_pem = generate_key_pair()
+        auth_module.add_authorized_user('user1', public_pem)
+        signature = sign_data(private_key, 'abc123hash')
+
+        assert auth_module.authorize_transfer(b'abc123hash', signature, 'user1') is True
+        assert auth_module.authorize_transfer(b'other', signature, 'user1') is False
+
+    def test_authorize_transfer_ed25519(self, auth_module):
+        """Test Ed25519 keys verify alongside legacy RSA keys."""
+        ed_key, ed_pem = generate_ed25519_key_pair()
+        rsa_key, rsa_pem = generate_key_pair()
+        auth_module.add_authorized_user('ed_user', ed_pem)
+        auth_module.add_authorized_user('rsa_user', rsa_pem)
+
+        assert auth_module.authorize_transfer('abc123hash', ed_key.sign(b'abc123hash'), 'ed_user') is True
+        assert auth_module.authorize_transfer('other', ed_key.sign(b'abc123hash'), 'ed_user') is False
+        assert auth_module.authorize_transfer('abc123hash', sign_data(rsa_key, 'abc123hash'), 'rsa_user') is True
+        assert auth_module.authorize_transfer('abc123hash', sign_data(rsa_key, 'abc123hash'), 'ed_user') is False
+
+    def test_invalid_public_key(self, auth_module):
+        """Test a user with an unparseable key is never authorized."""
+        auth_module.add_authorized_user('bad_key_user', 'not a pem')
+
+        assert auth_module.authorize_transfer('hash', b'signature', 'bad_key_user') is False
+
+    @pytest.mark.asyncio
+    async def test_authorize_transfer_async(self, auth_module):
+        """Test verification offloaded to a worker thread."""
+        private_key, public_pem = generate_key_pair()
+        auth_module.add_authorized_user('user1', public_pem)
+        signature = sign_data(private_key, 'abc123hash')
+
+        assert await auth_module.authorize_transfer_async('abc123hash', signature, 'user1') is True
+        assert await auth_module.authorize_transfer_async('other', signature, 'user1') is False
+
+    @pytest.mark.asyncio
+    async def test_authorize_transfers_batch(self, auth_module):
+        """Test batch verification keeps request order."""
+        private_key, public_pem = generate_key_pair()
+        auth_module.add_authorized_user('user1', public_pem)
+
+        results = await auth_module.authorize_transfers([
+            ('hash_a', sign_data(private_key, 'hash_a'), 'user1'),
+            ('hash_b', sign_data(private_key, 'wrong'), 'user1'),
+            ('hash_c', sign_data(private_key, 'hash_c'), 'unknown_user'),
+        ])
+
+        assert results == [True, False, False]
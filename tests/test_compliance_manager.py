@@ -1,3 +1,4 @@
+import hashlib
 import pytest
 import sys
 import os
@@ -5,7 +6,14 @@ from unittest.mock import Mock, MagicMock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'datamgmtnode'))
 
-from services.compliance_manager import ComplianceManager
+from services.compliance_manager import (
+    COMPLIANCE_RECORDED_TOPIC,
+    ZERO_ADDRESS,
+    ComplianceManager,
+    compliance_digest,
+)
+from hexbytes import HexBytes
+from web3 import Web3
 
 
 class TestComplianceManager:
@@ -52,6 +60,7 @@ class TestComplianceManager:
         """Test verification when event is not found."""
         # Mock empty blocks
         mock_block = {'number': 100, 'transactions': []}
+        compliance_manager.blockchain.w3.eth.block_number = 100
         compliance_manager.blockchain.w3.eth.get_block.return_value = mock_block
 
         result = compliance_manager.verify_compliance('data_share', 'nonexistent')
@@ -61,6 +70,7 @@ class TestComplianceManager:
     def test_get_compliance_history_empty(self, compliance_manager):
         """Test getting compliance history when empty."""
         mock_block = {'number': 100, 'transactions': []}
+        compliance_manager.blockchain.w3.eth.block_number = 100
         compliance_manager.blockchain.w3.eth.get_block.return_value = mock_block
 
         history = compliance_manager.get_compliance_history()
@@ -70,8 +80,149 @@ class TestComplianceManager:
     def test_get_compliance_history_with_filters(self, compliance_manager):
         """Test getting compliance history with filters."""
         mock_block = {'number': 100, 'transactions': []}
+        compliance_manager.blockchain.w3.eth.block_number = 100
         compliance_manager.blockchain.w3.eth.get_block.return_value = mock_block
 
         history = compliance_manager.get_compliance_history(filters=['data_share'])
 
         assert isinstance(history, list)
+
+    def test_compliance_digest_is_canonical(self):
+        """Test that the digest ignores key order and hashes canonical JSON."""
+        a = compliance_digest({'recipient': '0xUser', 'data_hash': 'abc123'})
+        b = compliance_digest({'data_hash': 'abc123', 'recipient': '0xUser'})
+        assert a == b
+        assert a == hashlib.sha256(b'{"data_hash":"abc123","recipient":"0xUser"}').hexdigest()
+
+    def test_scan_matches_event_bytes(self, compliance_manager):
+        """Test matching zero-address transaction input without decoding it."""
+        event_data = {'k': 'v'}
+        event_hash = compliance_digest(event_data)
+        txs = [
+            {'to': ZERO_ADDRESS, 'input': HexBytes(f'data_share:{event_hash}'.encode()), 'hash': b'\x01'},
+            {'to': ZERO_ADDRESS, 'input': HexBytes(b'token_transfer:ff'), 'hash': b'\x02'},
+            {'to': ZERO_ADDRESS, 'input': HexBytes(b'\xff\xfe:'), 'hash': b'\x03'},
+            {'to': '0x' + '1' * 40, 'input': HexBytes(b'data_share:x'), 'hash': b'\x04'},
+        ]
+        eth = compliance_manager.blockchain.w3.eth
+        eth.block_number = 1
+        eth.get_block.return_value = {'number': 1, 'transactions': txs}
+
+        assert compliance_manager.verify_compliance('data_share', event_data) is True
+        assert compliance_manager.verify_compliance('data_share', {'other': 1}) is False
+        assert [e['type'] for e in compliance_manager.get_compliance_history()] == [
+            'data_share', 'token_transfer'
+        ]
+        assert compliance_manager.get_compliance_history(filters=['token_transfer']) == [
+            {'type': 'token_transfer', 'hash': 'ff', 'block': 1, 'tx_hash': '02'}
+        ]
+
+    def test_scan_without_batching_keeps_block_order(self, compliance_manager):
+        """Test that concurrently fetched blocks are processed newest first."""
+        eth = compliance_manager.blockchain.w3.eth
+        eth.block_number = 120
+        eth.get_block.side_effect = lambda i, full_transactions: {
+            'transactions': [{'to': ZERO_ADDRESS, 'input': f'data_share:{i}'.encode(), 'hash': b'\x01'}]
+        }
+
+        history = compliance_manager.get_compliance_history()
+
+        assert [e['block'] for e in history] == list(range(120, 0, -1))
+        assert [e['hash'] for e in history] == [str(i) for i in range(120, 0, -1)]
+
+    def test_get_compliance_history_batches_block_requests(self, compliance_manager):
+        """Test that blocks are fetched in JSON-RPC batches when supported."""
+        w3 = compliance_manager.blockchain.w3
+        w3.eth.block_number = 120
+        tx = {'to': '0x' + '0' * 40, 'input': b'data_share:abc', 'hash': b'\x12'}
+
+        def new_batch():
+            batch = MagicMock()
+            batch.__enter__.return_value = batch
+            batch.execute.side_effect = lambda: [
+                {'transactions': [tx]} for _ in range(batch.add.call_count)
+            ]
+            return batch
+
+        w3.batch_requests = Mock(side_effect=new_batch)
+
+        history = compliance_manager.get_compliance_history()
+
+        # 120 blocks in batches of 50, 50 and 20
+        assert w3.batch_requests.call_count == 3
+        assert [e['block'] for e in history] == list(range(120, 0, -1))
+
+
+class TestComplianceManagerContractLog:
+    """Tests for compliance events stored as ComplianceLog contract logs."""
+
+    CONTRACT = '0x' + 'ab' * 20
+
+    @pytest.fixture
+    def compliance_manager(self, mock_blockchain):
+        mock_blockchain.w3.eth.block_number = 5000
+        return ComplianceManager(mock_blockchain, self.CONTRACT)
+
+    def test_record_calls_contract(self, compliance_manager):
+        """Test that recording goes through the contract's record()."""
+        contract = compliance_manager.blockchain.get_contract.return_value
+        contract.functions.record.return_value.build_transaction.return_value = {'data': '0x01'}
+
+        compliance_manager.record_compliance_event('data_share', {'k': 'v'})
+
+        event_type, event_hash = contract.functions.record.call_args[0]
+        assert event_type == 'data_share'
+        assert len(event_hash) == 32
+        compliance_manager.blockchain.send_transaction.assert_called_once_with({'data': '0x01'})
+
+    def test_verify_uses_single_topic_filtered_query(self, compliance_manager):
+        """Test that verification is one get_logs call with indexed topics."""
+        eth = compliance_manager.blockchain.w3.eth
+        eth.get_logs.return_value = [{'blockNumber': 4990}]
+
+        assert compliance_manager.verify_compliance('data_share', {'k': 'v'}) is True
+
+        query = eth.get_logs.call_args[0][0]
+        assert query['address'] == self.CONTRACT
+        assert query['fromBlock'] == 4001
+        assert query['topics'][0] == COMPLIANCE_RECORDED_TOPIC
+        assert len(query['topics']) == 3
+        eth.get_block.assert_not_called()
+
+    def test_get_logs_split_into_windows(self, compliance_manager, monkeypatch):
+        """Test that wide scans are split into provider-sized windows."""
+        monkeypatch.setattr('services.compliance_manager.SCAN_DEPTH', 4500)
+        eth = compliance_manager.blockchain.w3.eth
+        eth.get_logs.return_value = []
+
+        compliance_manager.verify_compliance('data_share', {'k': 'v'})
+
+        windows = [(c[0][0]['fromBlock'], c[0][0]['toBlock']) for c in eth.get_logs.call_args_list]
+        assert windows == [(501, 2500), (2501, 4500), (4501, 5000)]
+
+    def test_verify_not_found(self, compliance_manager):
+        """Test verification when no log matches."""
+        compliance_manager.blockchain.w3.eth.get_logs.return_value = []
+        assert compliance_manager.verify_compliance('data_share', 'missing') is False
+
+    def test_history_from_logs(self, compliance_manager):
+        """Test that history is decoded from logs, newest first."""
+        eth = compliance_manager.blockchain.w3.eth
+        eth.get_logs.return_value = [
+            {'blockNumber': 10, 'transactionHash': bytes.fromhex('aa')},
+            {'blockNumber': 20, 'transactionHash': bytes.fromhex('bb')},
+        ]
+        contract = compliance_manager.blockchain.get_contract.return_value
+        contract.events.ComplianceRecorded.return_value.process_log.side_effect = [
+            {'args': {'eventType': 'data_share', 'eventHash': bytes.fromhex('02')}},
+            {'args': {'eventType': 'data_share', 'eventHash': bytes.fromhex('01')}},
+        ]
+
+        history = compliance_manager.get_compliance_history(filters=['data_share'])
+
+        assert history == [
+            {'type': 'data_share', 'hash': '02', 'block': 20, 'tx_hash': 'bb'},
+            {'type': 'data_share', 'hash': '01', 'block': 10, 'tx_hash': 'aa'},
+        ]
+        type_topics = eth.get_logs.call_args[0][0]['topics'][1]
+        assert type_topics == [Web3.to_hex(Web3.keccak(text='data_share'))]
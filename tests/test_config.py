@@ -71,6 +71,13 @@ class TestNodeConfigValidation:
             config.validate()
         assert 'native_token_address' in str(exc.value)
 
+    def test_invalid_compliance_contract_address(self):
+        config_dict = self.get_valid_config(compliance_contract_address='0x123')
+        config = NodeConfig(**config_dict)
+        with pytest.raises(ConfigurationError) as exc:
+            config.validate()
+        assert 'compliance_contract_address' in str(exc.value)
+
     def test_valid_native_token_address_null(self):
         # Empty string should pass (some chains might not use this)
         config_dict = self.get_valid_config(native_token_address='')
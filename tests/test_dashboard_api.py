@@ -0,0 +1,450 @@
+import asyncio
+import json
+import time
+import pytest
+import pytest_asyncio
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+
+from aiohttp.streams import StreamReader
+from aiohttp.test_utils import TestClient, TestServer, make_mocked_request
+
+from datamgmtnode.api import handlers
+from datamgmtnode.api.dashboard_api import DashboardAPI, IMMUTABLE_CACHE_CONTROL
+from datamgmtnode.dashboard.event_bus import EventBus
+
+
+@pytest.fixture
+def static_dir():
+    """Create a temporary built-dashboard directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / 'index.html').write_text('<html>index</html>')
+        (root / 'favicon.ico').write_bytes(b'\x00')
+        (root / 'assets').mkdir()
+        (root / 'assets' / 'index-abc123.js').write_text('console.log(1)')
+        yield root
+
+
+@pytest.fixture
+def dashboard_api(static_dir):
+    """Create a DashboardAPI pointed at the temporary static directory."""
+    api = DashboardAPI(Mock(), EventBus())
+    api.static_path = static_dir
+    return api
+
+
+@pytest_asyncio.fixture
+async def client(dashboard_api):
+    """Create a test client for the dashboard application."""
+    async with TestClient(TestServer(dashboard_api._create_app())) as client:
+        yield client
+
+
+class TestStaticAssets:
+    """Tests for static file serving."""
+
+    @pytest.mark.asyncio
+    async def test_serve_index(self, client):
+        resp = await client.get('/')
+        assert resp.status == 200
+        assert await resp.text() == '<html>index</html>'
+
+    @pytest.mark.asyncio
+    async def test_serve_hashed_asset_is_immutable(self, client):
+        resp = await client.get('/assets/index-abc123.js')
+        assert resp.status == 200
+        assert 'javascript' in resp.headers['Content-Type']
+        assert resp.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+
+    @pytest.mark.asyncio
+    async def test_serve_root_file_not_immutable(self, client):
+        resp = await client.get('/favicon.ico')
+        assert resp.status == 200
+        assert 'Cache-Control' not in resp.headers
+
+    @pytest.mark.asyncio
+    async def test_conditional_get(self, client):
+        resp = await client.get('/assets/index-abc123.js')
+        etag = resp.headers['ETag']
+
+        resp = await client.get('/assets/index-abc123.js', headers={'If-None-Match': etag})
+        assert resp.status == 304
+
+    @pytest.mark.asyncio
+    async def test_spa_route_falls_back_to_index(self, client):
+        resp = await client.get('/network/peers', headers={'Accept': 'text/html'})
+        assert resp.status == 200
+        assert await resp.text() == '<html>index</html>'
+
+    @pytest.mark.asyncio
+    async def test_unknown_api_route_is_not_rewritten(self, client):
+        resp = await client.get('/api/unknown', headers={'Accept': 'text/html'})
+        assert resp.status == 404
+
+    @pytest.mark.asyncio
+    async def test_missing_asset_is_not_rewritten(self, client):
+        resp = await client.get('/assets/missing.js', headers={'Accept': '*/*'})
+        assert resp.status == 404
+
+
+class TestNoStatic:
+    """Tests for the fallback when the dashboard is not built."""
+
+    @pytest.mark.asyncio
+    async def test_no_static_payload(self):
+        api = DashboardAPI(Mock(), EventBus(), port=9000)
+        api.static_path = Path('/nonexistent')
+
+        async with TestClient(TestServer(api._create_app())) as client:
+            resp = await client.get('/some/page')
+            assert resp.status == 200
+            data = await resp.json()
+
+        assert data['websocket'] == 'ws://localhost:9000/ws'
+        assert 'GET /api/health' in data['endpoints']
+
+
+class TestResponseCache:
+    """Tests for cached read-only endpoints."""
+
+    @pytest.fixture
+    def node(self, dashboard_api):
+        node = dashboard_api.node
+        node.config.node_id = 'node1'
+        node.get_native_token_address.return_value = '0x' + '0' * 40
+        node.token_manager.supported_tokens = {}
+        return node
+
+    @pytest.mark.asyncio
+    async def test_health_served_from_cache(self, client, node):
+        node.p2p_network.is_running = True
+        first = await (await client.get('/api/health')).json()
+
+        node.p2p_network.is_running = False
+        second = await (await client.get('/api/health')).json()
+
+        assert first == second
+        assert second['components']['p2p_network'] == 'running'
+
+    @pytest.mark.asyncio
+    async def test_cache_expires(self, client, node, dashboard_api):
+        node.p2p_network.is_running = True
+        await client.get('/api/health')
+
+        node.p2p_network.is_running = False
+        for key, (created, body) in list(dashboard_api._resp_cache.items()):
+            dashboard_api._resp_cache[key] = (created - 60, body)
+
+        data = await (await client.get('/api/health')).json()
+        assert data['components']['p2p_network'] == 'stopped'
+
+    @pytest.mark.asyncio
+    async def test_query_string_does_not_grow_cache(self, client, node, dashboard_api):
+        for i in range(5):
+            assert (await client.get(f'/api/health?x={i}')).status == 200
+
+        assert list(dashboard_api._resp_cache) == ['/api/health']
+
+    @pytest.mark.asyncio
+    async def test_add_token_invalidates_token_list(self, client, node):
+        data = await (await client.get('/api/tokens')).json()
+        assert len(data['tokens']) == 1
+
+        token = '0x' + 'a' * 40
+
+        def add_token(address, abi):
+            node.token_manager.supported_tokens[address] = {'abi': abi}
+
+        node.token_manager.add_supported_token.side_effect = add_token
+        resp = await client.post('/api/tokens', json={'address': token, 'abi': [{}]})
+        assert resp.status == 201
+
+        data = await (await client.get('/api/tokens')).json()
+        assert [t['address'] for t in data['tokens']] == ['0x' + '0' * 40, token]
+
+
+class TestComplianceHistory:
+    """Tests for the streamed compliance history endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_streams_history(self, client, dashboard_api):
+        history = [
+            {'type': 'data_share', 'hash': f'{i:064x}', 'block': i, 'tx_hash': '0x01'}
+            for i in range(2000)
+        ]
+        dashboard_api.node.compliance_manager.get_compliance_history.return_value = history
+
+        resp = await client.get('/api/compliance_history?filters=data_share')
+
+        assert resp.status == 200
+        assert await resp.json() == {
+            'history': history,
+            'count': 2000,
+            'filters': ['data_share']
+        }
+
+    @pytest.mark.asyncio
+    async def test_streams_generator(self, client, dashboard_api):
+        dashboard_api.node.compliance_manager.get_compliance_history.return_value = (
+            {'block': i} for i in range(3)
+        )
+
+        data = await (await client.get('/api/compliance_history')).json()
+
+        assert data == {'history': [{'block': 0}, {'block': 1}, {'block': 2}], 'count': 3, 'filters': None}
+
+    @pytest.mark.asyncio
+    async def test_repeated_filter_params(self, client, dashboard_api):
+        get_history = dashboard_api.node.compliance_manager.get_compliance_history
+        get_history.return_value = []
+
+        data = await (await client.get('/api/compliance_history?filter=data_share&filter=transfer')).json()
+
+        get_history.assert_called_once_with(['data_share', 'transfer'])
+        assert data['filters'] == ['data_share', 'transfer']
+
+    @pytest.mark.asyncio
+    async def test_history_error(self, client, dashboard_api):
+        dashboard_api.node.compliance_manager.get_compliance_history.side_effect = Exception('rpc down')
+
+        resp = await client.get('/api/compliance_history')
+
+        assert resp.status == 500
+        assert await resp.json() == {'error': 'Failed to retrieve history'}
+
+
+class TestCompression:
+    """Tests for JSON response compression."""
+
+    @pytest.mark.asyncio
+    async def test_large_json_is_compressed(self, client, dashboard_api):
+        dashboard_api.node.p2p_network.get_connected_peers.return_value = [
+            {'node_id': f'peer{i}', 'address': '10.0.0.1:8000'} for i in range(100)
+        ]
+
+        resp = await client.get('/api/network/peers', headers={'Accept-Encoding': 'gzip'})
+
+        assert resp.headers['Content-Encoding'] == 'gzip'
+        assert (await resp.json())['count'] == 100
+
+    @pytest.mark.asyncio
+    async def test_small_json_is_not_compressed(self, client, dashboard_api):
+        dashboard_api.node.p2p_network.get_connected_peers.return_value = []
+
+        resp = await client.get('/api/network/peers', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in resp.headers
+
+    @pytest.mark.asyncio
+    async def test_streamed_history_is_compressed(self, client, dashboard_api):
+        dashboard_api.node.compliance_manager.get_compliance_history.return_value = [
+            {'block': i} for i in range(500)
+        ]
+
+        resp = await client.get('/api/compliance_history', headers={'Accept-Encoding': 'gzip'})
+
+        assert resp.headers['Content-Encoding'] == 'gzip'
+        assert (await resp.json())['count'] == 500
+
+    @pytest.mark.asyncio
+    async def test_not_compressed_without_accept_encoding(self, client, dashboard_api):
+        dashboard_api.node.compliance_manager.get_compliance_history.return_value = [
+            {'block': i} for i in range(500)
+        ]
+
+        resp = await client.get(
+            '/api/compliance_history',
+            headers={'Accept-Encoding': 'identity'},
+            auto_decompress=False
+        )
+
+        assert 'Content-Encoding' not in resp.headers
+
+
+class TestSharedHandlers:
+    """Tests for handlers registered from api.handlers."""
+
+    @pytest.mark.asyncio
+    async def test_validation_error_returns_422(self, client):
+        resp = await client.post('/api/transfer', json={'from': 'bad'})
+
+        assert resp.status == 422
+        assert (await resp.json())['field'] == 'from'
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_body(self, client):
+        resp = await client.post('/api/share_data', data=b'not json')
+
+        assert resp.status == 422
+        assert (await resp.json())['error'] == 'Invalid JSON body'
+
+    @pytest.mark.asyncio
+    async def test_get_balance(self, client, dashboard_api):
+        node = dashboard_api.node
+        node.get_native_token_address.return_value = '0x' + '0' * 40
+        node.token_manager.get_balance.return_value = 10 ** 20
+        address = '0x' + 'b' * 40
+
+        resp = await client.get(f'/api/balance/{address}')
+
+        assert resp.status == 200
+        assert await resp.json() == {
+            'address': address,
+            'balance': str(10 ** 20),
+            'token': '0x' + '0' * 40
+        }
+
+    @pytest.mark.asyncio
+    async def test_blocking_rpc_runs_off_event_loop(self, client, dashboard_api):
+        node = dashboard_api.node
+        node.get_native_token_address.return_value = '0x' + '0' * 40
+
+        def slow_balance(address, token):
+            time.sleep(0.2)
+            return 1
+
+        node.token_manager.get_balance.side_effect = slow_balance
+        address = '0x' + 'b' * 40
+
+        started = time.monotonic()
+        responses = await asyncio.gather(
+            *(client.get(f'/api/balance/{address}') for _ in range(3))
+        )
+
+        assert [r.status for r in responses] == [200, 200, 200]
+        assert time.monotonic() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_get_data_not_found(self, client, dashboard_api):
+        async def not_found(data_hash):
+            return None
+
+        dashboard_api.node.get_shared_data = not_found
+
+        resp = await client.get('/api/data/' + 'a' * 64)
+
+        assert resp.status == 404
+
+
+class TestShareDataJobs:
+    """Tests for background share_data jobs."""
+
+    RECIPIENT = '0x' + 'c' * 40
+
+    @pytest.fixture
+    def release(self, dashboard_api):
+        """Make node.share_data block until the returned event is set."""
+        release = asyncio.Event()
+        calls = []
+
+        async def share_data(data, recipient, token, amount):
+            calls.append(data)
+            await release.wait()
+            if data == 'bad':
+                raise ValueError('Insufficient balance')
+            return '0xabc'
+
+        dashboard_api.node.share_data = share_data
+        release.calls = calls
+        return release
+
+    async def _wait(self, client, job_id):
+        for _ in range(50):
+            data = await (await client.get(f'/api/share_data/{job_id}')).json()
+            if data['status'] != 'pending':
+                return data
+            await asyncio.sleep(0.01)
+        raise AssertionError('job did not finish')
+
+    @pytest.mark.asyncio
+    async def test_returns_202_and_completes(self, client, release):
+        resp = await client.post('/api/share_data', json={'data': 'x', 'recipient': self.RECIPIENT})
+
+        assert resp.status == 202
+        job = await resp.json()
+        assert job['status'] == 'pending'
+        assert resp.headers['Location'] == f"/api/share_data/{job['job_id']}"
+
+        release.set()
+        assert await self._wait(client, job['job_id']) == {
+            'job_id': job['job_id'],
+            'status': 'completed',
+            'success': True,
+            'tx_hash': '0xabc',
+            'recipient': self.RECIPIENT
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_job(self, client, release):
+        release.set()
+        resp = await client.post('/api/share_data', json={'data': 'bad', 'recipient': self.RECIPIENT})
+
+        data = await self._wait(client, (await resp.json())['job_id'])
+
+        assert data['status'] == 'failed'
+        assert data['error'] == 'Insufficient balance'
+
+    @pytest.mark.asyncio
+    async def test_idempotency_key_reuses_job(self, client, release):
+        body = {'data': 'x', 'recipient': self.RECIPIENT}
+        headers = {'Idempotency-Key': 'order-42'}
+
+        first = await (await client.post('/api/share_data', json=body, headers=headers)).json()
+        second = await (await client.post('/api/share_data', json=body, headers=headers)).json()
+
+        assert first['job_id'] == second['job_id'] != 'order-42'
+        await asyncio.sleep(0)
+        assert release.calls == ['x']
+        release.set()
+
+    @pytest.mark.asyncio
+    async def test_idempotency_key_is_scoped_to_client(self, dashboard_api, release):
+        body = b'{"data": "x", "recipient": "%s"}' % self.RECIPIENT.encode()
+
+        async def submit(remote):
+            payload = StreamReader(Mock(_reading_paused=False), 2 ** 16, loop=asyncio.get_running_loop())
+            payload.feed_data(body)
+            payload.feed_eof()
+            request = make_mocked_request(
+                'POST', '/api/share_data',
+                headers={'Idempotency-Key': 'order-42', 'Content-Type': 'application/json'},
+                payload=payload
+            ).clone(remote=remote)
+            resp = await handlers.submit_share_data(dashboard_api.node, dashboard_api._jobs, request)
+            return json.loads(resp.body)['job_id']
+
+        first = await submit('192.0.2.1')
+        assert await submit('192.0.2.1') == first
+        assert await submit('192.0.2.2') != first
+        release.set()
+
+    @pytest.mark.asyncio
+    async def test_pending_jobs_are_capped(self, client, dashboard_api, release):
+        dashboard_api._jobs.max_pending = 1
+        body = {'data': 'x', 'recipient': self.RECIPIENT}
+
+        assert (await client.post('/api/share_data', json=body)).status == 202
+        resp = await client.post('/api/share_data', json=body)
+        assert resp.status == 503
+        assert resp.headers['Retry-After'] == '1'
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert (await client.post('/api/share_data', json=body)).status == 202
+
+    @pytest.mark.asyncio
+    async def test_invalid_idempotency_key(self, client):
+        resp = await client.post(
+            '/api/share_data',
+            json={'data': 'x', 'recipient': self.RECIPIENT},
+            headers={'Idempotency-Key': 'not valid!'}
+        )
+
+        assert resp.status == 422
+
+    @pytest.mark.asyncio
+    async def test_unknown_job(self, client):
+        resp = await client.get('/api/share_data/missing')
+        assert resp.status == 404
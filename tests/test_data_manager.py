@@ -84,3 +84,22 @@ class TestDataManager:
         assert dm.get_data('key2') == 'value2'
         assert dm.get_data('key3') == 'value3'
         dm.close()
+
+    def test_store_many(self, temp_db_path):
+        """Test storing several keys in one batch."""
+        dm = DataManager(temp_db_path)
+
+        dm.store_many([('key1', 'value1'), (b'key2', b'value2')])
+
+        assert dm.get_data('key1') == 'value1'
+        assert dm.get_data('key2') == 'value2'
+        dm.close()
+
+    def test_iterator_with_prefix(self, temp_db_path):
+        """Test iterating keys by prefix in key order."""
+        dm = DataManager(temp_db_path)
+        dm.store_many([('a:2', '2'), ('a:1', '1'), ('b:1', '3')])
+
+        assert list(dm.iterator('a:')) == [(b'a:1', b'1'), (b'a:2', b'2')]
+        assert len(list(dm.iterator())) == 3
+        dm.close()
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+from datamgmtnode.dashboard.event_bus import Event, EventBus, EventType
+
+
+@pytest.fixture
+def event_bus():
+    return EventBus()
+
+
+class TestEventBus:
+    """Tests for event dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_sync_and_async_subscribers_receive_event(self, event_bus):
+        """Test that type and global subscribers of both kinds are called."""
+        received = []
+
+        async def on_any(event):
+            received.append(('async', event.type))
+
+        event_bus.subscribe(EventType.DATA_SHARED, lambda e: received.append(('sync', e.type)))
+        event_bus.subscribe_all(on_any)
+
+        await event_bus.publish(Event(type=EventType.DATA_SHARED, data={}))
+
+        assert sorted(received) == [
+            ('async', EventType.DATA_SHARED),
+            ('sync', EventType.DATA_SHARED),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_async_subscribers_run_concurrently(self, event_bus):
+        """Test that async callbacks are awaited together, not one by one."""
+        started = []
+        release = asyncio.Event()
+
+        async def slow(event):
+            started.append(event)
+            await release.wait()
+
+        async def other(event):
+            started.append(event)
+            release.set()
+
+        event_bus.subscribe_all(slow)
+        event_bus.subscribe_all(other)
+
+        await asyncio.wait_for(
+            event_bus.publish(Event(type=EventType.ERROR, data={})), timeout=1
+        )
+        assert len(started) == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_callback_does_not_block_publish(self, event_bus):
+        """Test that sync callbacks run after publish returns."""
+        received = []
+        event_bus.subscribe_all(received.append)
+
+        await event_bus.publish(Event(type=EventType.ERROR, data={}))
+        assert received == []
+
+        await asyncio.sleep(0)
+        assert len(received) == 1
+
+    @pytest.mark.asyncio
+    async def test_filter_skips_rejected_events(self, event_bus):
+        """Test that the pre-filter decides whether the callback runs."""
+        received = []
+        event_bus.subscribe_all(
+            received.append, filter_fn=lambda e: e.data.get('important', False)
+        )
+
+        await event_bus.publish(Event(type=EventType.ERROR, data={}))
+        await event_bus.publish(Event(type=EventType.ERROR, data={'important': True}))
+        await asyncio.sleep(0)
+
+        assert [e.data for e in received] == [{'important': True}]
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_does_not_stop_others(self, event_bus):
+        """Test that callback and filter errors are isolated."""
+        received = []
+
+        def broken(event):
+            raise RuntimeError('boom')
+
+        event_bus.subscribe(EventType.ERROR, broken)
+        event_bus.subscribe(EventType.ERROR, received.append, filter_fn=lambda e: 1 / 0)
+        event_bus.subscribe_all(received.append)
+
+        await event_bus.publish(Event(type=EventType.ERROR, data={}))
+        await asyncio.sleep(0)
+
+        assert len(received) == 1
+
+    def test_subscribe_twice_and_unsubscribe(self, event_bus):
+        """Test that subscriptions are unique per callback and removable."""
+        callback = lambda e: None
+        event_bus.subscribe(EventType.ERROR, callback)
+        event_bus.subscribe(EventType.ERROR, callback)
+        event_bus.subscribe_all(callback)
+        assert event_bus.subscriber_count == 2
+
+        event_bus.unsubscribe(EventType.ERROR, callback)
+        event_bus.unsubscribe_all(callback)
+        assert event_bus.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self):
+        """Test that history keeps only the newest max_history events."""
+        event_bus = EventBus(max_history=3)
+        for i in range(5):
+            await event_bus.publish(Event(type=EventType.ERROR, data={'n': i}))
+
+        assert event_bus.history_size == 3
+        assert [e.data['n'] for e in event_bus.get_recent_events(2)] == [3, 4]
+        assert [e.data['n'] for e in event_bus.get_recent_events(10)] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_get_events_by_type(self, event_bus):
+        """Test typed history queries and clearing."""
+        for i in range(4):
+            await event_bus.publish(Event(type=EventType.DATA_SHARED, data={'n': i}))
+            await event_bus.publish(Event(type=EventType.ERROR, data={'n': i}))
+
+        shared = event_bus.get_events_by_type(EventType.DATA_SHARED, count=2)
+        assert [e.data['n'] for e in shared] == [2, 3]
+        assert all(e.type == EventType.DATA_SHARED for e in shared)
+        assert event_bus.get_events_by_type(EventType.TOKEN_ADDED) == []
+
+        event_bus.clear_history()
+        assert event_bus.get_events_by_type(EventType.ERROR) == []
+
+    def test_event_to_json_bytes(self):
+        """Test that to_json returns encoded JSON matching to_dict."""
+        event = Event(type=EventType.DATA_SHARED, data={'n': 1}, timestamp=1.5)
+        encoded = event.to_json()
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == event.to_dict()
@@ -0,0 +1,85 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'datamgmtnode'))
+
+from blockchain.evm_blockchain_interface import EVMBlockchainInterface, GAS_PRICE_TTL
+
+
+class TestSendTransaction:
+    @pytest.fixture
+    def blockchain(self):
+        """Create an interface wired to a mock Web3 connection."""
+        blockchain = EVMBlockchainInterface('http://localhost:8545', '0x' + '1' * 64)
+        blockchain.w3 = Mock()
+        blockchain.account = Mock(address='0x1234567890abcdef1234567890abcdef12345678')
+        blockchain.w3.eth.get_transaction_count.return_value = 7
+        blockchain.w3.eth.estimate_gas.return_value = 21000
+        blockchain.w3.eth.gas_price = 20000000000
+        blockchain.w3.eth.send_raw_transaction.return_value = bytes.fromhex('ab')
+        return blockchain
+
+    def sent_nonces(self, blockchain):
+        sign = blockchain.w3.eth.account.sign_transaction
+        return [c[0][0]['nonce'] for c in sign.call_args_list]
+
+    def test_nonce_counted_locally(self, blockchain):
+        """Test that the nonce is fetched once and then incremented."""
+        for _ in range(3):
+            assert blockchain.send_transaction({'to': '0x0'}) == 'ab'
+
+        assert self.sent_nonces(blockchain) == [7, 8, 9]
+        blockchain.w3.eth.get_transaction_count.assert_called_once()
+
+    def test_failed_send_resyncs_nonce(self, blockchain):
+        """Test that a failed broadcast makes the next send re-read the nonce."""
+        blockchain.send_transaction({'to': '0x0'})
+        blockchain.w3.eth.send_raw_transaction.side_effect = ConnectionError('reset by peer')
+        with pytest.raises(ConnectionError):
+            blockchain.send_transaction({'to': '0x0'})
+
+        blockchain.w3.eth.send_raw_transaction.side_effect = None
+        blockchain.w3.eth.get_transaction_count.return_value = 12
+        blockchain.send_transaction({'to': '0x0'})
+
+        assert self.sent_nonces(blockchain) == [7, 8, 12]
+
+    def test_nonce_error_resyncs_and_retries(self, blockchain):
+        """Test that a rejected nonce is re-read and the send retried once."""
+        signed = []
+        blockchain.w3.eth.account.sign_transaction.side_effect = \
+            lambda tx, key: signed.append(tx['nonce']) or Mock()
+
+        blockchain.send_transaction({'to': '0x0'})
+        blockchain.w3.eth.get_transaction_count.return_value = 10
+        blockchain.w3.eth.send_raw_transaction.side_effect = [
+            ValueError({'message': 'nonce too low'}), bytes.fromhex('cd')
+        ]
+
+        assert blockchain.send_transaction({'to': '0x0'}) == 'cd'
+        blockchain.w3.eth.send_raw_transaction.side_effect = None
+        blockchain.send_transaction({'to': '0x0'})
+
+        assert signed == [7, 8, 10, 11]
+
+    def test_explicit_nonce_is_kept(self, blockchain):
+        """Test that a caller-supplied nonce is sent unchanged."""
+        blockchain.send_transaction({'to': '0x0', 'nonce': 3})
+        assert self.sent_nonces(blockchain) == [3]
+        blockchain.w3.eth.get_transaction_count.assert_not_called()
+
+    def test_gas_price_cached(self, blockchain):
+        """Test that the gas price is reused until the TTL expires."""
+        with patch('blockchain.evm_blockchain_interface.time.monotonic') as monotonic:
+            monotonic.return_value = 100.0
+            blockchain.send_transaction({'to': '0x0'})
+            blockchain.w3.eth.gas_price = 30000000000
+            blockchain.send_transaction({'to': '0x0'})
+            monotonic.return_value = 100.0 + GAS_PRICE_TTL + 1
+            blockchain.send_transaction({'to': '0x0'})
+
+        sign = blockchain.w3.eth.account.sign_transaction
+        prices = [c[0][0]['gasPrice'] for c in sign.call_args_list]
+        assert prices == [20000000000, 20000000000, 30000000000]
@@ -0,0 +1,48 @@
+import pytest
+import json
+from unittest.mock import patch
+
+from datamgmtnode import json_codec
+
+
+class TestJsonCodec:
+    """Tests for the JSON codec helpers."""
+
+    def test_dumps_returns_compact_bytes(self):
+        assert json_codec.dumps({'a': 1, 'b': [1, 2]}) == b'{"a":1,"b":[1,2]}'
+
+    def test_roundtrip(self):
+        payload = {'hash': 'abc', 'count': 3, 'items': [{'x': None}], 'ok': True}
+        assert json_codec.loads(json_codec.dumps(payload)) == payload
+
+    def test_loads_accepts_str(self):
+        assert json_codec.loads('{"a": 1}') == {'a': 1}
+
+    def test_dumps_large_int(self):
+        assert json.loads(json_codec.dumps({'amount': 10 ** 30})) == {'amount': 10 ** 30}
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_loads_exact_ints(self, use_orjson):
+        document = b'{"amount": 1000000000000000000000000000000}'
+        with patch.object(json_codec, 'orjson', json_codec.orjson if use_orjson else None):
+            assert json_codec.loads(document, exact_ints=True) == {'amount': 10 ** 30}
+
+    def test_loads_invalid_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads(b'not json')
+
+    def test_stdlib_fallback(self):
+        with patch.object(json_codec, 'orjson', None):
+            assert json_codec.dumps({'a': 1}) == b'{"a":1}'
+            assert json_codec.loads(b'{"a":1}') == {'a': 1}
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_event_encodes_like_to_dict(self, use_orjson):
+        from datamgmtnode.dashboard.event_bus import Event, EventType
+
+        event = Event(type=EventType.DATA_SHARED, data={'hash': 'abc'}, timestamp=1.5)
+        patcher = patch.object(json_codec, 'orjson', json_codec.orjson if use_orjson else None)
+        with patcher:
+            encoded = json_codec.dumps([event], default=Event.to_dict)
+
+        assert json.loads(encoded) == [event.to_dict()]
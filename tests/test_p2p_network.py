@@ -9,6 +9,8 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'datamgmtnode'))
 
+from kademlia.node import Node
+from kademlia.routing import KBucket
 from network.p2p_network import P2PNetwork, PeerInfo
 
 
@@ -67,6 +69,16 @@ class TestPeerInfo:
         )
         assert peer.is_healthy is True  # < 3 successes, so we give benefit of doubt
 
+    def test_healthy_at_given_time(self):
+        """Test health evaluated against a caller-supplied clock."""
+        peer = PeerInfo(host='localhost', port=8000, last_seen=1000.0, successes=5)
+        assert peer.healthy_at(1100.0) is True
+        assert peer.healthy_at(1400.0) is False
+
+    def test_peer_info_uses_slots(self):
+        """Test PeerInfo instances carry no per-instance __dict__."""
+        assert not hasattr(PeerInfo(host='localhost', port=8000), '__dict__')
+
 
 class TestP2PNetwork:
     """Tests for P2PNetwork class."""
@@ -78,7 +90,7 @@ class TestP2PNetwork:
         node.config = Mock()
         node.config.node_id = 'test_node_1'
         node.encrypt_data = Mock(return_value='encrypted_data')
-        node.decrypt_data = Mock(return_value='decrypted_data')
+        node.decrypt_bytes = Mock(return_value=b'decrypted_data')
         node._hash_data = Mock(return_value='test_hash')
         node.data_manager = Mock()
         node.on_data_received = AsyncMock()
@@ -177,6 +189,47 @@ class TestP2PNetwork:
         assert len(p2p_network._known_peers) == 1
         assert ('new.peer.com', 8000) in p2p_network._known_peers
 
+    def test_discovered_peers_logged_and_replayed(self, p2p_network):
+        """Test that peers merged since the last snapshot survive a reload."""
+        p2p_network._merge_peer_list([
+            {'host': 'a.peer.com', 'port': 8000, 'node_id': 'a'},
+            {'host': 'b.peer.com', 'port': 8000},
+        ])
+
+        assert not os.path.exists(p2p_network._peers_file)
+        assert os.path.exists(p2p_network._peers_log)
+
+        with open(p2p_network._peers_log, 'ab') as f:
+            f.write(b'{"host": "trunc')  # partial write from a crash
+
+        p2p_network._known_peers.clear()
+        p2p_network._load_peers()
+
+        assert set(p2p_network._known_peers) == {('a.peer.com', 8000), ('b.peer.com', 8000)}
+        assert p2p_network._known_peers[('a.peer.com', 8000)].node_id == 'a'
+
+    def test_save_peers_truncates_log(self, p2p_network):
+        """Test that writing a snapshot folds in and removes the delta log."""
+        p2p_network._merge_peer_list([{'host': 'a.peer.com', 'port': 8000}])
+        p2p_network._known_peers[('a.peer.com', 8000)].last_seen = time.time()
+
+        p2p_network._save_peers()
+
+        assert not os.path.exists(p2p_network._peers_log)
+        p2p_network._known_peers.clear()
+        p2p_network._load_peers()
+        assert ('a.peer.com', 8000) in p2p_network._known_peers
+
+    def test_large_log_compacted_on_load(self, p2p_network):
+        """Test that a log much larger than the snapshot is rewritten."""
+        p2p_network._save_peers()  # empty snapshot
+        p2p_network._merge_peer_list([{'host': 'a.peer.com', 'port': 8000}])
+
+        p2p_network._known_peers.clear()
+        with patch.object(p2p_network, '_save_peers') as save:
+            p2p_network._load_peers()
+        save.assert_called_once()
+
     # =========================================================================
     # BOOTSTRAP TESTS
     # =========================================================================
@@ -237,6 +290,7 @@ class TestP2PNetwork:
         """Test parsing invalid peer addresses."""
         assert p2p_network._parse_peer_address('invalid') is None
         assert p2p_network._parse_peer_address('') is None
+        assert p2p_network._parse_peer_address('host:notaport') is None
 
     # =========================================================================
     # HEALTH MONITORING TESTS
@@ -269,32 +323,136 @@ class TestP2PNetwork:
     async def test_check_peer_health_success(self, p2p_network):
         """Test successful health check."""
         peer_info = PeerInfo(host='localhost', port=8000)
+        p2p_network.server = Mock()
+        p2p_network.server.protocol.ping = AsyncMock(return_value=(True, b'peer-id'))
 
-        with patch('network.p2p_network.Server') as MockServer:
-            mock_server = AsyncMock()
-            mock_server.bootstrap = AsyncMock()
-            mock_server.stop = Mock()
-            MockServer.return_value = mock_server
+        await p2p_network._check_peer_health('localhost', 8000, peer_info)
+
+        p2p_network.server.protocol.ping.assert_awaited_once_with(
+            ('localhost', 8000), p2p_network.server.node.id
+        )
+        assert peer_info.successes == 1
+        assert peer_info.last_seen > 0
+        assert peer_info.latency_ms > 0
 
-            await p2p_network._check_peer_health('localhost', 8000, peer_info)
+    @pytest.mark.asyncio
+    async def test_check_all_peers_health_bounded(self, p2p_network):
+        """Test that concurrent health check pings are capped."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def ping(address, node_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True, b'peer-id'
+
+        p2p_network.server = Mock()
+        p2p_network.server.protocol.router.buckets = []
+        p2p_network.server.protocol.ping = ping
+        p2p_network._probe_sem = asyncio.Semaphore(2)
+        for i in range(6):
+            p2p_network._known_peers[('peer', 8000 + i)] = PeerInfo(host='peer', port=8000 + i)
+
+        await p2p_network._check_all_peers_health()
+
+        assert max_in_flight == 2
+        assert all(p.successes == 1 for p in p2p_network._known_peers.values())
 
-            assert peer_info.successes == 1
-            assert peer_info.last_seen > 0
-            assert peer_info.latency_ms > 0
+    @pytest.mark.asyncio
+    async def test_health_sweep_skips_unchanged_routing_table(self, p2p_network):
+        """Test the routing table is only re-walked when its contacts change."""
+        bucket = KBucket(0, 2 ** 160, 20)
+        bucket.add_node(Node(b'\x01' * 20, '10.0.0.1', 8000))
+        p2p_network.server = Mock()
+        p2p_network.server.protocol.router.buckets = [bucket]
+        p2p_network.server.protocol.ping = AsyncMock(return_value=(True, b'id'))
+
+        with patch.object(p2p_network, '_update_known_peers_from_routing_table',
+                          wraps=p2p_network._update_known_peers_from_routing_table) as update:
+            await p2p_network._check_all_peers_health()
+            await p2p_network._check_all_peers_health()
+            assert update.call_count == 1
+
+            bucket.add_node(Node(b'\x02' * 20, '10.0.0.2', 8000))
+            await p2p_network._check_all_peers_health()
+            assert update.call_count == 2
+
+        assert ('10.0.0.2', 8000) in p2p_network._known_peers
+
+    def test_routing_table_sync_keeps_raw_node_id(self, p2p_network):
+        """Test the raw DHT ID is tracked but never written to disk."""
+        bucket = KBucket(0, 2 ** 160, 20)
+        bucket.add_node(Node(b'\x01' * 20, '10.0.0.1', 8000))
+        p2p_network.server = Mock()
+        p2p_network.server.protocol.router.buckets = [bucket]
+
+        p2p_network._update_known_peers_from_routing_table()
+        peer = p2p_network._known_peers[('10.0.0.1', 8000)]
+        assert peer.node_id_bytes == b'\x01' * 20
+        assert peer.node_id == '01' * 20
+
+        node_id = peer.node_id
+        p2p_network._update_known_peers_from_routing_table()
+        assert peer.node_id is node_id  # not re-rendered
+
+        assert 'node_id_bytes' not in peer.to_dict()
+        p2p_network._save_peers()
+        p2p_network._known_peers.clear()
+        p2p_network._load_peers()
+        assert p2p_network._known_peers[('10.0.0.1', 8000)].node_id == '01' * 20
+
+    @pytest.mark.asyncio
+    async def test_refresh_buckets_targets_each_bucket_range(self, p2p_network):
+        """Test that one lookup runs per non-empty bucket, inside its range."""
+        full = KBucket(0, 2 ** 159 - 1, 20)
+        full.add_node(Node(b'\x01' * 20, '10.0.0.1', 8000))
+        empty = KBucket(2 ** 159, 2 ** 160 - 1, 20)
+
+        p2p_network.server = Mock(alpha=3, ksize=20)
+        p2p_network.server.protocol.router.buckets = [full, empty]
+        p2p_network.server.protocol.router.find_neighbors.return_value = []
+
+        with patch('network.p2p_network.NodeSpiderCrawl') as MockCrawl:
+            MockCrawl.return_value.find = AsyncMock(return_value=[])
+            await p2p_network._refresh_buckets()
+
+        assert MockCrawl.call_count == 1
+        target = MockCrawl.call_args[0][1]
+        assert 0 <= target.long_id < 2 ** 159
+        assert ('10.0.0.1', 8000) in p2p_network._known_peers
+
+    @pytest.mark.asyncio
+    async def test_refresh_buckets_top_bucket_stays_in_id_space(self, p2p_network):
+        """Test that the inclusive 2**160 bound of the top bucket is never drawn."""
+        top = KBucket(0, 2 ** 160, 20)
+        top.add_node(Node(b'\x01' * 20, '10.0.0.1', 8000))
+
+        p2p_network.server = Mock(alpha=3, ksize=20)
+        p2p_network.server.protocol.router.buckets = [top]
+        p2p_network.server.protocol.router.find_neighbors.return_value = []
+
+        with patch('network.p2p_network.NodeSpiderCrawl') as MockCrawl, \
+                patch('network.p2p_network.random.randint', side_effect=lambda a, b: b):
+            MockCrawl.return_value.find = AsyncMock(return_value=[])
+            await p2p_network._refresh_buckets()
+
+        assert MockCrawl.call_args[0][1].long_id == 2 ** 160 - 1
 
     @pytest.mark.asyncio
     async def test_check_peer_health_timeout(self, p2p_network):
         """Test health check timeout."""
         peer_info = PeerInfo(host='localhost', port=8000)
+        p2p_network.server = Mock()
+        # rpcudp resolves unanswered requests with (False, None)
+        p2p_network.server.protocol.ping = AsyncMock(return_value=(False, None))
 
-        with patch('network.p2p_network.Server') as MockServer:
-            mock_server = AsyncMock()
-            mock_server.bootstrap = AsyncMock(side_effect=asyncio.TimeoutError())
-            MockServer.return_value = mock_server
-
-            await p2p_network._check_peer_health('localhost', 8000, peer_info)
+        await p2p_network._check_peer_health('localhost', 8000, peer_info)
 
-            assert peer_info.failures == 1
+        assert peer_info.failures == 1
+        assert peer_info.successes == 0
 
     # =========================================================================
     # PEER EXCHANGE TESTS
@@ -322,6 +480,101 @@ class TestP2PNetwork:
         assert len(peers) == 1
         assert peers[0]['host'] == 'healthy.com'
 
+    def test_shareable_peers_ranked_by_latency_and_distance(self, p2p_network, monkeypatch):
+        """Test that close, fast peers are shared ahead of far or slow ones."""
+        monkeypatch.setattr('network.p2p_network.SHAREABLE_PEERS', 2)
+        p2p_network.server = Mock()
+        p2p_network.server.node.id = bytes(20)
+        now = time.time()
+        for host, node_id, latency in [
+            ('far.com', 'ff' * 20, 5),          # bucket 160
+            ('near-slow.com', '00' * 19 + '01', 900),  # bucket 1
+            ('near-fast.com', '00' * 19 + '02', 20),   # bucket 2
+            ('mid.com', '00' * 10 + 'ff' * 10, 30),    # bucket 80
+        ]:
+            p2p_network._known_peers[(host, 8000)] = PeerInfo(
+                host=host, port=8000, node_id=node_id, last_seen=now, latency_ms=latency
+            )
+
+        peers = p2p_network._get_shareable_peer_list()
+
+        assert [p['host'] for p in peers] == ['near-fast.com', 'mid.com']
+        assert p2p_network._distance_bucket('ff' * 20) == 160
+        assert p2p_network._distance_bucket(None) == 160
+
+    def test_shareable_peer_bytes_cached_until_peers_change(self, p2p_network):
+        """Test the encoded peer list is reused until the peer table changes."""
+        assert p2p_network._get_shareable_peer_bytes() is None
+
+        p2p_network._known_peers[('a.com', 8000)] = PeerInfo(
+            host='a.com', port=8000, node_id='a', last_seen=time.time()
+        )
+        p2p_network._shareable_dirty = True
+        encoded = p2p_network._get_shareable_peer_bytes()
+        assert json.loads(encoded) == [{'host': 'a.com', 'port': 8000, 'node_id': 'a'}]
+
+        with patch.object(p2p_network, '_get_shareable_peer_list') as rebuild:
+            assert p2p_network._get_shareable_peer_bytes() is encoded
+            rebuild.assert_not_called()
+
+        p2p_network._merge_peer_list([{'host': 'b.com', 'port': 8000}])
+        assert p2p_network._shareable_dirty is True
+
+    @pytest.mark.asyncio
+    async def test_shareable_cache_survives_unchanged_health_sweep(self, p2p_network):
+        """Test the encoded list is only rebuilt when a peer changes health."""
+        peer = PeerInfo(host='a.com', port=8000, node_id='a', last_seen=time.time(), successes=5)
+        p2p_network._known_peers[('a.com', 8000)] = peer
+        p2p_network.server = Mock()
+        p2p_network.server.node.id = bytes(20)
+        p2p_network.server.protocol.ping = AsyncMock(return_value=(True, b'a'))
+        encoded = p2p_network._get_shareable_peer_bytes()
+
+        await p2p_network._check_peer_health('a.com', 8000, peer)
+        assert p2p_network._shareable_dirty is False
+        assert p2p_network._get_shareable_peer_bytes() is encoded
+
+        p2p_network.server.protocol.ping = AsyncMock(return_value=(False, None))
+        for _ in range(6):
+            await p2p_network._check_peer_health('a.com', 8000, peer)
+        assert peer.healthy_at(time.time()) is False
+        assert p2p_network._shareable_dirty is True
+        assert p2p_network._get_shareable_peer_bytes() is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_peer_lists_concurrent(self, p2p_network):
+        """Test that peer list lookups overlap and failures are skipped."""
+        in_flight = 0
+        max_in_flight = 0
+        responses = {
+            'peers:a': json.dumps([{'host': 'new-a.com', 'port': 8000}]),
+            'peers:b': None,
+            'peers:c': RuntimeError('lookup failed'),
+            'peers:d': 'not json',
+        }
+
+        async def get(key):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if isinstance(responses[key], Exception):
+                raise responses[key]
+            return responses[key]
+
+        p2p_network.server = Mock()
+        p2p_network.server.get = get
+        for i, node_id in enumerate('abcd'):
+            p2p_network._known_peers[('peer', 8000 + i)] = PeerInfo(
+                host='peer', port=8000 + i, node_id=node_id
+            )
+
+        await p2p_network._fetch_peer_lists()
+
+        assert max_in_flight == 4
+        assert ('new-a.com', 8000) in p2p_network._known_peers
+
     def test_merge_peer_list(self, p2p_network):
         """Test merging peer list from exchange."""
         peer_list = [
@@ -367,6 +620,9 @@ class TestP2PNetwork:
 
             mock_server.set.assert_called_once()
             p2p_network.node.encrypt_data.assert_called_once_with('test_data')
+            payload = json.loads(mock_server.set.call_args[0][1])
+            assert payload['hash'] == 'test_hash'
+            assert payload['data'] == 'encrypted_data'
 
             # Cleanup
             p2p_network._running = False
@@ -405,6 +661,35 @@ class TestP2PNetwork:
             for task in p2p_network._background_tasks:
                 task.cancel()
 
+    @pytest.mark.asyncio
+    async def test_get_data_cached(self, p2p_network, monkeypatch):
+        """Test that verified values are served from the LRU cache."""
+        monkeypatch.setattr('network.p2p_network.GET_CACHE_BYTES', 12)
+        p2p_network.server = AsyncMock()
+        p2p_network.server.get = AsyncMock(return_value=json.dumps({'data': 'encrypted_data'}))
+        p2p_network.node._hash_data = Mock(side_effect=lambda data: data.decode())
+        p2p_network.node.decrypt_bytes = Mock(return_value=b'hash_a')
+
+        assert await p2p_network.get_data('hash_a') == 'hash_a'
+        assert await p2p_network.get_data('hash_a') == 'hash_a'
+        assert p2p_network.server.get.await_count == 1
+
+        for value in (b'hash_b', b'hash_c'):
+            p2p_network.node.decrypt_bytes = Mock(return_value=value)
+            await p2p_network.get_data(value.decode())
+
+        assert list(p2p_network._get_cache) == ['hash_b', 'hash_c']
+        assert p2p_network._get_cache_bytes == 12
+
+    def test_oversized_value_not_cached(self, p2p_network, monkeypatch):
+        """Test that values over the per-item limit bypass the cache."""
+        monkeypatch.setattr('network.p2p_network.GET_CACHE_MAX_ITEM_BYTES', 4)
+        p2p_network._cache_data('small', 'abcd', 4)
+        p2p_network._cache_data('large', 'abcde', 5)
+
+        assert list(p2p_network._get_cache) == ['small']
+        assert p2p_network._get_cache_bytes == 4
+
     @pytest.mark.asyncio
     async def test_get_data_not_found(self, p2p_network):
         """Test retrieving non-existent data."""
@@ -539,8 +824,8 @@ class TestP2PNetwork:
 
         await p2p_network._handle_incoming_data(data)
 
-        p2p_network.node.decrypt_data.assert_called_once()
-        p2p_network.node.data_manager.store_data.assert_called_once()
+        p2p_network.node.decrypt_bytes.assert_called_once()
+        p2p_network.node.data_manager.store_data.assert_called_once_with('test_hash', 'decrypted_data')
         p2p_network.node.on_data_received.assert_called_once()
 
     @pytest.mark.asyncio
@@ -561,4 +846,4 @@ class TestP2PNetwork:
         await p2p_network._handle_incoming_data({})
         await p2p_network._handle_incoming_data({'hash': 'test'})
 
-        p2p_network.node.decrypt_data.assert_not_called()
+        p2p_network.node.decrypt_bytes.assert_not_called()
@@ -1,13 +1,17 @@
+import json
 import pytest
 import sys
 import os
 import time
 from unittest.mock import MagicMock, patch
 
+import aiohttp.web
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'datamgmtnode'))
 
 from api.rate_limiter import (
+    BUCKET_SHARDS,
     RateLimiter,
     create_rate_limit_middleware,
     create_internal_rate_limiter,
@@ -108,6 +112,11 @@ class TestRateLimiter:
         ip = limiter._get_client_ip(request)
         assert ip == '10.0.0.1'
 
+    def test_get_client_ip_forwarded_single(self):
+        limiter = RateLimiter()
+        request = MockRequest(headers={'X-Forwarded-For': ' 10.0.0.1 '})
+        assert limiter._get_client_ip(request) == '10.0.0.1'
+
     def test_get_client_ip_real_ip(self):
         limiter = RateLimiter()
         request = MockRequest(
@@ -143,11 +152,23 @@ class TestRateLimiter:
 
         # Make a request to create an entry
         limiter.is_allowed(request)
-        assert '192.168.1.1' in limiter._buckets
+        assert '192.168.1.1' in limiter
 
         # Cleanup with 0 max age should remove all entries
         limiter.cleanup_old_entries(max_age_seconds=0)
-        assert '192.168.1.1' not in limiter._buckets
+        assert '192.168.1.1' not in limiter
+
+    def test_requests_sweep_stale_entries(self):
+        limiter = RateLimiter()
+        limiter.is_allowed(MockRequest(ip='192.168.1.1'))
+
+        # Age the entry past the limit and force every shard due for a sweep
+        with patch('api.rate_limiter.BUCKET_MAX_AGE', 0.0):
+            for _ in range(BUCKET_SHARDS):
+                limiter._next_sweep = 0.0
+                limiter.is_allowed(MockRequest(ip='10.0.0.1'))
+
+        assert '192.168.1.1' not in limiter
 
 
 class TestRateLimitMiddleware:
@@ -180,6 +201,8 @@ class TestRateLimitMiddleware:
 
         response = await middleware(request, handler)
         assert response.status == 429
+        assert json.loads(response.body) == {'error': 'Rate limit exceeded', 'retry_after': 0.1}
+        assert response.headers['Retry-After'] == '1'
 
     @pytest.mark.asyncio
     async def test_middleware_skips_health_endpoint(self):
@@ -210,3 +233,32 @@ class TestFactoryFunctions:
         limiter = create_external_rate_limiter()
         assert limiter.requests_per_second == 10.0
         assert limiter.burst_size == 20
+
+    @pytest.mark.asyncio
+    async def test_middleware_error_handler(self):
+        limiter = RateLimiter(burst_size=10)
+        errors = []
+
+        def error_handler(req, error):
+            errors.append(error)
+            return MagicMock(status=500)
+
+        middleware = create_rate_limit_middleware(limiter, error_handler)
+
+        async def handler(req):
+            raise ValueError('boom')
+
+        response = await middleware(MockRequest(), handler)
+        assert response.status == 500
+        assert isinstance(errors[0], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_middleware_reraises_http_exceptions(self):
+        limiter = RateLimiter(burst_size=10)
+        middleware = create_rate_limit_middleware(limiter, MagicMock())
+
+        async def handler(req):
+            raise aiohttp.web.HTTPNotFound()
+
+        with pytest.raises(aiohttp.web.HTTPNotFound):
+            await middleware(MockRequest(), handler)
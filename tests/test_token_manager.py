@@ -85,3 +85,51 @@ class TestTokenManager:
         """Test minting tokens not issued by node raises error."""
         with pytest.raises(ValueError, match="Can only mint tokens issued by this node"):
             token_manager.mint_tokens('0xExternalToken', '0xRecipient', 1000)
+
+    def test_mint_tokens_issued_token(self, token_manager):
+        """Test minting a token issued by this node sends a mint transaction."""
+        deployed = Mock(address='0xIssuedToken', abi=[{'name': 'mint', 'type': 'function'}])
+        token_manager.blockchain.deploy_contract.return_value = deployed
+        token_address = token_manager.issue_new_token('Node Token', 'NTK', 1000)
+
+        token_manager.mint_tokens(token_address, '0xRecipient', 50)
+
+        contract = token_manager.supported_tokens['0xIssuedToken']['contract']
+        contract.functions.mint.assert_called_once_with('0xRecipient', 50)
+        token_manager.blockchain.send_transaction.assert_called_once()
+
+    def test_reissued_symbol_replaces_mintable_token(self, token_manager):
+        """Test re-issuing a symbol stops the replaced token being minted."""
+        abi = [{'name': 'mint', 'type': 'function'}]
+        token_manager.blockchain.deploy_contract.side_effect = [
+            Mock(address='0xOldToken', abi=abi), Mock(address='0xNewToken', abi=abi)
+        ]
+        token_manager.issue_new_token('Node Token', 'NTK', 1000)
+        token_manager.issue_new_token('Node Token', 'NTK', 1000)
+
+        with pytest.raises(ValueError, match="Can only mint tokens issued by this node"):
+            token_manager.mint_tokens('0xOldToken', '0xRecipient', 50)
+        token_manager.mint_tokens('0xNewToken', '0xRecipient', 50)
+
+    def test_contract_factory_reused_per_abi(self, token_manager):
+        """Test tokens sharing an ABI build the contract factory once."""
+        abi = [{'name': 'transfer', 'type': 'function'}]
+        token_manager.add_supported_token('0xTokenA', abi)
+        token_manager.add_supported_token('0xTokenB', list(abi))
+
+        contract = token_manager.blockchain.w3.eth.contract
+        contract.assert_called_once_with(abi=abi)
+        contract.return_value.assert_any_call(address='0xTokenA')
+        contract.return_value.assert_any_call(address='0xTokenB')
+
+    def test_update_blockchain_interface_rebinds_contracts(self, token_manager):
+        """Test supported token contracts move to the new connection."""
+        abi = [{'name': 'transfer', 'type': 'function'}]
+        token_manager.add_supported_token('0xTokenA', abi)
+
+        new_blockchain = Mock()
+        token_manager.update_blockchain_interface(new_blockchain)
+
+        new_blockchain.w3.eth.contract.assert_called_once_with(abi=abi)
+        assert token_manager.supported_tokens['0xTokenA']['contract'] is \
+            new_blockchain.w3.eth.contract.return_value.return_value
@@ -0,0 +1,200 @@
+import asyncio
+import pytest
+import pytest_asyncio
+import json
+import sys
+import os
+
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestClient, TestServer
+
+from datamgmtnode.api.websocket_handler import MSGPACK_PROTOCOL, WebSocketManager
+from datamgmtnode.dashboard.event_bus import Event, EventBus, EventType
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'datamgmtnode'))
+
+# The node imports the event bus through this path, so its Event is a
+# different class from the one imported above
+from dashboard import event_bus as node_event_bus
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+requires_msgpack = pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+
+
+@pytest.fixture
+def event_bus():
+    return EventBus()
+
+
+@pytest.fixture
+def ws_manager(event_bus):
+    return WebSocketManager(event_bus)
+
+
+@pytest_asyncio.fixture
+async def client(ws_manager):
+    """Create a test client serving the WebSocket endpoint."""
+    app = web.Application()
+    app.router.add_get('/ws', ws_manager.handle_websocket)
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+class TestWebSocketManager:
+    """Tests for WebSocket connection handling."""
+
+    @pytest.mark.asyncio
+    async def test_json_client(self, client):
+        async with client.ws_connect('/ws') as ws:
+            msg = await ws.receive()
+            assert msg.type == WSMsgType.TEXT
+            assert json.loads(msg.data)['type'] == 'connected'
+
+            await ws.send_str(json.dumps({'type': 'ping'}))
+            msg = await ws.receive()
+            assert json.loads(msg.data) == {'type': 'pong'}
+
+    @requires_msgpack
+    @pytest.mark.asyncio
+    async def test_msgpack_client(self, client):
+        async with client.ws_connect('/ws', protocols=(MSGPACK_PROTOCOL,)) as ws:
+            assert ws.protocol == MSGPACK_PROTOCOL
+
+            msg = await ws.receive()
+            assert msg.type == WSMsgType.BINARY
+            assert msgpack.unpackb(msg.data)['type'] == 'connected'
+
+            await ws.send_bytes(msgpack.packb({'type': 'ping'}))
+            msg = await ws.receive()
+            assert msgpack.unpackb(msg.data) == {'type': 'pong'}
+
+    @requires_msgpack
+    @pytest.mark.asyncio
+    async def test_broadcast_to_mixed_clients(self, client, event_bus):
+        async with client.ws_connect('/ws') as json_ws, \
+                client.ws_connect('/ws', protocols=(MSGPACK_PROTOCOL,)) as bin_ws:
+            await json_ws.receive()
+            await bin_ws.receive()
+
+            await event_bus.publish(Event(type=EventType.DATA_SHARED, data={'data_hash': 'abc'}))
+
+            json_event = json.loads((await json_ws.receive()).data)
+            bin_event = msgpack.unpackb((await bin_ws.receive()).data)
+            assert json_event == bin_event
+            assert json_event['type'] == 'data.shared'
+            assert json_event['data'] == {'data_hash': 'abc'}
+
+    @pytest.mark.asyncio
+    async def test_events_in_window_are_batched(self, client, event_bus):
+        async with client.ws_connect('/ws') as ws:
+            await ws.receive()
+
+            for i in range(3):
+                await event_bus.publish(Event(type=EventType.DATA_RECEIVED, data={'n': i}))
+
+            message = json.loads((await ws.receive()).data)
+            assert message['type'] == 'batch'
+            assert message['data']['count'] == 3
+            assert [e['data']['n'] for e in message['data']['events']] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_slow_client_disconnected(self, client, ws_manager, monkeypatch):
+        async with client.ws_connect('/ws') as ws:
+            await ws.receive()
+
+            monkeypatch.setattr(
+                WebSocketManager, '_buffered_bytes',
+                staticmethod(lambda ws: ws_manager.max_buffered_bytes + 1)
+            )
+            sent = await ws_manager.send_to_all({'type': 'test'})
+
+            assert sent == 0
+            assert ws_manager.connection_count == 0
+            assert ws_manager.slow_client_disconnects == 1
+            assert len(ws_manager._close_tasks) == 1
+
+            msg = await ws.receive()
+            assert msg.type == WSMsgType.CLOSE
+            assert msg.data == 1013
+
+        await asyncio.sleep(0.01)
+        assert not ws_manager._close_tasks
+
+    def test_connections_are_weak(self, ws_manager):
+        ws = web.WebSocketResponse()
+        ws_manager.connections.add(ws)
+        assert ws_manager.connection_count == 1
+
+        del ws
+        assert ws_manager.connection_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_send_does_not_block_others(self, client, ws_manager, monkeypatch):
+        async with client.ws_connect('/ws') as ws1, client.ws_connect('/ws') as ws2:
+            await ws1.receive()
+            await ws2.receive()
+
+            failing = next(iter(ws_manager.connections))
+            send_frame = ws_manager._send_frame
+
+            async def flaky_send_frame(ws, frame, binary):
+                if ws is failing:
+                    raise ConnectionResetError('gone')
+                await send_frame(ws, frame, binary)
+
+            monkeypatch.setattr(ws_manager, '_send_frame', flaky_send_frame)
+            sent = await ws_manager.send_to_all({'type': 'test'})
+
+            assert sent == 1
+            assert failing not in ws_manager.connections
+            assert ws_manager.connection_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_history(self, client, event_bus):
+        await event_bus.publish(Event(type=EventType.DATA_SHARED, data={'n': 1}))
+
+        async with client.ws_connect('/ws') as ws:
+            await ws.receive()  # connected
+            await ws.receive()  # recent event
+
+            await ws.send_str(json.dumps({'type': 'get_history', 'count': 10}))
+            message = json.loads((await ws.receive()).data)
+
+            assert message['type'] == 'history'
+            assert message['data']['count'] == 1
+            assert message['data']['events'][0]['type'] == 'data.shared'
+            assert message['data']['events'][0]['data'] == {'n': 1}
+
+    @requires_msgpack
+    @pytest.mark.asyncio
+    async def test_node_event_over_msgpack(self, client, event_bus):
+        """Test that events from the node's event_bus import reach msgpack clients."""
+        async with client.ws_connect('/ws', protocols=(MSGPACK_PROTOCOL,)) as ws:
+            await ws.receive()
+
+            await event_bus.publish(node_event_bus.Event(
+                type=node_event_bus.EventType.DATA_SHARED, data={'data_hash': 'abc'}
+            ))
+
+            message = msgpack.unpackb((await ws.receive(timeout=2)).data)
+            assert message['type'] == 'data.shared'
+            assert message['data'] == {'data_hash': 'abc'}
+
+    @pytest.mark.asyncio
+    async def test_node_event_without_orjson(self, client, event_bus, monkeypatch):
+        """Test that node events encode with the standard library JSON encoder."""
+        monkeypatch.setattr('datamgmtnode.json_codec.orjson', None)
+        async with client.ws_connect('/ws') as ws:
+            await ws.receive()
+
+            await event_bus.publish(node_event_bus.Event(
+                type=node_event_bus.EventType.DATA_SHARED, data={'data_hash': 'abc'}
+            ))
+
+            message = json.loads((await ws.receive(timeout=2)).data)
+            assert message['type'] == 'data.shared'
+            assert message['data'] == {'data_hash': 'abc'}
@@ -27,11 +27,16 @@ export function useWebSocket() {
       ws.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data)
-          events.value.push(data)
+          // Events published close together arrive as one batch message
+          if (data.type === 'batch') {
+            events.value.push(...data.data.events)
+          } else {
+            events.value.push(data)
+          }
 
           // Keep only last 100 events
           if (events.value.length > 100) {
-            events.value.shift()
+            events.value.splice(0, events.value.length - 100)
           }
         } catch (e) {
           console.error('Failed to parse WebSocket message:', e)
@@ -1,6 +1,12 @@
 import { defineStore } from 'pinia'
 import { ref, computed } from 'vue'
 
+// Share jobs are polled with backoff and given up on after JOB_TIMEOUT_MS,
+// matching the TUI client
+const JOB_TIMEOUT_MS = 120000
+const JOB_POLL_INITIAL_MS = 500
+const JOB_POLL_MAX_MS = 5000
+
 export const useNodeStore = defineStore('node', () => {
   // State
   const health = ref(null)
@@ -62,7 +68,9 @@ export const useNodeStore = defineStore('node', () => {
     try {
       let url = '/api/compliance_history'
       if (filters && filters.length > 0) {
-        url += `?filters=${filters.join(',')}`
+        const params = new URLSearchParams()
+        filters.forEach(f => params.append('filter', f))
+        url += `?${params}`
       }
       const response = await fetch(url)
       const data = await response.json()
@@ -112,7 +120,21 @@ export const useNodeStore = defineStore('node', () => {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(body)
       })
-      return await response.json()
+      let result = await response.json()
+
+      // Sharing runs in the background; poll the job until it finishes
+      const deadline = Date.now() + JOB_TIMEOUT_MS
+      let delay = JOB_POLL_INITIAL_MS
+      while (result.status === 'pending') {
+        if (Date.now() + delay > deadline) {
+          throw new Error(`Timed out waiting for share job ${result.job_id}`)
+        }
+        await new Promise(resolve => setTimeout(resolve, delay))
+        delay = Math.min(delay * 2, JOB_POLL_MAX_MS)
+        const status = await fetch(`/api/share_data/${result.job_id}`)
+        result = await status.json()
+      }
+      return result
     } catch (e) {
       error.value = e.message
       throw e